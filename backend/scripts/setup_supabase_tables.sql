@@ -283,6 +283,17 @@ CREATE INDEX IF NOT EXISTS idx_companies_status ON companies(status);
 CREATE INDEX IF NOT EXISTS idx_companies_municipality ON companies(municipality);
 CREATE INDEX IF NOT EXISTS idx_companies_county ON companies(county);
 
+-- Companies search (SupabaseDatabase.search_companies)
+ALTER TABLE companies ADD COLUMN IF NOT EXISTS company_type TEXT;
+ALTER TABLE companies ADD COLUMN IF NOT EXISTS postal_city TEXT;
+CREATE INDEX IF NOT EXISTS idx_companies_name_trgm ON companies USING GIN(name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_companies_orgnr_trgm ON companies USING GIN(orgnr gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_companies_postal_city_trgm ON companies USING GIN(postal_city gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_companies_search ON companies(status, postal_city)
+    INCLUDE (orgnr, name, company_type, revenue, num_employees);
+CREATE INDEX IF NOT EXISTS idx_companies_revenue ON companies(revenue);
+CREATE INDEX IF NOT EXISTS idx_companies_num_employees ON companies(num_employees);
+
 -- Roles indexes
 CREATE INDEX IF NOT EXISTS idx_roles_company ON roles(company_orgnr);
 CREATE INDEX IF NOT EXISTS idx_roles_person ON roles(person_id);
@@ -306,10 +317,43 @@ CREATE INDEX IF NOT EXISTS idx_companies_history_orgnr ON companies_history(orgn
 CREATE INDEX IF NOT EXISTS idx_roles_history_company ON roles_history(company_orgnr);
 -- NOTE: vehicles_history and beneficial_owners_history indexes removed (tables deprecated)
 
+-- XBRL facts: one row per (report, concept, context), needed by
+-- replace_xbrl_facts (xbrl tables come from the XBRL migration, so re-run
+-- this script after it; until then the app uses delete + insert)
+DO $$
+BEGIN
+    IF to_regclass('xbrl_facts') IS NOT NULL THEN
+        DELETE FROM xbrl_facts a
+        USING xbrl_facts b
+        WHERE a.annual_report_id = b.annual_report_id
+          AND a.xbrl_name = b.xbrl_name
+          AND a.context_ref = b.context_ref
+          AND a.ctid > b.ctid;
+
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_xbrl_facts_report_name_context
+            ON xbrl_facts(annual_report_id, xbrl_name, context_ref);
+    END IF;
+END $$;
+
 -- Company registry indexes (for FTS)
 CREATE INDEX IF NOT EXISTS idx_company_registry_fts ON company_registry USING GIN(name_search);
 CREATE INDEX IF NOT EXISTS idx_company_registry_name_trgm ON company_registry USING GIN(name gin_trgm_ops);
 
+-- =====================================================
+-- VIEWS
+-- =====================================================
+
+-- Companies with processed XBRL annual reports, one row per company
+DO $$
+BEGIN
+    IF to_regclass('annual_reports') IS NOT NULL THEN
+        CREATE OR REPLACE VIEW companies_with_xbrl AS
+        SELECT DISTINCT company_orgnr
+        FROM annual_reports
+        WHERE processing_status = 'processed';
+    END IF;
+END $$;
+
 -- =====================================================
 -- FUNCTIONS
 -- =====================================================
@@ -330,6 +374,246 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Registry name lookup: prefix matches, falling back to contains matches
+-- (search_term is already LIKE-escaped by the client)
+CREATE OR REPLACE FUNCTION search_company_registry(
+    search_term TEXT,
+    result_limit INTEGER DEFAULT 20
+)
+RETURNS TABLE(orgnr TEXT, name TEXT, org_form TEXT) AS $$
+    WITH prefix AS (
+        SELECT cr.orgnr, cr.name, cr.org_form
+        FROM company_registry cr
+        WHERE cr.name ILIKE search_term || '%'
+        LIMIT result_limit
+    )
+    SELECT * FROM prefix
+    UNION ALL
+    (
+        SELECT cr.orgnr, cr.name, cr.org_form
+        FROM company_registry cr
+        WHERE NOT EXISTS (SELECT 1 FROM prefix)
+          AND cr.name ILIKE '%' || search_term || '%'
+        LIMIT result_limit
+    );
+$$ LANGUAGE sql STABLE;
+
+-- Insert (or upsert) a JSON array of rows into a table. Only the keys
+-- present in the rows are written, so omitted columns keep their defaults.
+CREATE OR REPLACE FUNCTION insert_json_rows(
+    target REGCLASS,
+    rows JSONB,
+    conflict_columns TEXT[] DEFAULT NULL
+)
+RETURNS VOID AS $$
+DECLARE
+    cols TEXT;
+    updates TEXT;
+    on_conflict TEXT := '';
+BEGIN
+    IF rows IS NULL OR jsonb_array_length(rows) = 0 THEN
+        RETURN;
+    END IF;
+
+    SELECT string_agg(quote_ident(a.attname), ', ' ORDER BY a.attnum),
+           string_agg(format('%1$I = EXCLUDED.%1$I', a.attname), ', ' ORDER BY a.attnum)
+               FILTER (WHERE a.attname::TEXT <> ALL (coalesce(conflict_columns, '{}')))
+    INTO cols, updates
+    FROM pg_attribute a
+    WHERE a.attrelid = target
+      AND a.attnum > 0
+      AND NOT a.attisdropped
+      AND EXISTS (SELECT 1 FROM jsonb_array_elements(rows) r WHERE r ? a.attname);
+
+    IF conflict_columns IS NOT NULL THEN
+        SELECT format(' ON CONFLICT (%s) DO %s',
+                      string_agg(quote_ident(c), ', '),
+                      coalesce('UPDATE SET ' || updates, 'NOTHING'))
+        INTO on_conflict
+        FROM unnest(conflict_columns) c;
+    END IF;
+
+    EXECUTE format(
+        'INSERT INTO %s (%s) SELECT %s FROM jsonb_populate_recordset(NULL::%s, $1)%s',
+        target, cols, cols, target, on_conflict
+    ) USING rows;
+END;
+$$ LANGUAGE plpgsql;
+
+-- True if an existing row (as JSONB) has the same value for every key the
+-- payload row sets. typed is the payload cast to the table's row type, so
+-- values compare as stored. Columns the payload leaves out keep their
+-- defaults on insert and are not compared; id and created_at are ignored.
+CREATE OR REPLACE FUNCTION json_row_matches(existing JSONB, payload JSONB, typed JSONB)
+RETURNS BOOLEAN AS $$
+    SELECT NOT EXISTS (
+        SELECT 1
+        FROM jsonb_each(typed) c(key, value)
+        WHERE payload ? c.key
+          AND c.key NOT IN ('id', 'created_at')
+          AND existing -> c.key IS DISTINCT FROM c.value
+    );
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Make a company's rows in a child table match a JSON array of rows.
+-- Rows are compared on the columns the payload sets (see json_row_matches):
+-- unchanged rows are kept, removed rows deleted and only new rows inserted,
+-- so a re-scrape that finds the same data writes nothing.
+CREATE OR REPLACE FUNCTION replace_json_rows(
+    target REGCLASS,
+    company_id TEXT,
+    rows JSONB
+)
+RETURNS VOID AS $$
+DECLARE
+    new_rows JSONB;
+BEGIN
+    EXECUTE format($q$
+        DELETE FROM %1$s t
+        WHERE t.company_orgnr = $1
+          AND NOT EXISTS (
+              SELECT 1 FROM jsonb_array_elements($2) r
+              WHERE json_row_matches(
+                  to_jsonb(t), r, to_jsonb(jsonb_populate_record(NULL::%1$s, r))
+              )
+          )
+    $q$, target) USING company_id, rows;
+
+    EXECUTE format($q$
+        SELECT jsonb_agg(r)
+        FROM jsonb_array_elements($2) r
+        WHERE NOT EXISTS (
+            SELECT 1 FROM %1$s t
+            WHERE t.company_orgnr = $1
+              AND json_row_matches(
+                  to_jsonb(t), r, to_jsonb(jsonb_populate_record(NULL::%1$s, r))
+              )
+        )
+    $q$, target) INTO new_rows USING company_id, rows;
+
+    PERFORM insert_json_rows(target, new_rows);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Copy the current company row and its roles into the history tables.
+-- Same shape as the old client-side snapshot (JSON text in JSONB).
+-- Returns FALSE if the company does not exist.
+CREATE OR REPLACE FUNCTION snapshot_company(company_id TEXT)
+RETURNS BOOLEAN AS $$
+BEGIN
+    INSERT INTO companies_history (orgnr, snapshot_date, data)
+    SELECT c.orgnr, NOW(), to_jsonb(row_to_json(c)::TEXT)
+    FROM companies c
+    WHERE c.orgnr = company_id;
+
+    IF NOT FOUND THEN
+        RETURN FALSE;
+    END IF;
+
+    INSERT INTO roles_history (company_orgnr, snapshot_date, roles_json)
+    SELECT company_id, NOW(), to_jsonb(json_agg(r)::TEXT)
+    FROM roles r
+    WHERE r.company_orgnr = company_id
+    HAVING COUNT(*) > 0;
+
+    RETURN TRUE;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Store a company and its related data in one transaction. NULL arrays
+-- leave that table untouched; empty arrays clear it. Rows arrive already
+-- stamped/mapped by SupabaseDatabase.store_company_complete.
+CREATE OR REPLACE FUNCTION store_company_complete(
+    company JSONB,
+    roles JSONB DEFAULT NULL,
+    financials JSONB DEFAULT NULL,
+    industries JSONB DEFAULT NULL,
+    trademarks JSONB DEFAULT NULL,
+    related_companies JSONB DEFAULT NULL,
+    announcements JSONB DEFAULT NULL,
+    snapshot_first BOOLEAN DEFAULT TRUE
+)
+RETURNS VOID AS $$
+DECLARE
+    company_id TEXT := company->>'orgnr';
+BEGIN
+    IF snapshot_first THEN
+        PERFORM snapshot_company(company_id);
+    END IF;
+
+    PERFORM insert_json_rows('companies', jsonb_build_array(company), ARRAY['orgnr']);
+
+    IF roles IS NOT NULL THEN
+        PERFORM replace_json_rows('roles', company_id, roles);
+    END IF;
+
+    IF financials IS NOT NULL THEN
+        PERFORM insert_json_rows('financials', financials,
+                                 ARRAY['company_orgnr', 'period_year', 'is_consolidated']);
+    END IF;
+
+    IF industries IS NOT NULL THEN
+        PERFORM replace_json_rows('industries', company_id, industries);
+    END IF;
+
+    IF trademarks IS NOT NULL THEN
+        PERFORM replace_json_rows('trademarks', company_id, trademarks);
+    END IF;
+
+    IF related_companies IS NOT NULL THEN
+        PERFORM replace_json_rows('related_companies', company_id, related_companies);
+    END IF;
+
+    IF announcements IS NOT NULL THEN
+        PERFORM replace_json_rows('announcements', company_id, announcements);
+    END IF;
+
+    INSERT INTO cache_metadata (orgnr, last_refresh)
+    VALUES (company_id, NOW())
+    ON CONFLICT (orgnr) DO UPDATE SET last_refresh = EXCLUDED.last_refresh;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Replace all XBRL facts of an annual report in one transaction. Facts
+-- are upserted on (annual_report_id, xbrl_name, context_ref), so a re-run
+-- of an unchanged report deletes nothing.
+CREATE OR REPLACE FUNCTION replace_xbrl_facts(
+    report_id UUID,
+    facts JSONB
+)
+RETURNS VOID AS $$
+BEGIN
+    PERFORM insert_json_rows('xbrl_facts', facts,
+                             ARRAY['annual_report_id', 'xbrl_name', 'context_ref']);
+
+    -- Facts no longer in the report (only after a parser change)
+    DELETE FROM xbrl_facts x
+    WHERE x.annual_report_id = report_id
+      AND NOT EXISTS (
+          SELECT 1 FROM jsonb_array_elements(facts) f
+          WHERE f->>'xbrl_name' = x.xbrl_name
+            AND f->>'context_ref' = x.context_ref
+      );
+END;
+$$ LANGUAGE plpgsql;
+
+-- XBRL processing counts for XBRLStorage.get_processing_stats
+CREATE OR REPLACE FUNCTION xbrl_processing_stats()
+RETURNS JSON AS $$
+BEGIN
+    RETURN (
+        SELECT json_build_object(
+            'total_reports', count(*),
+            'processed', count(*) FILTER (WHERE processing_status = 'processed'),
+            'failed', count(*) FILTER (WHERE processing_status = 'failed'),
+            'total_facts', (SELECT count(*) FROM xbrl_facts),
+            'unique_companies', count(DISTINCT company_orgnr)
+        )
+        FROM annual_reports
+    );
+END;
+$$ LANGUAGE plpgsql STABLE;
+
 -- Update timestamp trigger function
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
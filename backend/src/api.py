@@ -28,7 +28,7 @@ from slowapi.errors import RateLimitExceeded
 
 from config import Config
 from .orchestrator import DataOrchestrator, get_orchestrator
-from .supabase_client import get_database
+from .supabase_client import get_database, close_database
 from .circuit_breaker import get_circuit_breaker, get_all_circuit_status, CircuitState
 from .metrics import get_metrics
 from .auth import verify_api_key, is_public_endpoint, get_api_keys_from_env
@@ -194,6 +194,18 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    """Close shared outbound HTTP clients and database write pools."""
+    from .scrapers.bolagsverket_vdm import close_bolagsverket_vdm_clients
+    from .xbrl_storage import close_xbrl_storage
+    await close_bolagsverket_vdm_clients()
+    # Storage writes go through the database, so close it first
+    close_xbrl_storage()
+    close_database()
+
+
 # Add rate limiter
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
@@ -740,7 +752,7 @@ async def get_company_full_history(
     Varje snapshot inkluderar tidsstämpel.
     """
     db = get_database()
-    history = db.get_full_history(orgnr)
+    history = db.get_full_history(orgnr, limit=limit)
 
     # Add metadata
     history['metadata'] = {
@@ -1104,35 +1116,34 @@ async def xbrl_test(orgnr: str):
     from .scrapers.bolagsverket_vdm import BolagsverketVDMClient
 
     # Create fresh client (not singleton)
-    vdm_client = BolagsverketVDMClient()
-
-    result = {
-        "orgnr": orgnr,
-        "konfigurerad": vdm_client.is_configured,
-    }
+    async with BolagsverketVDMClient() as vdm_client:
+        result = {
+            "orgnr": orgnr,
+            "konfigurerad": vdm_client.is_configured,
+        }
 
-    if not vdm_client.is_configured:
-        result["fel"] = "Ej konfigurerad"
-        return result
+        if not vdm_client.is_configured:
+            result["fel"] = "Ej konfigurerad"
+            return result
 
-    try:
-        # Try to get token
-        token = await vdm_client._get_token_async()
-        result["token_ok"] = bool(token)
+        try:
+            # Try to get token
+            token = await vdm_client._get_token_async()
+            result["token_ok"] = bool(token)
 
-        if not token:
-            result["fel"] = "Kunde inte hämta OAuth token"
-            return result
+            if not token:
+                result["fel"] = "Kunde inte hämta OAuth token"
+                return result
 
-        # Try to get document list
-        documents = await vdm_client.get_document_list_async(orgnr)
-        result["dokument_hittade"] = len(documents)
-        result["dokument"] = documents[:3] if documents else []
+            # Try to get document list
+            documents = await vdm_client.get_document_list_async(orgnr)
+            result["dokument_hittade"] = len(documents)
+            result["dokument"] = documents[:3] if documents else []
 
-    except Exception as e:
-        result["fel"] = str(e)
+        except Exception as e:
+            result["fel"] = str(e)
 
-    return result
+        return result
 
 
 @app.post("/api/v1/companies/{orgnr}/sync-annual-reports", tags=["Årsredovisningar"])
@@ -129,7 +129,7 @@ class DataOrchestrator:
         }
 
         # 2a. Bolagsverket VDM
-        bv_data = self._fetch_bolagsverket(orgnr)
+        bv_data = self._fetch_bolagsverket(orgnr, force_refresh)
         if bv_data:
             result.update(bv_data)
             result['_meta']['sources']['basic'] = 'bolagsverket'
@@ -184,8 +184,8 @@ class DataOrchestrator:
         start_time = time.perf_counter()
 
         # 1. Check cache
-        if not force_refresh and self.db.is_cache_fresh(orgnr, self.cache_ttl):
-            cached = self.db.get_company(orgnr)
+        if not force_refresh and await self.db.is_cache_fresh_async(orgnr, self.cache_ttl):
+            cached = await self.db.get_company_async(orgnr)
             if cached:
                 cached['_meta'] = {
                     'from_cache': True,
@@ -211,7 +211,7 @@ class DataOrchestrator:
         }
 
         # Fetch both sources in parallel
-        bv_task = self._fetch_bolagsverket_async(orgnr)
+        bv_task = self._fetch_bolagsverket_async(orgnr, force_refresh)
         ab_task = self._fetch_allabolag_async(orgnr)
 
         results = await asyncio.gather(bv_task, ab_task, return_exceptions=True)
@@ -243,8 +243,9 @@ class DataOrchestrator:
         # 5. Save sources before storing (store removes _meta)
         sources_used = list(result.get('_meta', {}).get('sources', {}).values())
 
-        # 6. Store in cache
-        self._store_in_db(result)
+        # 6. Store in cache (sync DB client - keep the event loop free)
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self._store_in_db, result)
 
         duration_ms = (time.perf_counter() - start_time) * 1000
         logger.info(
@@ -255,7 +256,7 @@ class DataOrchestrator:
             sources=sources_used
         )
 
-        return self.db.get_company(orgnr)
+        return await self.db.get_company_async(orgnr)
 
     async def enrich_batch_async(
         self,
@@ -327,7 +328,7 @@ class DataOrchestrator:
     # ASYNC FETCH METHODS (with circuit breaker protection)
     # =========================================================================
 
-    async def _fetch_bolagsverket_async(self, orgnr: str) -> Optional[Dict]:
+    async def _fetch_bolagsverket_async(self, orgnr: str, force_refresh: bool = False) -> Optional[Dict]:
         """Async fetch from Bolagsverket VDM API with circuit breaker."""
         # Get circuit breaker if available
         breaker = get_circuit_breaker("bolagsverket") if get_circuit_breaker else None
@@ -348,7 +349,8 @@ class DataOrchestrator:
             result = await loop.run_in_executor(
                 None,
                 self.bolagsverket.get_company,
-                orgnr
+                orgnr,
+                force_refresh
             )
 
             # Record success
@@ -406,10 +408,10 @@ class DataOrchestrator:
     # SYNC FETCH METHODS (original)
     # =========================================================================
 
-    def _fetch_bolagsverket(self, orgnr: str) -> Optional[Dict]:
+    def _fetch_bolagsverket(self, orgnr: str, force_refresh: bool = False) -> Optional[Dict]:
         """Fetch from Bolagsverket VDM API"""
         try:
-            return self.bolagsverket.get_company(orgnr)
+            return self.bolagsverket.get_company(orgnr, force_refresh=force_refresh)
         except Exception as e:
             logger.warning(f"Bolagsverket fetch error: {e}", orgnr=orgnr, action="bv_error")
             return None
@@ -41,7 +41,8 @@ try:
         POITDailyStats,
         ScrapeResult,
         extract_orgnrs,
-        normalize_orgnr
+        normalize_orgnr,
+        install_uvloop
     )
     from .supabase_client import get_database
     from .logging_config import get_source_logger
@@ -55,7 +56,8 @@ except ImportError:
         POITDailyStats,
         ScrapeResult,
         extract_orgnrs,
-        normalize_orgnr
+        normalize_orgnr,
+        install_uvloop
     )
     from src.supabase_client import get_database
     
@@ -692,4 +694,5 @@ async def main():
 
 
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(main())
@@ -13,7 +13,11 @@ Data sources:
 
 from .base import BaseScraper
 from .allabolag import AllabolagScraper, scrape_allabolag
-from .bolagsverket_vdm import BolagsverketVDMClient, get_bolagsverket_vdm_client
+from .bolagsverket_vdm import (
+    BolagsverketVDMClient,
+    get_bolagsverket_vdm_client,
+    close_bolagsverket_vdm_clients
+)
 from .bolagsverket_poit import (
     BolagsverketPOITClient,
     get_bolagsverket_poit_client,
@@ -37,6 +41,7 @@ __all__ = [
     # Bolagsverket VDM (OAuth2 API)
     'BolagsverketVDMClient',
     'get_bolagsverket_vdm_client',
+    'close_bolagsverket_vdm_clients',
     
     # Bolagsverket POIT (Browser scraper)
     'BolagsverketPOITClient',
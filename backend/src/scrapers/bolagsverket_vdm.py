@@ -9,19 +9,54 @@ API Endpoints (Production):
 Features:
 - OAuth 2.0 Client Credentials authentication
 - Both sync and async HTTP support
+- Pooled keep-alive connections (one client per host, reused across calls)
+- HTTP/2 multiplexing for async calls when the h2 package is installed
 - Automatic token refresh
+- In-process TTL cache for company lookups and document lists
 - Structured logging
 """
 
 import os
+import copy
 import time
+import random
 import asyncio
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+import threading
+from functools import lru_cache
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional, List, Callable, Awaitable
 
 import requests
+from requests.adapters import HTTPAdapter
 import httpx
 
+# Fast JSON decoding (optional, falls back to stdlib json)
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    import json
+    _loads = json.loads
+
+# HTTP/2 support for httpx (pip install 'httpx[http2]')
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Brotli decoding for compressed JSON responses (pip install brotli)
+try:
+    import brotli  # noqa: F401
+    BROTLI_AVAILABLE = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        BROTLI_AVAILABLE = True
+    except ImportError:
+        BROTLI_AVAILABLE = False
+
 try:
     from ..logging_config import get_source_logger
 except ImportError:
@@ -29,8 +64,19 @@ except ImportError:
     def get_source_logger(name):
         return logging.getLogger(name)
 
+from ..ttl_cache import TTLCache
+
+
+SOURCE_NAME = "bolagsverket_vdm"
+
+# Compressed JSON bodies (ZIP downloads are already compressed and left alone).
+# Only advertise br when a decoder is installed; requests/httpx decompress transparently.
+_JSON_ACCEPT_ENCODING = "gzip, br" if BROTLI_AVAILABLE else "gzip"
 
-logger = get_source_logger("bolagsverket_vdm")
+# Separators stripped from org numbers (single-pass str.translate)
+_ORGNR_STRIP_TABLE = str.maketrans("", "", "- \t")
+
+logger = get_source_logger(SOURCE_NAME)
 
 
 class BolagsverketVDMClient:
@@ -53,8 +99,10 @@ class BolagsverketVDMClient:
 
     Token handling:
     - Tokens are valid for 3600 seconds (1 hour)
-    - Proactive renewal: 5 minutes before expiration
+    - Proactive renewal: 5 minutes before expiration (async: in the background,
+      the still-valid token keeps being served meanwhile)
     - Reactive renewal: On 401 response, retry with new token
+    - Single-flight renewal: concurrent callers wait for one refresh
     """
 
     # API URLs
@@ -67,7 +115,24 @@ class BolagsverketVDMClient:
 
     # Rate limiting / backoff for 429
     MAX_429_RETRIES = 3  # Max retries on 429 Too Many Requests
-    BACKOFF_BASE_SECONDS = 5  # Base wait time (exponential: 5, 10, 20)
+    BACKOFF_BASE_SECONDS = 5  # Base wait time (jittered: 5-10, 5-20, 5-40)
+
+    # In-process response cache (per client instance)
+    CACHE_MAXSIZE = 10000
+    CACHE_TTL_SECONDS = 600  # Company data / document lists
+    NEGATIVE_CACHE_TTL_SECONDS = 60  # Known-missing orgnrs (404)
+
+    # Streaming document downloads
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+    # Default concurrency for bulk_* helpers
+    BULK_CONCURRENCY = 10
+
+    # Connection pooling
+    MAX_KEEPALIVE_CONNECTIONS = 20  # async client
+    MAX_CONNECTIONS = 50  # async client
+    SYNC_POOL_CONNECTIONS = 10  # sync session: pools per host
+    SYNC_POOL_MAXSIZE = 20  # sync session: connections per pool
 
     def __init__(
         self,
@@ -99,17 +164,112 @@ class BolagsverketVDMClient:
 
         # Token management
         self._access_token: Optional[str] = None
-        self._token_expires_at: Optional[datetime] = None
-
-        # HTTP clients
+        # Deadlines are time.monotonic() values (immune to wall-clock changes)
+        self._token_expires_at: float = 0.0  # Hard expiry
+        self._token_renew_at: float = 0.0  # Expiry minus TOKEN_MARGIN_SECONDS
+        self._token_lock_sync = threading.Lock()
+        self._token_lock: Optional[asyncio.Lock] = None  # Created lazily (needs running loop)
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        # Response caches keyed by clean orgnr
+        self._company_cache = TTLCache(maxsize=self.CACHE_MAXSIZE, ttl=self.CACHE_TTL_SECONDS)
+        self._document_list_cache = TTLCache(maxsize=self.CACHE_MAXSIZE, ttl=self.CACHE_TTL_SECONDS)
+
+        # HTTP clients (created lazily, reused across calls)
         self._sync_session: Optional[requests.Session] = None
         self._async_client: Optional[httpx.AsyncClient] = None
+        self._token_async_client: Optional[httpx.AsyncClient] = None
+        # Event loop the async clients, token lock and refresh task belong to
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
 
     @property
     def is_configured(self) -> bool:
         """Check if client has valid credentials."""
         return bool(self.client_id and self.client_secret)
 
+    # =========================================================================
+    # HTTP CLIENTS
+    # =========================================================================
+
+    def _get_sync_session(self) -> requests.Session:
+        """Get or create the pooled sync session (token + API hosts)."""
+        if self._sync_session is None:
+            session = requests.Session()
+            # Retries are handled explicitly per call (401/429), not by urllib3
+            adapter = HTTPAdapter(
+                pool_connections=self.SYNC_POOL_CONNECTIONS,
+                pool_maxsize=self.SYNC_POOL_MAXSIZE,
+                max_retries=0
+            )
+            session.mount("https://", adapter)
+            self._sync_session = session
+        return self._sync_session
+
+    def close(self):
+        """Close pooled sync session when done."""
+        if self._sync_session:
+            self._sync_session.close()
+            self._sync_session = None
+
+    def _bind_event_loop(self):
+        """
+        Tie the async state to the running event loop.
+
+        A shared client can outlive the loop it was first used on (e.g. one
+        asyncio.run per script call); the async clients, token lock and
+        refresh task of an earlier loop can no longer be awaited, so they are
+        dropped and recreated on the current one.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._async_client = None
+            self._token_async_client = None
+            self._token_lock = None
+            self._refresh_task = None
+            self._async_loop = loop
+
+    async def _get_async_client(self) -> httpx.AsyncClient:
+        """Get or create the pooled async client for the API gateway."""
+        self._bind_event_loop()
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                base_url=self.api_base_url,
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_keepalive_connections=self.MAX_KEEPALIVE_CONNECTIONS,
+                    max_connections=self.MAX_CONNECTIONS
+                ),
+                timeout=30
+            )
+        return self._async_client
+
+    async def _get_token_async_client(self) -> httpx.AsyncClient:
+        """Get or create the async client for the OAuth token endpoint (separate host)."""
+        self._bind_event_loop()
+        if self._token_async_client is None:
+            self._token_async_client = httpx.AsyncClient(http2=HTTP2_AVAILABLE, timeout=30)
+        return self._token_async_client
+
+    async def aclose(self):
+        """Close pooled async clients (and the sync session, if any) when done."""
+        self._bind_event_loop()
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
+        self._refresh_task = None
+        self.close()
+        if self._async_client:
+            await self._async_client.aclose()
+            self._async_client = None
+        if self._token_async_client:
+            await self._token_async_client.aclose()
+            self._token_async_client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
     # =========================================================================
     # TOKEN MANAGEMENT
     # =========================================================================
@@ -117,21 +277,45 @@ class BolagsverketVDMClient:
     def _invalidate_token(self):
         """Invalidate cached token (forces refresh on next request)."""
         self._access_token = None
-        self._token_expires_at = None
+        self._token_expires_at = 0.0
+        self._token_renew_at = 0.0
         logger.debug("Token invalidated")
 
+    def _cached_token(self) -> Optional[str]:
+        """Return cached token if still valid (with margin before expiration)."""
+        if self._access_token and time.monotonic() < self._token_renew_at:
+            return self._access_token
+        return None
+
+    def _store_token(self, token_data: Dict[str, Any]) -> Optional[str]:
+        """Cache token and its monotonic deadlines from a token response."""
+        expires_in = token_data.get("expires_in", 3600)
+        now = time.monotonic()
+        self._access_token = token_data.get("access_token")
+        self._token_expires_at = now + expires_in
+        self._token_renew_at = now + expires_in - self.TOKEN_MARGIN_SECONDS
+        return self._access_token
+
     def _get_token_sync(self) -> Optional[str]:
         """Get or refresh OAuth token (sync)."""
         if not self.is_configured:
             return None
 
-        # Return cached token if still valid (with margin before expiration)
-        if self._access_token and self._token_expires_at:
-            if datetime.now() < self._token_expires_at - timedelta(seconds=self.TOKEN_MARGIN_SECONDS):
-                return self._access_token
+        token = self._cached_token()
+        if token:
+            return token
 
+        # Only one thread refreshes; the others reuse the fresh token
+        with self._token_lock_sync:
+            token = self._cached_token()
+            if token:
+                return token
+            return self._refresh_token_sync()
+
+    def _refresh_token_sync(self) -> Optional[str]:
+        """Fetch a new OAuth token (sync). Caller must hold the token lock."""
         try:
-            response = requests.post(
+            response = self._get_sync_session().post(
                 self.token_url,
                 headers={"Content-Type": "application/x-www-form-urlencoded"},
                 data={
@@ -142,19 +326,19 @@ class BolagsverketVDMClient:
                 },
                 timeout=30
             )
-            response.raise_for_status()
+            if response.status_code != 200:
+                logger.error(f"Failed to get OAuth token: status={response.status_code}")
+                return None
 
-            token_data = response.json()
-            self._access_token = token_data.get("access_token")
-            expires_in = token_data.get("expires_in", 3600)
-            self._token_expires_at = datetime.now() + timedelta(seconds=expires_in)
+            token_data = _loads(response.content)
+            token = self._store_token(token_data)
 
             logger.debug(
                 "OAuth token refreshed",
-                expires_in=expires_in
+                expires_in=token_data.get("expires_in", 3600)
             )
 
-            return self._access_token
+            return token
 
         except Exception as e:
             logger.error(f"Failed to get OAuth token: {e}")
@@ -166,126 +350,192 @@ class BolagsverketVDMClient:
             logger.warning("Bolagsverket VDM client not configured (missing client_id or client_secret)")
             return None
 
-        # Return cached token if still valid (with margin before expiration)
-        if self._access_token and self._token_expires_at:
-            if datetime.now() < self._token_expires_at - timedelta(seconds=self.TOKEN_MARGIN_SECONDS):
-                return self._access_token
+        token = self._cached_token()
+        if token:
+            return token
 
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.token_url,
-                    headers={"Content-Type": "application/x-www-form-urlencoded"},
-                    data={
-                        "grant_type": "client_credentials",
-                        "client_id": self.client_id,
-                        "client_secret": self.client_secret,
-                        "scope": "vardefulla-datamangder:ping vardefulla-datamangder:read"
-                    },
-                    timeout=30
-                )
-                response.raise_for_status()
+        # Inside the renewal margin but not yet expired: keep serving the
+        # current token and renew in the background instead of blocking
+        if self._access_token and time.monotonic() < self._token_expires_at:
+            self._bind_event_loop()
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = asyncio.create_task(self._refresh_token_background())
+            return self._access_token
 
-                token_data = response.json()
-                self._access_token = token_data.get("access_token")
-                expires_in = token_data.get("expires_in", 3600)
-                self._token_expires_at = datetime.now() + timedelta(seconds=expires_in)
+        # Only one coroutine refreshes; the others wait and reuse the fresh token
+        async with self._get_token_lock():
+            token = self._cached_token()
+            if token:
+                return token
+            return await self._refresh_token_async()
+
+    def _get_token_lock(self) -> asyncio.Lock:
+        """Get or create the async token lock."""
+        self._bind_event_loop()
+        if self._token_lock is None:
+            self._token_lock = asyncio.Lock()
+        return self._token_lock
+
+    async def _refresh_token_background(self):
+        """
+        Renew the token ahead of expiry.
+
+        Failures are only logged by _refresh_token_async; once the old token
+        expires, the next caller falls back to an inline refresh.
+        """
+        async with self._get_token_lock():
+            if self._cached_token():
+                return
+            await self._refresh_token_async()
+
+    async def _refresh_token_async(self) -> Optional[str]:
+        """Fetch a new OAuth token (async). Caller must hold the token lock."""
+        try:
+            client = await self._get_token_async_client()
+            response = await client.post(
+                self.token_url,
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+                data={
+                    "grant_type": "client_credentials",
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                    "scope": "vardefulla-datamangder:ping vardefulla-datamangder:read"
+                },
+                timeout=30
+            )
+            if response.status_code != 200:
+                logger.error(f"Failed to get OAuth token (async): status={response.status_code}")
+                return None
 
-                return self._access_token
+            return self._store_token(_loads(response.content))
 
         except Exception as e:
             logger.error(f"Failed to get OAuth token (async): {e}")
             return None
 
     # =========================================================================
-    # SYNC API
+    # RATE LIMITING
     # =========================================================================
 
-    def _format_orgnr(self, orgnr: str) -> tuple[str, str]:
+    def _get_429_wait(self, response, attempt: int) -> float:
         """
-        Format organization number for API.
+        Seconds to wait before retrying a 429 response.
 
-        Swedish org numbers: NNNNNN-NNNN (e.g., 556012-5791)
-
-        Returns:
-            Tuple of (clean_orgnr_10_digits, formatted_orgnr_with_hyphen)
+        Honors the Retry-After header (seconds or HTTP-date) when present,
+        otherwise uses jittered exponential backoff so concurrent callers
+        hitting the limit together don't retry in lockstep.
         """
-        orgnr_clean = orgnr.replace("-", "").replace(" ", "")
-
-        # Handle 12-digit personnummer format (YYYYMMDDNNNN)
-        if len(orgnr_clean) == 12:
-            # Keep as-is for personnummer
-            return orgnr_clean, orgnr_clean
+        retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(
+            self.BACKOFF_BASE_SECONDS,
+            self.BACKOFF_BASE_SECONDS * (2 ** (attempt + 1))
+        )
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header value into seconds (None if missing/invalid)."""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
 
-        # Standard 10-digit format
-        if len(orgnr_clean) == 10:
-            formatted = f"{orgnr_clean[:6]}-{orgnr_clean[6:]}"
-            return orgnr_clean, formatted
+    # =========================================================================
+    # SYNC API
+    # =========================================================================
 
-        # Already has hyphen in input - use as-is
-        return orgnr_clean, orgnr
+    def _format_orgnr(self, orgnr: str) -> tuple[str, str]:
+        """Format organization number for API (see format_orgnr)."""
+        return format_orgnr(orgnr)
 
-    def get_company(self, orgnr: str, _retry_count: int = 0) -> Optional[Dict[str, Any]]:
+    def get_company(self, orgnr: str, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
         """
         Get company information from Bolagsverket VDM API (sync).
 
         Args:
             orgnr: Organization number (with or without hyphen)
-            _retry_count: Internal retry counter (do not set manually)
+            force_refresh: Skip the cache (the fresh result is still cached)
 
         Returns:
             Standardized company data dict or None if not found
         """
         orgnr_clean, orgnr_formatted = self._format_orgnr(orgnr)
 
-        token = self._get_token_sync()
-        if not token:
-            logger.warning("No OAuth token available")
-            return None
+        if not force_refresh:
+            hit, cached = self._company_cache.lookup(orgnr_clean)
+            if hit:
+                # Callers merge into the result; never hand out the cached object
+                return copy.deepcopy(cached)
+
+        payload = {"identitetsbeteckning": orgnr_formatted}
+        auth_retries = 0
 
         start_time = time.perf_counter()
 
         try:
-            response = requests.post(
-                f"{self.api_base_url}/organisationer",
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "Content-Type": "application/json",
-                    "Accept": "application/json"
-                },
-                json={"identitetsbeteckning": orgnr_formatted},
-                timeout=30
-            )
+            session = self._get_sync_session()
+            while True:
+                token = self._get_token_sync()
+                if not token:
+                    logger.warning("No OAuth token available")
+                    return None
+
+                response = session.post(
+                    f"{self.api_base_url}/organisationer",
+                    headers={
+                        "Authorization": f"Bearer {token}",
+                        "Content-Type": "application/json",
+                        "Accept": "application/json",
+                        "Accept-Encoding": _JSON_ACCEPT_ENCODING
+                    },
+                    json=payload,
+                    timeout=30
+                )
 
-            # Handle 401 with retry
-            if response.status_code == 401 and _retry_count < self.MAX_RETRIES:
-                logger.warning(f"Got 401 for {orgnr}, refreshing token and retrying...")
-                self._invalidate_token()
-                return self.get_company(orgnr, _retry_count + 1)
+                # Handle 401 with retry
+                if response.status_code == 401 and auth_retries < self.MAX_RETRIES:
+                    logger.warning(f"Got 401 for {orgnr}, refreshing token and retrying...")
+                    self._invalidate_token()
+                    auth_retries += 1
+                    continue
 
-            if response.status_code == 404:
-                logger.info(f"Company not found: {orgnr}")
-                return None
+                if response.status_code == 404:
+                    logger.info(f"Company not found: {orgnr}")
+                    return self._cache_company(orgnr_clean, None)
 
-            response.raise_for_status()
-            data = response.json()
+                if response.status_code != 200:
+                    logger.error(f"HTTP error for {orgnr}: status={response.status_code}")
+                    return None
 
-            duration_ms = (time.perf_counter() - start_time) * 1000
-            logger.info(
-                f"Fetched {orgnr} from Bolagsverket VDM",
-                orgnr=orgnr,
-                duration_ms=round(duration_ms, 2)
-            )
+                data = _loads(response.content)
 
-            return self._parse_response(data, orgnr_clean)
+                duration_ms = (time.perf_counter() - start_time) * 1000
+                logger.info(
+                    f"Fetched {orgnr} from Bolagsverket VDM",
+                    orgnr=orgnr,
+                    duration_ms=round(duration_ms, 2)
+                )
+
+                return self._cache_company(orgnr_clean, self._parse_response(data, orgnr_clean))
 
-        except requests.exceptions.HTTPError as e:
-            logger.error(f"HTTP error for {orgnr}: {e}")
-            return None
         except Exception as e:
             logger.error(f"Error fetching {orgnr}: {e}")
             return None
 
+    def _cache_company(self, orgnr_clean: str, result: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Cache a company lookup result (misses get a shorter TTL) and return a copy."""
+        ttl = self.NEGATIVE_CACHE_TTL_SECONDS if result is None else None
+        self._company_cache.set(orgnr_clean, result, ttl=ttl)
+        return copy.deepcopy(result)
+
     def scrape_company(self, orgnr: str) -> Optional[Dict[str, Any]]:
         """Alias for get_company (interface compatibility)."""
         return self.get_company(orgnr)
@@ -294,49 +544,64 @@ class BolagsverketVDMClient:
     # ASYNC API
     # =========================================================================
 
-    async def get_company_async(self, orgnr: str, _retry_count: int = 0) -> Optional[Dict[str, Any]]:
+    async def get_company_async(self, orgnr: str, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
         """
         Get company information from Bolagsverket VDM API (async).
 
         Args:
             orgnr: Organization number (with or without hyphen)
-            _retry_count: Internal retry counter (do not set manually)
+            force_refresh: Skip the cache (the fresh result is still cached)
 
         Returns:
             Standardized company data dict or None if not found
         """
         orgnr_clean, orgnr_formatted = self._format_orgnr(orgnr)
 
-        token = await self._get_token_async()
-        if not token:
-            return None
+        if not force_refresh:
+            hit, cached = self._company_cache.lookup(orgnr_clean)
+            if hit:
+                # Callers merge into the result; never hand out the cached object
+                return copy.deepcopy(cached)
+
+        payload = {"identitetsbeteckning": orgnr_formatted}
+        auth_retries = 0
 
         start_time = time.perf_counter()
 
         try:
-            async with httpx.AsyncClient() as client:
+            client = await self._get_async_client()
+            while True:
+                token = await self._get_token_async()
+                if not token:
+                    return None
+
                 response = await client.post(
-                    f"{self.api_base_url}/organisationer",
+                    "/organisationer",
                     headers={
                         "Authorization": f"Bearer {token}",
                         "Content-Type": "application/json",
-                        "Accept": "application/json"
+                        "Accept": "application/json",
+                        "Accept-Encoding": _JSON_ACCEPT_ENCODING
                     },
-                    json={"identitetsbeteckning": orgnr_formatted},
+                    json=payload,
                     timeout=30
                 )
 
                 # Handle 401 with retry
-                if response.status_code == 401 and _retry_count < self.MAX_RETRIES:
+                if response.status_code == 401 and auth_retries < self.MAX_RETRIES:
                     logger.warning(f"Got 401 for {orgnr}, refreshing token and retrying...")
                     self._invalidate_token()
-                    return await self.get_company_async(orgnr, _retry_count + 1)
+                    auth_retries += 1
+                    continue
 
                 if response.status_code == 404:
+                    return self._cache_company(orgnr_clean, None)
+
+                if response.status_code != 200:
+                    logger.error(f"Async HTTP error for {orgnr}: status={response.status_code}")
                     return None
 
-                response.raise_for_status()
-                data = response.json()
+                data = _loads(response.content)
 
                 duration_ms = (time.perf_counter() - start_time) * 1000
                 logger.info(
@@ -345,7 +610,7 @@ class BolagsverketVDMClient:
                     duration_ms=round(duration_ms, 2)
                 )
 
-                return self._parse_response(data, orgnr_clean)
+                return self._cache_company(orgnr_clean, self._parse_response(data, orgnr_clean))
 
         except Exception as e:
             logger.error(f"Async error fetching {orgnr}: {e}")
@@ -355,87 +620,135 @@ class BolagsverketVDMClient:
         """Alias for get_company_async (interface compatibility)."""
         return await self.get_company_async(orgnr)
 
+    async def bulk_get_company_async(
+        self, orgnrs: List[str], concurrency: int = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get company information for many orgnrs concurrently (async).
+
+        Args:
+            orgnrs: Organization numbers
+            concurrency: Max requests in flight (defaults to BULK_CONCURRENCY)
+
+        Returns:
+            Results aligned with input order (None where not found/failed)
+        """
+        return await self._bulk(self.get_company_async, orgnrs, concurrency)
+
+    async def _bulk(self, fetch, orgnrs: List[str], concurrency: Optional[int]) -> List[Any]:
+        """Run fetch(orgnr) for every orgnr, throttled by a semaphore."""
+        semaphore = asyncio.Semaphore(concurrency or self.BULK_CONCURRENCY)
+
+        async def guarded(orgnr: str):
+            async with semaphore:
+                return await fetch(orgnr)
+
+        return await asyncio.gather(*[guarded(orgnr) for orgnr in orgnrs])
+
     # =========================================================================
     # DOCUMENT LIST (Årsredovisningar)
     # =========================================================================
 
-    def get_document_list(self, orgnr: str, _retry_count: int = 0) -> List[Dict]:
+    def get_document_list(self, orgnr: str) -> List[Dict]:
         """
         Get list of annual reports for a company (sync).
 
         Returns list of document metadata with dokumentId for download.
         """
-        _, orgnr_formatted = self._format_orgnr(orgnr)
+        orgnr_clean, orgnr_formatted = self._format_orgnr(orgnr)
 
-        token = self._get_token_sync()
-        if not token:
-            return []
+        hit, cached = self._document_list_cache.lookup(orgnr_clean)
+        if hit:
+            return copy.deepcopy(cached)
+
+        payload = {"identitetsbeteckning": orgnr_formatted}
+        auth_retries = 0
 
         try:
-            response = requests.post(
-                f"{self.api_base_url}/dokumentlista",
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "Content-Type": "application/json"
-                },
-                json={"identitetsbeteckning": orgnr_formatted},
-                timeout=30
-            )
+            session = self._get_sync_session()
+            while True:
+                token = self._get_token_sync()
+                if not token:
+                    return []
+
+                response = session.post(
+                    f"{self.api_base_url}/dokumentlista",
+                    headers={
+                        "Authorization": f"Bearer {token}",
+                        "Content-Type": "application/json",
+                        "Accept-Encoding": _JSON_ACCEPT_ENCODING
+                    },
+                    json=payload,
+                    timeout=30
+                )
 
-            # Handle 401 with retry
-            if response.status_code == 401 and _retry_count < self.MAX_RETRIES:
-                logger.warning(f"Got 401 for document list {orgnr}, refreshing token...")
-                self._invalidate_token()
-                return self.get_document_list(orgnr, _retry_count + 1)
+                # Handle 401 with retry
+                if response.status_code == 401 and auth_retries < self.MAX_RETRIES:
+                    logger.warning(f"Got 401 for document list {orgnr}, refreshing token...")
+                    self._invalidate_token()
+                    auth_retries += 1
+                    continue
 
-            if response.status_code != 200:
-                return []
+                if response.status_code != 200:
+                    return []
 
-            data = response.json()
-            return data.get("dokument", [])
+                data = _loads(response.content)
+                documents = data.get("dokument", [])
+                self._document_list_cache.set(orgnr_clean, documents)
+                return copy.deepcopy(documents)
 
         except Exception as e:
             logger.error(f"Error getting document list for {orgnr}: {e}")
             return []
 
-    async def get_document_list_async(
-        self, orgnr: str, _retry_count: int = 0, _429_retry_count: int = 0
-    ) -> List[Dict]:
+    async def get_document_list_async(self, orgnr: str) -> List[Dict]:
         """Get list of annual reports for a company (async)."""
-        _, orgnr_formatted = self._format_orgnr(orgnr)
+        orgnr_clean, orgnr_formatted = self._format_orgnr(orgnr)
 
-        token = await self._get_token_async()
-        if not token:
-            logger.warning(f"No OAuth token available for document list {orgnr}")
-            return []
+        hit, cached = self._document_list_cache.lookup(orgnr_clean)
+        if hit:
+            return copy.deepcopy(cached)
+
+        payload = {"identitetsbeteckning": orgnr_formatted}
+        auth_retries = 0
+        rate_retries = 0
 
         try:
-            async with httpx.AsyncClient() as client:
+            client = await self._get_async_client()
+            while True:
+                token = await self._get_token_async()
+                if not token:
+                    logger.warning(f"No OAuth token available for document list {orgnr}")
+                    return []
+
                 response = await client.post(
-                    f"{self.api_base_url}/dokumentlista",
+                    "/dokumentlista",
                     headers={
                         "Authorization": f"Bearer {token}",
-                        "Content-Type": "application/json"
+                        "Content-Type": "application/json",
+                        "Accept-Encoding": _JSON_ACCEPT_ENCODING
                     },
-                    json={"identitetsbeteckning": orgnr_formatted},
+                    json=payload,
                     timeout=30
                 )
 
                 # Handle 401 with retry (token refresh)
-                if response.status_code == 401 and _retry_count < self.MAX_RETRIES:
+                if response.status_code == 401 and auth_retries < self.MAX_RETRIES:
                     logger.warning(f"Got 401 for document list {orgnr}, refreshing token...")
                     self._invalidate_token()
-                    return await self.get_document_list_async(orgnr, _retry_count + 1, _429_retry_count)
+                    auth_retries += 1
+                    continue
 
-                # Handle 429 with exponential backoff
-                if response.status_code == 429 and _429_retry_count < self.MAX_429_RETRIES:
-                    wait_time = self.BACKOFF_BASE_SECONDS * (2 ** _429_retry_count)
+                # Handle 429 with jittered exponential backoff (or Retry-After)
+                if response.status_code == 429 and rate_retries < self.MAX_429_RETRIES:
+                    wait_time = self._get_429_wait(response, rate_retries)
                     logger.warning(
-                        f"Got 429 for document list {orgnr}, waiting {wait_time}s "
-                        f"(retry {_429_retry_count + 1}/{self.MAX_429_RETRIES})"
+                        f"Got 429 for document list {orgnr}, waiting {wait_time:.1f}s "
+                        f"(retry {rate_retries + 1}/{self.MAX_429_RETRIES})"
                     )
                     await asyncio.sleep(wait_time)
-                    return await self.get_document_list_async(orgnr, _retry_count, _429_retry_count + 1)
+                    rate_retries += 1
+                    continue
 
                 if response.status_code == 429:
                     logger.error(f"429 rate limit exceeded for {orgnr} after {self.MAX_429_RETRIES} retries")
@@ -445,130 +758,212 @@ class BolagsverketVDMClient:
                     logger.warning(f"Document list failed for {orgnr}: status={response.status_code}")
                     return []
 
-                data = response.json()
+                data = _loads(response.content)
                 documents = data.get("dokument", [])
                 logger.info(f"Found {len(documents)} documents for {orgnr}")
-                return documents
+                self._document_list_cache.set(orgnr_clean, documents)
+                return copy.deepcopy(documents)
 
         except Exception as e:
             logger.error(f"Async error getting document list for {orgnr}: {e}")
             return []
 
+    async def bulk_get_document_list_async(
+        self, orgnrs: List[str], concurrency: int = None
+    ) -> List[List[Dict]]:
+        """
+        Get annual report lists for many orgnrs concurrently (async).
+
+        Results are aligned with input order ([] where none/failed).
+        """
+        return await self._bulk(self.get_document_list_async, orgnrs, concurrency)
+
     # =========================================================================
     # DOCUMENT DOWNLOAD (Årsredovisningar - ZIP/XBRL)
     # =========================================================================
 
-    def download_document(self, dokument_id: str, _retry_count: int = 0) -> Optional[bytes]:
+    def download_document(self, dokument_id: str) -> Optional[bytes]:
         """
         Download annual report document as ZIP (sync).
 
+        The body is streamed and the ZIP signature checked on the first
+        chunk, so non-ZIP responses are rejected without reading them fully.
+
         Args:
             dokument_id: Document ID from get_document_list
 
         Returns:
             ZIP file content as bytes, or None on failure
         """
-        token = self._get_token_sync()
-        if not token:
-            return None
+        auth_retries = 0
 
         try:
-            response = requests.get(
-                f"{self.api_base_url}/dokument/{dokument_id}",
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "Accept": "application/zip"
-                },
-                timeout=60
-            )
-
-            # Handle 401 with retry
-            if response.status_code == 401 and _retry_count < self.MAX_RETRIES:
-                logger.warning(f"Got 401 for document {dokument_id}, refreshing token...")
-                self._invalidate_token()
-                return self.download_document(dokument_id, _retry_count + 1)
-
-            if response.status_code != 200:
-                logger.warning(f"Failed to download {dokument_id}: {response.status_code}")
-                return None
-
-            content = response.content
-
-            # Verify it's a ZIP file (starts with PK)
-            if not content.startswith(b'PK'):
-                logger.warning(f"Downloaded content is not a ZIP: {dokument_id}")
-                return None
+            session = self._get_sync_session()
+            while True:
+                token = self._get_token_sync()
+                if not token:
+                    return None
 
-            return content
+                with session.get(
+                    f"{self.api_base_url}/dokument/{dokument_id}",
+                    headers={
+                        "Authorization": f"Bearer {token}",
+                        "Accept": "application/zip"
+                    },
+                    timeout=60,
+                    stream=True
+                ) as response:
+                    # Handle 401 with retry
+                    if response.status_code == 401 and auth_retries < self.MAX_RETRIES:
+                        logger.warning(f"Got 401 for document {dokument_id}, refreshing token...")
+                        self._invalidate_token()
+                        auth_retries += 1
+                        continue
+
+                    if response.status_code != 200:
+                        logger.warning(f"Failed to download {dokument_id}: {response.status_code}")
+                        return None
+
+                    chunks = response.iter_content(chunk_size=self.DOWNLOAD_CHUNK_SIZE)
+                    buf = bytearray()
+                    for chunk in chunks:
+                        buf.extend(chunk)
+                        if len(buf) >= 2:
+                            break
+
+                    # Verify it's a ZIP file (starts with PK) before reading the rest
+                    if not buf.startswith(b'PK'):
+                        logger.warning(f"Downloaded content is not a ZIP: {dokument_id}")
+                        return None
+
+                    for chunk in chunks:
+                        buf.extend(chunk)
+
+                    return bytes(buf)
 
         except Exception as e:
             logger.error(f"Error downloading document {dokument_id}: {e}")
             return None
 
-    async def download_document_async(
-        self, dokument_id: str, _retry_count: int = 0, _429_retry_count: int = 0
-    ) -> Optional[bytes]:
+    async def download_document_async(self, dokument_id: str) -> Optional[bytes]:
         """
         Download annual report document as ZIP (async).
 
+        Streams via download_document_to_async, so a non-ZIP response is
+        rejected after its first chunk instead of being buffered in full.
+
         Args:
             dokument_id: Document ID from get_document_list_async
 
         Returns:
             ZIP file content as bytes, or None on failure
         """
-        token = await self._get_token_async()
-        if not token:
+        buf = bytearray()
+
+        async def append(chunk: bytes):
+            buf.extend(chunk)
+
+        written = await self.download_document_to_async(dokument_id, append)
+        if written is None:
             return None
+        return bytes(buf)
+
+    async def download_document_to_async(
+        self, dokument_id: str, writer: Callable[[bytes], Awaitable[None]]
+    ) -> Optional[int]:
+        """
+        Stream annual report ZIP into a caller-provided sink (async).
+
+        Unlike download_document_async, the document is never held in memory
+        as a whole; chunks are forwarded to writer as they arrive.
+
+        Args:
+            dokument_id: Document ID from get_document_list_async
+            writer: Async callable receiving each chunk in order
+
+        Returns:
+            Number of bytes written, or None on failure. Non-ZIP content is
+            rejected before anything is passed to writer.
+        """
+        auth_retries = 0
+        rate_retries = 0
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.api_base_url}/dokument/{dokument_id}",
+            client = await self._get_async_client()
+            while True:
+                token = await self._get_token_async()
+                if not token:
+                    return None
+
+                async with client.stream(
+                    "GET",
+                    f"/dokument/{dokument_id}",
                     headers={
                         "Authorization": f"Bearer {token}",
                         "Accept": "application/zip"
                     },
                     timeout=60
-                )
+                ) as response:
+                    status_code = response.status_code
+                    if status_code == 200:
+                        return await self._stream_zip(response, dokument_id, writer)
+                    wait_time = self._get_429_wait(response, rate_retries) if status_code == 429 else 0
 
                 # Handle 401 with retry (token refresh)
-                if response.status_code == 401 and _retry_count < self.MAX_RETRIES:
+                if status_code == 401 and auth_retries < self.MAX_RETRIES:
                     logger.warning(f"Got 401 for document {dokument_id}, refreshing token...")
                     self._invalidate_token()
-                    return await self.download_document_async(dokument_id, _retry_count + 1, _429_retry_count)
+                    auth_retries += 1
+                    continue
 
-                # Handle 429 with exponential backoff
-                if response.status_code == 429 and _429_retry_count < self.MAX_429_RETRIES:
-                    wait_time = self.BACKOFF_BASE_SECONDS * (2 ** _429_retry_count)
+                # Handle 429 with jittered exponential backoff (or Retry-After)
+                if status_code == 429 and rate_retries < self.MAX_429_RETRIES:
                     logger.warning(
-                        f"Got 429 for document {dokument_id}, waiting {wait_time}s "
-                        f"(retry {_429_retry_count + 1}/{self.MAX_429_RETRIES})"
+                        f"Got 429 for document {dokument_id}, waiting {wait_time:.1f}s "
+                        f"(retry {rate_retries + 1}/{self.MAX_429_RETRIES})"
                     )
                     await asyncio.sleep(wait_time)
-                    return await self.download_document_async(dokument_id, _retry_count, _429_retry_count + 1)
+                    rate_retries += 1
+                    continue
 
-                if response.status_code == 429:
+                if status_code == 429:
                     logger.error(f"429 rate limit exceeded for document {dokument_id} after {self.MAX_429_RETRIES} retries")
                     return None
 
-                if response.status_code != 200:
-                    logger.warning(f"Failed to download {dokument_id}: {response.status_code}")
-                    return None
+                logger.warning(f"Failed to download {dokument_id}: {status_code}")
+                return None
 
-                content = response.content
+        except Exception as e:
+            logger.error(f"Async error streaming document {dokument_id}: {e}")
+            return None
 
-                # Verify it's a ZIP file (starts with PK)
-                if not content.startswith(b'PK'):
+    async def _stream_zip(
+        self, response: httpx.Response, dokument_id: str, writer: Callable[[bytes], Awaitable[None]]
+    ) -> Optional[int]:
+        """Forward response body to writer, checking the ZIP magic bytes first."""
+        head = b""
+        written = 0
+
+        async for chunk in response.aiter_bytes(self.DOWNLOAD_CHUNK_SIZE):
+            if not written:
+                # Buffer only until the 2-byte "PK" signature can be checked
+                head += chunk
+                if len(head) < 2:
+                    continue
+                if not head.startswith(b'PK'):
                     logger.warning(f"Downloaded content is not a ZIP: {dokument_id}")
                     return None
+                chunk, head = head, b""
 
-                return content
+            await writer(chunk)
+            written += len(chunk)
 
-        except Exception as e:
-            logger.error(f"Async error downloading document {dokument_id}: {e}")
+        if not written:
+            logger.warning(f"Downloaded content is not a ZIP: {dokument_id}")
             return None
 
+        return written
+
     # =========================================================================
     # DATA PARSING
     # =========================================================================
@@ -593,96 +988,84 @@ class BolagsverketVDMClient:
             }]
         }
         """
-        orgs = data.get("organisationer", [])
+        orgs = data.get("organisationer")
         if not orgs:
             return None
 
         # Get first organization (usually only one)
-        org = orgs[0]
+        org_get = orgs[0].get
 
         result = {
             "orgnr": orgnr
         }
 
-        # Organization name
-        namn_obj = org.get("organisationsnamn", {})
-        namn_lista = namn_obj.get("organisationsnamnLista", [])
-        if namn_lista:
-            # Get primary name (FORETAGSNAMN)
-            for namn in namn_lista:
-                if namn.get("organisationsnamntyp", {}).get("kod") == "FORETAGSNAMN":
-                    result["name"] = namn.get("namn")
-                    break
-            if "name" not in result and namn_lista:
-                result["name"] = namn_lista[0].get("namn")
+        # Organization name - primary name (FORETAGSNAMN), else first listed
+        if (namn_obj := org_get("organisationsnamn")) and (namn_lista := namn_obj.get("organisationsnamnLista")):
+            result["name"] = next(
+                (
+                    namn.get("namn") for namn in namn_lista
+                    if (namn.get("organisationsnamntyp") or {}).get("kod") == "FORETAGSNAMN"
+                ),
+                namn_lista[0].get("namn")
+            )
 
         # Organization form (AB, HB, etc.)
-        org_form = org.get("organisationsform", {})
-        if org_form and not org_form.get("fel"):
+        if (org_form := org_get("organisationsform")) and not org_form.get("fel"):
             result["company_type"] = org_form.get("klartext")
             # Note: company_type_code not in DB schema
 
         # Legal form (from SCB) - stored as purpose for now
-        juridisk_form = org.get("juridiskForm", {})
-        if juridisk_form and not juridisk_form.get("fel"):
+        if (juridisk_form := org_get("juridiskForm")) and not juridisk_form.get("fel"):
             result["purpose"] = juridisk_form.get("klartext")
             # Note: legal_form_code not in DB schema
 
         # Status (active/inactive)
-        verksam = org.get("verksamOrganisation", {})
-        if verksam and not verksam.get("fel"):
-            is_active = verksam.get("kod") == "JA"
-            result["status"] = "ACTIVE" if is_active else "INACTIVE"
+        if (verksam := org_get("verksamOrganisation")) and not verksam.get("fel"):
+            result["status"] = "ACTIVE" if verksam.get("kod") == "JA" else "INACTIVE"
 
         # Deregistration info
-        avreg = org.get("avregistreradOrganisation", {})
-        if avreg and avreg.get("avregistreringsdatum"):
+        if (avreg := org_get("avregistreradOrganisation")) and avreg.get("avregistreringsdatum"):
             result["status"] = "DEREGISTERED"
             # Note: deregistration_date not in DB schema
 
         # Note: avregistreringsorsak not in DB schema
 
         # Ongoing procedures (konkurs, likvidation, etc.) - update status only
-        forfarande = org.get("pagaendeAvvecklingsEllerOmstruktureringsforfarande", {})
-        if forfarande:
-            lista = forfarande.get("pagaendeAvvecklingsEllerOmstruktureringsforfarandeLista", [])
-            if lista:
-                # Update status based on procedures
-                codes = [p.get("kod") for p in lista]
-                if "KK" in codes:
-                    result["status"] = "BANKRUPTCY"
-                elif "LI" in codes:
-                    result["status"] = "LIQUIDATION"
-                # Note: ongoing_procedures list not in DB schema
+        if (forfarande := org_get("pagaendeAvvecklingsEllerOmstruktureringsforfarande")) and (
+            lista := forfarande.get("pagaendeAvvecklingsEllerOmstruktureringsforfarandeLista")
+        ):
+            codes = {p.get("kod") for p in lista}
+            if "KK" in codes:
+                result["status"] = "BANKRUPTCY"
+            elif "LI" in codes:
+                result["status"] = "LIQUIDATION"
+            # Note: ongoing_procedures list not in DB schema
 
         # Registration date
-        org_datum = org.get("organisationsdatum", {})
-        if org_datum and not org_datum.get("fel"):
+        if (org_datum := org_get("organisationsdatum")) and not org_datum.get("fel"):
             result["registered_date"] = org_datum.get("registreringsdatum")
             # Note: scb_registered_date not in DB schema
 
         # Postal address
-        postadress_obj = org.get("postadressOrganisation", {})
-        if postadress_obj and not postadress_obj.get("fel"):
-            postadress = postadress_obj.get("postadress", {})
-            result["postal_street"] = postadress.get("utdelningsadress")
-            result["postal_code"] = postadress.get("postnummer")
-            result["postal_city"] = postadress.get("postort")
+        if (postadress_obj := org_get("postadressOrganisation")) and not postadress_obj.get("fel"):
+            postadress_get = (postadress_obj.get("postadress") or {}).get
+            result["postal_street"] = postadress_get("utdelningsadress")
+            result["postal_code"] = postadress_get("postnummer")
+            result["postal_city"] = postadress_get("postort")
             # Note: postal_country, postal_co not in DB schema
 
-        # SNI codes (industry classification)
-        naringsgren = org.get("naringsgrenOrganisation", {})
-        if naringsgren and not naringsgren.get("fel"):
-            sni_list = naringsgren.get("sni", [])
-            if sni_list:
-                result["industries"] = []
-                for i, sni in enumerate(sni_list):
-                    result["industries"].append({
+        # SNI codes (industry classification) - first code is primary
+        if (naringsgren := org_get("naringsgrenOrganisation")) and not naringsgren.get("fel"):
+            if sni_list := naringsgren.get("sni"):
+                result["industries"] = [
+                    {
                         "sni_code": sni.get("kod"),
                         "sni_description": sni.get("klartext"),
                         "is_primary": 1 if i == 0 else 0,
-                        "source": "bolagsverket_vdm"
-                    })
+                        "source": SOURCE_NAME
+                    }
+                    for i, sni in enumerate(sni_list)
+                ]
 
         # Note: business_description (verksamhetsbeskrivning) not in DB schema
         # Note: ad_block (reklamspärr) not in DB schema
@@ -703,7 +1086,7 @@ class BolagsverketVDMClient:
             return False
 
         try:
-            response = requests.get(
+            response = self._get_sync_session().get(
                 f"{self.api_base_url}/isalive",
                 headers={"Authorization": f"Bearer {token}"},
                 timeout=10
@@ -722,25 +1105,90 @@ class BolagsverketVDMClient:
             return False
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.api_base_url}/isalive",
-                    headers={"Authorization": f"Bearer {token}"},
-                    timeout=10
-                )
-                return response.status_code == 200 and response.text.strip() == "OK"
+            client = await self._get_async_client()
+            response = await client.get(
+                "/isalive",
+                headers={"Authorization": f"Bearer {token}"},
+                timeout=10
+            )
+            return response.status_code == 200 and response.text.strip() == "OK"
         except Exception:
             return False
 
 
+@lru_cache(maxsize=8192)
+def format_orgnr(orgnr: str) -> tuple[str, str]:
+    """
+    Format organization number for API.
+
+    Swedish org numbers: NNNNNN-NNNN (e.g., 556012-5791)
+
+    Memoized: pipelines typically format the same orgnr for the company
+    lookup and again for its document list.
+
+    Returns:
+        Tuple of (clean_orgnr_10_digits, formatted_orgnr_with_hyphen)
+    """
+    orgnr_clean = orgnr.translate(_ORGNR_STRIP_TABLE)
+
+    # Handle 12-digit personnummer format (YYYYMMDDNNNN)
+    if len(orgnr_clean) == 12:
+        # Keep as-is for personnummer
+        return orgnr_clean, orgnr_clean
+
+    # Standard 10-digit format
+    if len(orgnr_clean) == 10:
+        formatted = f"{orgnr_clean[:6]}-{orgnr_clean[6:]}"
+        return orgnr_clean, formatted
+
+    # Already has hyphen in input - use as-is
+    return orgnr_clean, orgnr
+
+
+# Shared clients keyed by (client_id, client_secret, environment)
+_clients: Dict[tuple, BolagsverketVDMClient] = {}
+_clients_lock = threading.Lock()
+
+
 def get_bolagsverket_vdm_client(
     client_id: str = None,
     client_secret: str = None,
     environment: str = "production"
 ) -> BolagsverketVDMClient:
-    """Factory function to create Bolagsverket VDM client."""
-    return BolagsverketVDMClient(
-        client_id=client_id,
-        client_secret=client_secret,
-        environment=environment
-    )
+    """
+    Get the shared Bolagsverket VDM client for a set of credentials.
+
+    Callers with the same credentials and environment get the same
+    instance, and with it the same connection pools, caches and OAuth token.
+    Credentials fall back to the env vars, which are re-read on each call
+    so credentials added after startup still take effect.
+
+    A shared client may be used from successive event loops: its async
+    clients, token lock and refresh task are recreated whenever the running
+    loop changes. Shared clients must not be closed by individual callers; call
+    close_bolagsverket_vdm_clients() on shutdown instead.
+    """
+    client_id = client_id or os.environ.get("BOLAGSVERKET_CLIENT_ID")
+    client_secret = client_secret or os.environ.get("BOLAGSVERKET_CLIENT_SECRET")
+    key = (client_id, client_secret, environment)
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = BolagsverketVDMClient(
+                client_id=client_id,
+                client_secret=client_secret,
+                environment=environment
+            )
+            _clients[key] = client
+        return client
+
+
+async def close_bolagsverket_vdm_clients():
+    """Close and forget all shared VDM clients (call on shutdown)."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+
+    for client in clients:
+        await client.aclose()
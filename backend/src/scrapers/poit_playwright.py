@@ -18,10 +18,13 @@ Usage:
 """
 
 import re
+import time
 import asyncio
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from datetime import datetime, date
-from typing import Dict, Any, Optional, List, Set
-from dataclasses import dataclass, asdict, field
+from typing import Dict, Any, Optional, List, Union
+from dataclasses import dataclass, field, fields
 import logging
 
 try:
@@ -30,6 +33,27 @@ try:
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
 
+try:
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Faster event loop for the CLI entry points (optional, Linux/macOS)
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# Fast JSON serialization (optional, falls back to stdlib json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    import json
+    ORJSON_AVAILABLE = False
+
 try:
     from ..logging_config import get_source_logger
 except ImportError:
@@ -43,7 +67,26 @@ logger = get_source_logger("poit_playwright")
 # Data Classes
 # =============================================================================
 
-@dataclass
+@lru_cache(maxsize=None)
+def _field_names(cls) -> tuple:
+    """Field names of a dataclass (fields() walk done once per class)."""
+    return tuple(f.name for f in fields(cls))
+
+
+def _fast_asdict(obj) -> Dict[str, Any]:
+    """
+    Shallow dataclasses.asdict for flat dataclasses.
+    
+    Skips asdict's recursion and deepcopy; list fields are still copied.
+    """
+    result = {}
+    for name in _field_names(type(obj)):
+        value = getattr(obj, name)
+        result[name] = list(value) if isinstance(value, list) else value
+    return result
+
+
+@dataclass(slots=True)
 class POITCategory:
     """POIT announcement category"""
     key: str
@@ -53,8 +96,12 @@ class POITCategory:
     category_id: Optional[str] = None
     subcategory_id: Optional[str] = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to plain dict (cheaper than dataclasses.asdict)."""
+        return _fast_asdict(self)
+
 
-@dataclass
+@dataclass(slots=True)
 class POITAnnouncement:
     """A single POIT announcement"""
     poit_id: Optional[str] = None
@@ -70,8 +117,12 @@ class POITAnnouncement:
     raw_html: Optional[str] = None
     scraped_at: Optional[str] = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to plain dict (cheaper than dataclasses.asdict)."""
+        return _fast_asdict(self)
 
-@dataclass
+
+@dataclass(slots=True)
 class POITDailyStats:
     """Daily statistics from POIT"""
     date: str
@@ -80,7 +131,7 @@ class POITDailyStats:
     scraped_at: Optional[str] = None
 
 
-@dataclass 
+@dataclass(slots=True)
 class ScrapeResult:
     """Result from a scraping operation"""
     success: bool
@@ -140,6 +191,14 @@ POIT_CATEGORIES = {
 # Org.nr Extraction
 # =============================================================================
 
+# 10 digits with optional hyphen and optional century prefix, in one pass
+# Matches: 5569201998, 556920-1998, 165569201998, 16556920-1998
+_ORGNR_RE = re.compile(r'\b(?:16|19|20)?(\d{6})-?(\d{4})\b')
+
+# Separators removed by normalize_orgnr
+_ORGNR_CLEAN = re.compile(r'[-\s]')
+
+
 def extract_orgnrs(text: str) -> List[str]:
     """
     Extract Swedish organization numbers from text.
@@ -155,33 +214,19 @@ def extract_orgnrs(text: str) -> List[str]:
     if not text:
         return []
     
-    orgnrs: Set[str] = set()
-    
-    # Pattern 1: 10 digits with optional hyphen (most common)
-    # Matches: 5569201998, 556920-1998
-    pattern1 = r'\b(\d{6})-?(\d{4})\b'
+    # Insertion-ordered dedup (typically < 5 matches per text)
+    orgnrs: Dict[str, None] = {}
     
-    # Pattern 2: 12 digits with century prefix  
-    # Matches: 165569201998, 16556920-1998
-    pattern2 = r'\b(16|19|20)(\d{6})-?(\d{4})\b'
-    
-    # Extract pattern 2 first (longer, more specific)
-    for match in re.finditer(pattern2, text):
-        # Skip century prefix, take last 10 digits
-        orgnr = match.group(2) + match.group(3)
-        if _is_valid_orgnr(orgnr):
-            orgnrs.add(orgnr)
-    
-    # Extract pattern 1
-    for match in re.finditer(pattern1, text):
+    for match in _ORGNR_RE.finditer(text):
+        # Century prefix (if any) is outside the groups: last 10 digits
         orgnr = match.group(1) + match.group(2)
-        # Skip if already found with century prefix
-        if orgnr not in orgnrs and _is_valid_orgnr(orgnr):
-            orgnrs.add(orgnr)
+        if _is_valid_orgnr(orgnr):
+            orgnrs[orgnr] = None
     
-    return sorted(list(orgnrs))
+    return sorted(orgnrs)
 
 
+@lru_cache(maxsize=4096)
 def _is_valid_orgnr(orgnr: str) -> bool:
     """
     Basic validation of Swedish org.nr.
@@ -190,22 +235,17 @@ def _is_valid_orgnr(orgnr: str) -> bool:
     - Must be 10 digits
     - First digit indicates entity type (5=AB, 7=EF, 8=IF, 9=kommun, etc.)
     - Should pass Luhn checksum (simplified here)
-    """
-    if not orgnr or len(orgnr) != 10:
-        return False
     
-    if not orgnr.isdigit():
-        return False
-    
-    # First digit should be valid entity type
-    first_digit = int(orgnr[0])
-    if first_digit < 1 or first_digit > 9:
-        return False
-    
-    # Common valid first digits: 5 (AB), 7 (EF), 8 (IF), 9 (kommun)
-    # But we're lenient here to catch edge cases
-    
-    return True
+    Common valid first digits are 5 (AB), 7 (EF), 8 (IF) and 9 (kommun),
+    but we're lenient here and accept any non-zero digit.
+    Cached: the same org.nrs recur across rows and scrapes.
+    """
+    return (
+        orgnr is not None
+        and len(orgnr) == 10
+        and orgnr.isdigit()
+        and orgnr[0] in '123456789'
+    )
 
 
 def normalize_orgnr(orgnr: str) -> str:
@@ -213,7 +253,7 @@ def normalize_orgnr(orgnr: str) -> str:
     if not orgnr:
         return ""
     # Remove any hyphens and spaces
-    clean = re.sub(r'[-\s]', '', orgnr)
+    clean = _ORGNR_CLEAN.sub('', orgnr)
     # If 12 digits with century prefix, take last 10
     if len(clean) == 12 and clean[:2] in ('16', '19', '20'):
         clean = clean[2:]
@@ -224,6 +264,85 @@ def normalize_orgnr(orgnr: str) -> str:
 # Playwright POIT Scraper
 # =============================================================================
 
+# Category key normalization (Swedish characters folded in one translate pass)
+_SWEDISH_TRANS = str.maketrans({
+    'å': 'a', 'ä': 'a', 'ö': 'o',
+    'é': 'e', 'è': 'e', 'ü': 'u'
+})
+_NORMALIZE_NON_ALNUM_RE = re.compile(r'[^a-z0-9]')
+_NORMALIZE_UNDERSCORE_RE = re.compile(r'_+')
+
+# URLs like: /poit-app/urval-senaste-publiceringar/3/20#search
+_CATEGORY_URL_RE = re.compile(r'/urval-senaste-publiceringar/(\d+)(?:/(\d+))?')
+
+# Stats fallback (lxml): any bg-white name span directly followed by a badge
+# span, wherever it sits (the link-based JS extraction already found nothing)
+_STATS_NAME_XPATH = "//span[contains(@class, 'bg-white')][following-sibling::*[1][self::span and contains(@class, 'badge')]]"
+_STATS_BADGE_XPATH = "following-sibling::span[1]"
+_STATS_LINK_XPATH = "ancestor::a[1]"
+
+# Stats fallback without lxml
+# Pattern: <span class="...bg-white...">Name</span><span class="...badge...">COUNT</span>
+_STATS_HTML_RE = re.compile(
+    r'class="[^"]*bg-white[^"]*">([^<]+)</span><span[^>]*class="[^"]*badge[^"]*">(\d+)</span>'
+)
+
+# Third-party tracking requests blocked by the browser context
+_ANALYTICS_URL_RE = re.compile(r'googletagmanager|google-analytics|doubleclick')
+
+# In-page extraction scripts: one evaluate() round-trip instead of several
+# CDP calls per row/link
+
+# Category links on the homepage -> [{href, name, badge}]
+_STATS_LINKS_JS = """
+(selector) => Array.from(document.querySelectorAll(selector), (link) => {
+    const nameElem = link.querySelector('span.bg-white');
+    const badgeElem = link.querySelector('span.badge');
+    return {
+        href: link.getAttribute('href') || '',
+        name: nameElem ? nameElem.innerText : null,
+        badge: badgeElem ? badgeElem.innerText : null,
+    };
+})
+"""
+
+# Result rows: first selector with matches (fallback: any tr), limited,
+# header rows skipped -> {selector, total, rows: [{index, text, html, firstCell, href}]}
+# (html is the first 2000 chars of innerHTML, or null unless includeHtml)
+_ROW_DATA_JS = """
+([selectors, limit, includeHtml]) => {
+    let selector = null;
+    let rows = [];
+    for (const candidate of selectors) {
+        rows = Array.from(document.querySelectorAll(candidate));
+        if (rows.length) {
+            selector = candidate;
+            break;
+        }
+    }
+    if (!rows.length) {
+        rows = Array.from(document.querySelectorAll('tr'));
+    }
+    const data = [];
+    rows.slice(0, limit).forEach((row, index) => {
+        if (row.querySelector('th')) {
+            return;
+        }
+        const firstCell = row.querySelector('td');
+        const link = row.querySelector('a');
+        data.push({
+            index: index,
+            text: row.innerText,
+            html: includeHtml ? row.innerHTML.slice(0, 2000) : null,
+            firstCell: firstCell ? firstCell.innerText : null,
+            href: link ? link.getAttribute('href') : null,
+        });
+    });
+    return {selector: selector, total: rows.length, rows: data};
+}
+"""
+
+
 class POITPlaywrightScraper:
     """
     Playwright-based scraper for Bolagsverket's POIT (Post- och Inrikes Tidningar).
@@ -243,12 +362,31 @@ class POITPlaywrightScraper:
     BASE_URL = "https://poit.bolagsverket.se"
     POIT_APP_URL = "https://poit.bolagsverket.se/poit-app/"
     
+    # Requests aborted at the context level (we only read text/HTML)
+    BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+    
+    # Pages used to scrape categories in parallel (kept small for POIT)
+    PAGE_POOL_SIZE = 3
+    
+    # Elements that signal the (client-rendered) content is ready
+    STATS_SELECTOR = "a.kungorelser__link, a.kungorelser__link--sub"
+    ROW_SELECTORS = [
+        "table.table tbody tr",
+        ".search-result-item",
+        ".kungorelse-item",
+        "[class*='result'] tr",
+        "table tbody tr"
+    ]
+    CONTENT_WAIT_TIMEOUT = 10000  # ms
+    
     def __init__(
         self,
         headless: bool = True,
         slow_mo: int = 100,
         timeout: int = 30000,
-        debug: bool = False
+        debug: bool = False,
+        block_resources: bool = True,
+        page_pool_size: int = None
     ):
         """
         Initialize POIT Playwright scraper.
@@ -258,16 +396,21 @@ class POITPlaywrightScraper:
             slow_mo: Slow down actions by ms (helps avoid bot detection)
             timeout: Default timeout in ms
             debug: Enable debug logging
+            block_resources: Skip loading images, stylesheets, fonts, media and analytics
+            page_pool_size: Pages for parallel category scraping (default: PAGE_POOL_SIZE)
         """
         self.headless = headless
         self.slow_mo = slow_mo
         self.timeout = timeout
         self.debug = debug
+        self.block_resources = block_resources
+        self.page_pool_size = max(1, page_pool_size or self.PAGE_POOL_SIZE)
         
         self._playwright = None
         self._browser: Optional[Browser] = None
         self._context: Optional[BrowserContext] = None
         self._page: Optional[Page] = None
+        self._pages: List[Page] = []
         self._ready = False
         self._last_stats: Optional[POITDailyStats] = None
     
@@ -321,22 +464,28 @@ class POITPlaywrightScraper:
                 timezone_id='Europe/Stockholm'
             )
             
-            # Create page
-            self._page = await self._context.new_page()
-            self._page.set_default_timeout(self.timeout)
+            # Drop assets and analytics for every page in this context
+            if self.block_resources:
+                await self._context.route("**/*", self._route_request)
+            
+            # Create page pool; the first page is the main page (homepage/stats)
+            for _ in range(self.page_pool_size):
+                page = await self._context.new_page()
+                page.set_default_timeout(self.timeout)
+                self._pages.append(page)
+            self._page = self._pages[0]
             
             self._log("Browser started, navigating to POIT...")
             
             # Navigate to POIT
-            response = await self._page.goto(self.POIT_APP_URL, wait_until='networkidle')
+            response = await self._page.goto(self.POIT_APP_URL, wait_until='domcontentloaded')
             
             if not response or response.status >= 400:
                 self._log(f"Failed to load POIT: HTTP {response.status if response else 'no response'}", "error")
                 return False
             
-            # Wait for page to be ready
-            await self._page.wait_for_load_state('domcontentloaded')
-            await asyncio.sleep(2)  # Additional wait for dynamic content
+            # Wait for dynamic content (category links)
+            await self._wait_for_content(self._page, self.STATS_SELECTOR)
             
             # Check for CAPTCHA or blocking
             content = await self._page.content()
@@ -359,11 +508,37 @@ class POITPlaywrightScraper:
             await self.close()
             return False
     
+    async def _route_request(self, route):
+        """Abort asset and analytics requests; let everything else through."""
+        request = route.request
+        if (
+            request.resource_type in self.BLOCKED_RESOURCE_TYPES
+            or _ANALYTICS_URL_RE.search(request.url)
+        ):
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    async def _wait_for_content(self, page: "Page", selector: str):
+        """
+        Wait until selector is attached instead of a fixed sleep.
+        
+        A timeout is not an error: callers fall back to generic parsing.
+        """
+        try:
+            await page.wait_for_selector(
+                selector,
+                state='attached',
+                timeout=self.CONTENT_WAIT_TIMEOUT
+            )
+        except Exception as e:
+            self._log(f"Timed out waiting for '{selector}': {e}", "warning")
+    
     async def close(self):
         """Close browser and release resources."""
         try:
-            if self._page:
-                await self._page.close()
+            for page in self._pages:
+                await page.close()
             if self._context:
                 await self._context.close()
             if self._browser:
@@ -374,6 +549,7 @@ class POITPlaywrightScraper:
             self._log(f"Error during cleanup: {e}", "warning")
         finally:
             self._page = None
+            self._pages = []
             self._context = None
             self._browser = None
             self._playwright = None
@@ -394,29 +570,27 @@ class POITPlaywrightScraper:
         try:
             # Navigate to homepage if not already there
             current_url = self._page.url
-            if "/poit-app/" not in current_url or "/sok" in current_url:
-                await self._page.goto(self.POIT_APP_URL, wait_until='networkidle')
-                await asyncio.sleep(2)
+            if (
+                "/poit-app/" not in current_url
+                or "/sok" in current_url
+                or "/urval-senaste-publiceringar/" in current_url
+            ):
+                await self._page.goto(self.POIT_APP_URL, wait_until='domcontentloaded')
+                await self._wait_for_content(self._page, self.STATS_SELECTOR)
             
             categories: Dict[str, POITCategory] = {}
             total = 0
             
-            # Find all category links
-            links = await self._page.query_selector_all(
-                "a.kungorelser__link, a.kungorelser__link--sub"
-            )
+            # Find all category links (name from bg-white span, count from badge)
+            links = await self._page.evaluate(_STATS_LINKS_JS, self.STATS_SELECTOR)
             
             for link in links:
                 try:
-                    href = await link.get_attribute("href") or ""
+                    href = link["href"]
                     
-                    # Get name from bg-white span
-                    name_elem = await link.query_selector("span.bg-white")
-                    badge_elem = await link.query_selector("span.badge")
-                    
-                    if name_elem and badge_elem:
-                        name = (await name_elem.inner_text()).strip()
-                        count_text = (await badge_elem.inner_text()).strip()
+                    if link["name"] is not None and link["badge"] is not None:
+                        name = link["name"].strip()
+                        count_text = link["badge"].strip()
                         
                         if name and count_text.isdigit():
                             count = int(count_text)
@@ -464,7 +638,9 @@ class POITPlaywrightScraper:
         self,
         category_key: str,
         limit: int = 100,
-        extract_details: bool = True
+        extract_details: bool = True,
+        page: Optional["Page"] = None,
+        include_raw_html: bool = False
     ) -> ScrapeResult:
         """
         Scrape announcements from a specific category.
@@ -473,6 +649,8 @@ class POITPlaywrightScraper:
             category_key: Category key (e.g., "konkurser", "bolagsverkets_registreringar")
             limit: Maximum announcements to scrape
             extract_details: Whether to extract detailed content (slower)
+            page: Page to use (default: main page)
+            include_raw_html: Keep up to 2000 chars of row HTML per announcement
             
         Returns:
             ScrapeResult with announcements
@@ -499,15 +677,18 @@ class POITPlaywrightScraper:
         try:
             self._log(f"Scraping category: {cat.name} ({cat.count} items)")
             
+            page = page or self._page
+            
             # Navigate to category page
-            await self._page.goto(cat.url, wait_until='networkidle')
-            await asyncio.sleep(2)
+            await page.goto(cat.url, wait_until='domcontentloaded')
             
             announcements = await self._extract_announcements(
+                page,
                 category=cat.name,
                 category_key=category_key,
                 limit=limit,
-                extract_details=extract_details
+                extract_details=extract_details,
+                include_raw_html=include_raw_html
             )
             
             return ScrapeResult(
@@ -550,23 +731,35 @@ class POITPlaywrightScraper:
             return {}
         
         # Determine which categories to scrape
-        target_categories = categories or list(stats.categories.keys())
+        target_categories = [
+            cat_key for cat_key in (categories or list(stats.categories.keys()))
+            if cat_key in stats.categories
+        ]
         
-        results: Dict[str, ScrapeResult] = {}
+        # Each category borrows a page from the pool, so at most
+        # page_pool_size categories load concurrently
+        pool: asyncio.Queue = asyncio.Queue()
+        for page in self._pages:
+            pool.put_nowait(page)
         
-        for cat_key in target_categories:
-            if cat_key in stats.categories:
+        async def scrape(cat_key: str) -> ScrapeResult:
+            page = await pool.get()
+            try:
                 self._log(f"Scraping {cat_key}...")
                 result = await self.scrape_category(
                     cat_key,
-                    limit=limit_per_category
+                    limit=limit_per_category,
+                    page=page
                 )
-                results[cat_key] = result
-                
-                # Small delay between categories
+                # Small delay before the page takes the next category
                 await asyncio.sleep(1)
+                return result
+            finally:
+                pool.put_nowait(page)
         
-        return results
+        scraped = await asyncio.gather(*(scrape(cat_key) for cat_key in target_categories))
+        
+        return dict(zip(target_categories, scraped))
     
     async def scrape_bankruptcies(self, limit: int = 100) -> ScrapeResult:
         """Convenience method to scrape bankruptcy announcements."""
@@ -578,95 +771,49 @@ class POITPlaywrightScraper:
     
     async def _extract_announcements(
         self,
+        page: "Page",
         category: str,
         category_key: str,
         limit: int,
-        extract_details: bool = True
+        extract_details: bool = True,
+        include_raw_html: bool = False
     ) -> List[POITAnnouncement]:
-        """Extract announcements from current page."""
+        """Extract announcements from the page's current content."""
         announcements = []
         
         try:
-            # Wait for content to load
-            await self._page.wait_for_load_state('networkidle')
-            
-            # Try different selectors for result rows
-            selectors = [
-                "table.table tbody tr",
-                ".search-result-item",
-                ".kungorelse-item", 
-                "[class*='result'] tr",
-                "table tbody tr"
-            ]
-            
-            rows = []
-            for selector in selectors:
-                rows = await self._page.query_selector_all(selector)
-                if rows:
-                    self._log(f"Found {len(rows)} rows with selector: {selector}")
-                    break
-            
-            if not rows:
-                # Fallback: try to get any table rows
-                rows = await self._page.query_selector_all("tr")
-                self._log(f"Fallback: found {len(rows)} generic rows")
-            
-            for i, row in enumerate(rows[:limit]):
+            # Wait for result rows to render
+            await self._wait_for_content(page, ", ".join(self.ROW_SELECTORS))
+            
+            # Collect all row data in a single round-trip to the browser,
+            # trying the row selectors in order (header rows are skipped in-page)
+            row_data = await page.evaluate(
+                _ROW_DATA_JS,
+                [self.ROW_SELECTORS, limit, include_raw_html]
+            )
+            
+            if row_data["selector"]:
+                self._log(f"Found {row_data['total']} rows with selector: {row_data['selector']}")
+            else:
+                # Fallback: any table rows
+                self._log(f"Fallback: found {row_data['total']} generic rows")
+            
+            # One timestamp per scrape, shared by all rows
+            today_iso = date.today().isoformat()
+            now_iso = datetime.now().isoformat()
+            id_prefix = f"poit_{today_iso}_{category_key}_"
+            
+            # Rows are plain data at this point, so building announcements
+            # needs no further browser round-trips
+            for row in row_data["rows"]:
                 try:
-                    # Skip header rows
-                    header_cells = await row.query_selector_all("th")
-                    if header_cells:
-                        continue
-                    
-                    # Get row text
-                    text = (await row.inner_text()).strip()
-                    if not text or len(text) < 10:
-                        continue
-                    
-                    # Get row HTML for detailed extraction
-                    html = await row.inner_html()
-                    
-                    # Extract org.nrs from text
-                    orgnrs = extract_orgnrs(text)
-                    
-                    # Try to extract company name (usually first cell or first line)
-                    cells = await row.query_selector_all("td")
-                    company_name = None
-                    title_text = text[:200]
-                    
-                    if cells and len(cells) > 0:
-                        first_cell = (await cells[0].inner_text()).strip()
-                        if first_cell and len(first_cell) > 2:
-                            company_name = first_cell
-                            title_text = first_cell
-                    
-                    # Try to find a link for more details
-                    link = await row.query_selector("a")
-                    source_url = None
-                    if link:
-                        source_url = await link.get_attribute("href")
-                        if source_url and not source_url.startswith("http"):
-                            source_url = f"{self.BASE_URL}{source_url}"
-                    
-                    # Create announcement
-                    ann = POITAnnouncement(
-                        poit_id=f"poit_{date.today().isoformat()}_{category_key}_{i}",
-                        category=category,
-                        title=title_text,
-                        company_name=company_name,
-                        orgnr=orgnrs[0] if orgnrs else None,
-                        announcement_date=date.today().isoformat(),
-                        content=text,
-                        source_url=source_url,
-                        extracted_orgnrs=orgnrs,
-                        raw_html=html[:2000] if html else None,
-                        scraped_at=datetime.now().isoformat()
+                    ann = self._build_announcement(
+                        row, category, id_prefix, today_iso, now_iso
                     )
-                    
-                    announcements.append(ann)
-                    
+                    if ann:
+                        announcements.append(ann)
                 except Exception as e:
-                    self._log(f"Error extracting row {i}: {e}", "warning")
+                    self._log(f"Error extracting row {row['index']}: {e}", "warning")
                     continue
             
             self._log(f"Extracted {len(announcements)} announcements from {category}")
@@ -676,6 +823,56 @@ class POITPlaywrightScraper:
         
         return announcements
     
+    def _build_announcement(
+        self,
+        row: Dict[str, Any],
+        category: str,
+        id_prefix: str,
+        today_iso: str,
+        now_iso: str
+    ) -> Optional[POITAnnouncement]:
+        """
+        Build an announcement from one row of _ROW_DATA_JS output (None to skip).
+        
+        The poit_id is id_prefix ("poit_{date}_{category_key}_") + row index.
+        """
+        # Get row text
+        text = (row["text"] or "").strip()
+        if not text or len(text) < 10:
+            return None
+        
+        # Extract org.nrs from text
+        orgnrs = extract_orgnrs(text)
+        
+        # Try to extract company name (usually first cell or first line)
+        company_name = None
+        title_text = text[:200]
+        
+        if row["firstCell"] is not None:
+            first_cell = row["firstCell"].strip()
+            if first_cell and len(first_cell) > 2:
+                company_name = first_cell
+                title_text = first_cell
+        
+        # Link for more details
+        source_url = row["href"]
+        if source_url and not source_url.startswith("http"):
+            source_url = f"{self.BASE_URL}{source_url}"
+        
+        return POITAnnouncement(
+            poit_id=id_prefix + str(row["index"]),
+            category=category,
+            title=title_text,
+            company_name=company_name,
+            orgnr=orgnrs[0] if orgnrs else None,
+            announcement_date=today_iso,
+            content=text,
+            source_url=source_url,
+            extracted_orgnrs=orgnrs,
+            raw_html=row["html"] or None,
+            scraped_at=now_iso
+        )
+    
     async def screenshot(self, path: str) -> bool:
         """Save screenshot of current page."""
         if self._page:
@@ -692,45 +889,69 @@ class POITPlaywrightScraper:
             return await self._page.content()
         return ""
     
-    def _normalize_key(self, name: str) -> str:
-        """Normalize category name to a key."""
-        key = name.lower()
-        # Swedish character replacements
-        replacements = {
-            'å': 'a', 'ä': 'a', 'ö': 'o',
-            'é': 'e', 'è': 'e', 'ü': 'u'
-        }
-        for old, new in replacements.items():
-            key = key.replace(old, new)
-        key = re.sub(r'[^a-z0-9]', '_', key)
-        key = re.sub(r'_+', '_', key)
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _normalize_key(name: str) -> str:
+        """Normalize category name to a key (cached: names repeat across scrapes)."""
+        key = name.lower().translate(_SWEDISH_TRANS)
+        key = _NORMALIZE_NON_ALNUM_RE.sub('_', key)
+        key = _NORMALIZE_UNDERSCORE_RE.sub('_', key)
         return key.strip('_')
     
-    def _parse_category_url(self, url: str) -> tuple:
-        """Extract category and subcategory IDs from URL."""
-        # URLs like: /poit-app/urval-senaste-publiceringar/3/20#search
-        match = re.search(r'/urval-senaste-publiceringar/(\d+)(?:/(\d+))?', url)
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _parse_category_url(url: str) -> tuple:
+        """Extract category and subcategory IDs from URL (cached)."""
+        match = _CATEGORY_URL_RE.search(url)
         if match:
             return match.group(1), match.group(2)
         return None, None
     
     def _parse_stats_from_html(self, html: str) -> Dict[str, POITCategory]:
-        """Parse statistics directly from HTML (fallback method)."""
+        """
+        Parse statistics directly from HTML (fallback method).
+        
+        Uses a single lxml DOM parse when available, pairing each bg-white name
+        span with the badge span after it (and the link URL of an enclosing
+        <a>, if any); otherwise falls back to regex matching over the raw HTML.
+        """
         categories = {}
         
-        # Pattern: <span class="...bg-white...">Name</span><span class="...badge...">COUNT</span>
-        pattern = r'class="[^"]*bg-white[^"]*">([^<]+)</span><span[^>]*class="[^"]*badge[^"]*">(\d+)</span>'
-        matches = re.findall(pattern, html)
+        if not LXML_AVAILABLE:
+            for name, count in _STATS_HTML_RE.findall(html):
+                name = name.strip()
+                if 2 < len(name) < 60:
+                    key = self._normalize_key(name)
+                    categories[key] = POITCategory(
+                        key=key,
+                        name=name,
+                        count=int(count),
+                        url=""
+                    )
+            return categories
         
-        for name, count in matches:
-            name = name.strip()
-            if 2 < len(name) < 60:
+        try:
+            tree = lxml.html.fromstring(html)
+        except Exception as e:
+            self._log(f"Could not parse stats HTML: {e}", "warning")
+            return categories
+        
+        for name_elem in tree.xpath(_STATS_NAME_XPATH):
+            badge_elem = name_elem.xpath(_STATS_BADGE_XPATH)[0]
+            name = name_elem.text_content().strip()
+            count_text = badge_elem.text_content().strip()
+            if 2 < len(name) < 60 and count_text.isdigit():
                 key = self._normalize_key(name)
+                links = name_elem.xpath(_STATS_LINK_XPATH)
+                href = (links[0].get("href") or "") if links else ""
+                cat_id, subcat_id = self._parse_category_url(href)
                 categories[key] = POITCategory(
                     key=key,
                     name=name,
-                    count=int(count),
-                    url=""
+                    count=int(count_text),
+                    url=href,
+                    category_id=cat_id,
+                    subcategory_id=subcat_id
                 )
         
         return categories
@@ -740,70 +961,206 @@ class POITPlaywrightScraper:
 # Convenience Functions
 # =============================================================================
 
-async def scrape_poit_stats() -> Optional[Dict[str, Any]]:
+# Shared scraper the convenience functions can opt into (reuse=True: one
+# browser launch instead of one per call), recycled after SCRAPER_MAX_USES
+# calls or SCRAPER_MAX_AGE_SECONDS to bound browser memory growth and stale
+# stats. Whoever opts in owns the event loop and calls close_scraper().
+SCRAPER_MAX_USES = 50
+SCRAPER_MAX_AGE_SECONDS = 30 * 60
+
+_shared_scraper: Optional[POITPlaywrightScraper] = None
+_shared_scraper_uses = 0
+_shared_scraper_started = 0.0
+_shared_scraper_lock: Optional[asyncio.Lock] = None
+_shared_scraper_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+@asynccontextmanager
+async def get_scraper(reuse: bool = True):
+    """
+    Borrow an initialized scraper.
+    
+    With reuse the shared scraper is returned and calls are serialized (the
+    scraper's main page is stateful); otherwise a fresh scraper is started
+    and closed on exit. Yields None if the browser could not be started.
+    
+    Usage:
+        async with get_scraper() as scraper:
+            if scraper:
+                stats = await scraper.get_daily_stats()
+        await close_scraper()
+    """
+    global _shared_scraper, _shared_scraper_uses, _shared_scraper_started
+    global _shared_scraper_lock, _shared_scraper_loop
+    
+    if not reuse:
+        scraper = POITPlaywrightScraper(headless=True, debug=False)
+        try:
+            yield scraper if await scraper.initialize() else None
+        finally:
+            await scraper.close()
+        return
+    
+    loop = asyncio.get_running_loop()
+    if _shared_scraper_loop is not loop:
+        # The browser, driver and lock belong to an earlier event loop (e.g.
+        # a previous asyncio.run) and can no longer be awaited; start over
+        _shared_scraper = None
+        _shared_scraper_lock = asyncio.Lock()
+        _shared_scraper_loop = loop
+    
+    async with _shared_scraper_lock:
+        scraper = _shared_scraper
+        if scraper is not None and (
+            not scraper._ready
+            or _shared_scraper_uses >= SCRAPER_MAX_USES
+            or time.monotonic() - _shared_scraper_started >= SCRAPER_MAX_AGE_SECONDS
+        ):
+            await scraper.close()
+            scraper = _shared_scraper = None
+        
+        if scraper is None:
+            scraper = POITPlaywrightScraper(headless=True, debug=False)
+            if not await scraper.initialize():
+                await scraper.close()
+                yield None
+                return
+            _shared_scraper = scraper
+            _shared_scraper_uses = 0
+            _shared_scraper_started = time.monotonic()
+        
+        _shared_scraper_uses += 1
+        yield scraper
+
+
+async def close_scraper():
+    """Close the shared scraper (call on shutdown, from the loop that used it)."""
+    global _shared_scraper
+    
+    if _shared_scraper is not None:
+        scraper, _shared_scraper = _shared_scraper, None
+        if _shared_scraper_loop is asyncio.get_running_loop():
+            await scraper.close()
+
+
+def install_uvloop() -> bool:
+    """
+    Use uvloop for event loops created after this call, if installed.
+    
+    Meant for script entry points only: installing it on import would
+    change the loop policy for every importer (e.g. the API server).
+    
+    Returns:
+        True if uvloop is in use
+    """
+    if UVLOOP_AVAILABLE:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return UVLOOP_AVAILABLE
+
+
+def _dumps(obj: Any) -> bytes:
+    """
+    Serialize scrape output to JSON bytes.
+    
+    orjson serializes the (slotted) dataclasses directly in C; the stdlib
+    fallback converts them via to_dict() first.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_DATACLASS)
+    return json.dumps(
+        obj,
+        default=lambda o: o.to_dict(),
+        ensure_ascii=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+async def scrape_poit_stats(reuse: bool = False) -> Optional[Dict[str, Any]]:
     """
     Quick function to get today's POIT statistics.
     
+    Args:
+        reuse: Use the shared scraper (caller must await close_scraper())
+    
     Returns:
         Dict with category statistics or None on failure
     """
-    async with POITPlaywrightScraper(headless=True, debug=False) as scraper:
-        stats = await scraper.get_daily_stats()
+    async with get_scraper(reuse) as scraper:
+        stats = await scraper.get_daily_stats() if scraper else None
         if stats:
             return {
                 "date": stats.date,
                 "scraped_at": stats.scraped_at,
                 "total": stats.total_announcements,
                 "categories": {
-                    k: asdict(v) for k, v in stats.categories.items()
+                    k: v.to_dict() for k, v in stats.categories.items()
                 }
             }
     return None
 
 
-async def scrape_poit_bankruptcies(limit: int = 100) -> List[Dict]:
+async def scrape_poit_bankruptcies(
+    limit: int = 100,
+    serialize: bool = False,
+    reuse: bool = False
+) -> Union[List[Dict], bytes]:
     """
     Quick function to get today's bankruptcy announcements.
     
+    Args:
+        limit: Max announcements
+        serialize: Return a JSON array (bytes) instead of dicts
+        reuse: Use the shared scraper (caller must await close_scraper())
+    
     Returns:
-        List of bankruptcy announcement dicts
+        List of bankruptcy announcement dicts (or JSON bytes)
     """
-    async with POITPlaywrightScraper(headless=True, debug=False) as scraper:
-        result = await scraper.scrape_bankruptcies(limit=limit)
-        if result.success:
-            return [asdict(a) for a in result.announcements]
-    return []
+    announcements: List[POITAnnouncement] = []
+    async with get_scraper(reuse) as scraper:
+        result = await scraper.scrape_bankruptcies(limit=limit) if scraper else None
+        if result and result.success:
+            announcements = result.announcements
+    
+    if serialize:
+        return _dumps(announcements)
+    return [a.to_dict() for a in announcements]
 
 
 async def scrape_poit_all(
     categories: Optional[List[str]] = None,
-    limit_per_category: int = 50
-) -> Dict[str, List[Dict]]:
+    limit_per_category: int = 50,
+    serialize: bool = False,
+    reuse: bool = False
+) -> Union[Dict[str, List[Dict]], bytes]:
     """
     Scrape all POIT categories.
     
     Args:
         categories: Specific categories to scrape (None = all)
         limit_per_category: Max items per category
+        serialize: Return a JSON object (bytes) instead of dicts
+        reuse: Use the shared scraper (caller must await close_scraper())
         
     Returns:
-        Dict mapping category to list of announcement dicts
+        Dict mapping category to list of announcement dicts (or JSON bytes)
     """
-    results = {}
+    announcements: Dict[str, List[POITAnnouncement]] = {}
     
-    async with POITPlaywrightScraper(headless=True, debug=False) as scraper:
+    async with get_scraper(reuse) as scraper:
         scrape_results = await scraper.scrape_all_categories(
             limit_per_category=limit_per_category,
             categories=categories
-        )
+        ) if scraper else {}
         
         for cat_key, result in scrape_results.items():
-            if result.success:
-                results[cat_key] = [asdict(a) for a in result.announcements]
-            else:
-                results[cat_key] = []
+            announcements[cat_key] = result.announcements if result.success else []
     
-    return results
+    if serialize:
+        return _dumps(announcements)
+    return {
+        cat_key: [a.to_dict() for a in anns]
+        for cat_key, anns in announcements.items()
+    }
 
 
 # =============================================================================
@@ -853,4 +1210,5 @@ async def _test_scraper():
 
 
 if __name__ == "__main__":
+    install_uvloop()
     asyncio.run(_test_scraper())
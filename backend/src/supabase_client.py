@@ -10,9 +10,20 @@ Data Sources:
 import os
 import re
 import json
-from datetime import datetime
-from typing import Optional, Dict, Any, List
+import time
+import asyncio
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Optional, Dict, Any, List, Iterator
 from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Control characters stripped from search input
+_CTRL_RE = re.compile(r'[\x00-\x1f\x7f]')
+
+# Escape SQL LIKE special characters (backslash included) in one pass
+_LIKE_TABLE = str.maketrans({'\\': '\\\\', '%': '\\%', '_': '\\_'})
 
 
 def sanitize_search_input(value: str, max_length: int = 100) -> str:
@@ -27,25 +38,22 @@ def sanitize_search_input(value: str, max_length: int = 100) -> str:
     if not value:
         return ""
 
-    # Truncate to max length
-    value = value[:max_length]
-
-    # Remove null bytes and other control characters
-    value = re.sub(r'[\x00-\x1f\x7f]', '', value)
-
-    # Escape SQL LIKE special characters
-    # Order matters: escape backslash first
-    value = value.replace('\\', '\\\\')
-    value = value.replace('%', '\\%')
-    value = value.replace('_', '\\_')
-
-    return value.strip()
+    # Truncate, remove null bytes/control characters, escape LIKE specials
+    return _CTRL_RE.sub('', value[:max_length]).translate(_LIKE_TABLE).strip()
 
 try:
     from supabase import create_client, Client
+    from postgrest.exceptions import APIError
+    from postgrest.types import ReturnMethod
 except ImportError:
     raise ImportError("supabase package required. Install with: pip install supabase")
 
+import httpx
+
+from .ttl_cache import TTLCache
+from .retry import calculate_backoff
+from .circuit_breaker import get_circuit_breaker, CircuitOpenError
+
 try:
     from .logging_config import get_logger
 except ImportError:
@@ -56,12 +64,128 @@ except ImportError:
 
 logger = get_logger("supabase_client")
 
+# Child tables embedded in get_company (all reference companies.orgnr)
+COMPANY_RELATIONS = (
+    'roles',
+    'financials',
+    'industries',
+    'trademarks',
+    'related_companies',
+    'announcements',
+)
+COMPANY_FULL_SELECT = '*,' + ','.join(f'{r}(*)' for r in COMPANY_RELATIONS)
+
+
+class ResilientTransport(httpx.BaseTransport):
+    """
+    httpx transport wrapper adding backoff retries and a circuit breaker.
+
+    Connect-phase errors are retried for every method (the request never
+    reached the server). Other transport errors are only retried for
+    idempotent methods, so an insert is never applied twice. Transport
+    errors and 5xx responses count as circuit failures; while the circuit
+    is open requests fail fast with CircuitOpenError.
+    """
+
+    IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+    CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport,
+        breaker_name: str = "supabase",
+        max_retries: int = 3,
+        base_delay: float = 0.1,
+        max_delay: float = 2.0
+    ):
+        self._transport = transport
+        self.breaker = get_circuit_breaker(breaker_name)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.breaker.can_execute():
+            self.breaker.record_rejection()
+            raise CircuitOpenError(f"Circuit '{self.breaker.name}' is open")
+
+        retryable = (
+            httpx.TransportError
+            if request.method in self.IDEMPOTENT_METHODS
+            else self.CONNECT_ERRORS
+        )
+
+        attempt = 0
+        while True:
+            try:
+                response = self._transport.handle_request(request)
+                break
+            except retryable as e:
+                if attempt >= self.max_retries:
+                    self.breaker.record_failure()
+                    raise
+                delay = calculate_backoff(
+                    attempt=attempt,
+                    base_delay=self.base_delay,
+                    max_delay=self.max_delay
+                )
+                logger.info(
+                    f"Supabase {request.method} retry {attempt + 1}/{self.max_retries} "
+                    f"after {delay:.2f}s: {type(e).__name__}"
+                )
+                time.sleep(delay)
+                attempt += 1
+            except Exception:
+                self.breaker.record_failure()
+                raise
+
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+    def close(self):
+        self._transport.close()
+
 
 class SupabaseDatabase:
     """
     Supabase database client with interface compatible with SQLite Database class.
     """
 
+    # In-process read cache (company rows and registry lookups)
+    CACHE_MAXSIZE = 10000
+    CACHE_TTL_SECONDS = 60
+    FRESHNESS_TTL_SECONDS = 10  # cache_metadata.last_refresh lookups
+
+    # History snapshots fetched per request
+    HISTORY_PAGE_SIZE = 50
+    HISTORY_TABLES = {
+        'companies_history': 'orgnr',
+        'roles_history': 'company_orgnr',
+    }
+
+    # Max rows per bulk insert request
+    INSERT_BATCH_SIZE = 100
+
+    # Concurrent child-table writes in store_company_complete
+    WRITE_WORKERS = 6
+
+    # PostgREST error code for an unknown RPC function
+    RPC_NOT_FOUND = 'PGRST202'
+    # Postgres error when an ON CONFLICT target has no unique index (the
+    # function was installed before its table's index could be created)
+    RPC_NO_CONFLICT_INDEX = '42P10'
+
+    # PostgREST connection pool
+    HTTP_POOL_LIMITS = httpx.Limits(
+        max_connections=50,
+        max_keepalive_connections=25,
+        keepalive_expiry=30
+    )
+    HTTP_MAX_RETRIES = 3  # With exponential backoff + jitter (ResilientTransport)
+
     def __init__(self):
         """
         Initialize Supabase client using environment variables.
@@ -79,8 +203,92 @@ class SupabaseDatabase:
             )
 
         self.client: Client = create_client(url, key)
+        self._configure_http_pool()
+        self._company_cache = TTLCache(maxsize=self.CACHE_MAXSIZE, ttl=self.CACHE_TTL_SECONDS)
+        self._registry_cache = TTLCache(maxsize=self.CACHE_MAXSIZE, ttl=self.CACHE_TTL_SECONDS)
+        self._freshness_cache = TTLCache(maxsize=self.CACHE_MAXSIZE, ttl=self.FRESHNESS_TTL_SECONDS)
+        self._missing_rpcs = set()
+        self._write_executor = ThreadPoolExecutor(
+            max_workers=self.WRITE_WORKERS,
+            thread_name_prefix="supabase-write"
+        )
         logger.info(f"Connected to Supabase: {url}")
 
+    def _configure_http_pool(self):
+        """
+        Swap the PostgREST session transport for a larger keep-alive pool
+        with retries and a circuit breaker (see ResilientTransport).
+
+        supabase-py builds its own httpx.Client; only the transport is
+        replaced so base URL, auth headers and timeouts are kept.
+        """
+        session = self.client.postgrest.session
+        try:
+            transport = httpx.HTTPTransport(http2=True, limits=self.HTTP_POOL_LIMITS)
+        except ImportError:
+            # h2 not installed
+            transport = httpx.HTTPTransport(limits=self.HTTP_POOL_LIMITS)
+
+        old_transport = session._transport
+        session._transport = ResilientTransport(
+            transport,
+            max_retries=self.HTTP_MAX_RETRIES
+        )
+        old_transport.close()
+
+    def call_rpc(self, function: str, params: Dict[str, Any]):
+        """
+        Call a SQL function from setup_supabase_tables.sql.
+
+        Returns the response, or None if the function has not been created
+        or cannot run for lack of a unique index (remembered for the life of
+        the process so callers fall back once).
+        """
+        if function in self._missing_rpcs:
+            return None
+
+        try:
+            return self.client.rpc(function, params).execute()
+        except APIError as e:
+            if e.code == self.RPC_NOT_FOUND:
+                logger.warning(
+                    f"{function} function missing - run setup_supabase_tables.sql; "
+                    "using per-table requests"
+                )
+            elif e.code == self.RPC_NO_CONFLICT_INDEX:
+                logger.warning(
+                    f"{function} needs a unique index that is missing - re-run "
+                    "setup_supabase_tables.sql; using per-table requests"
+                )
+            else:
+                raise
+            self._missing_rpcs.add(function)
+            return None
+
+    _call_rpc = call_rpc
+
+    def _write_batches(self, table: str, rows: List[Dict[str, Any]], on_conflict: str = None):
+        """
+        Insert rows in slices of INSERT_BATCH_SIZE (upsert if on_conflict
+        is given), keeping each request well under the payload limit.
+        """
+        for start in range(0, len(rows), self.INSERT_BATCH_SIZE):
+            chunk = rows[start:start + self.INSERT_BATCH_SIZE]
+            if on_conflict:
+                query = self.client.table(table).upsert(
+                    chunk,
+                    on_conflict=on_conflict,
+                    returning=ReturnMethod.minimal
+                )
+            else:
+                query = self.client.table(table).insert(chunk, returning=ReturnMethod.minimal)
+            query.execute()
+
+    def _invalidate_company(self, orgnr: str):
+        """Drop cached reads for a company after a write."""
+        self._company_cache.invalidate(('full', orgnr))
+        self._company_cache.invalidate(('basic', orgnr))
+
     # =========================================================================
     # Connection Management (compatibility layer)
     # =========================================================================
@@ -109,6 +317,27 @@ class SupabaseDatabase:
     # Company Operations
     # =========================================================================
 
+    @staticmethod
+    def _stamp_company(data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Add timestamps to a company record.
+
+        created_at is left to the column default (NOW()) on insert and is
+        not part of the payload on update, so upserts never overwrite it.
+        """
+        data['updated_at'] = datetime.utcnow().isoformat()
+        if not data.get('created_at'):
+            data.pop('created_at', None)
+        return data
+
+    @staticmethod
+    def _stamp_rows(orgnr: str, rows: List[Dict[str, Any]], created_at: str) -> List[Dict[str, Any]]:
+        """Set company_orgnr and created_at on child-table rows."""
+        for row in rows:
+            row['company_orgnr'] = orgnr
+            row['created_at'] = created_at
+        return rows
+
     def upsert_company(self, data: Dict[str, Any]) -> bool:
         """
         Insert or update a company record.
@@ -121,17 +350,15 @@ class SupabaseDatabase:
             return False
 
         try:
-            # Add timestamps
-            now = datetime.utcnow().isoformat()
-            data['updated_at'] = now
-            if not data.get('created_at'):
-                data['created_at'] = now
+            self._stamp_company(data)
 
-            result = self.client.table('companies').upsert(
+            self.client.table('companies').upsert(
                 data,
-                on_conflict='orgnr'
+                on_conflict='orgnr',
+                returning=ReturnMethod.minimal
             ).execute()
 
+            self._invalidate_company(data['orgnr'])
             return True
         except Exception as e:
             logger.error(f"Failed to upsert company {data.get('orgnr')}: {e}")
@@ -143,24 +370,30 @@ class SupabaseDatabase:
 
         Returns dict with: company data + roles, financials, industries, etc.
         """
+        hit, cached = self._company_cache.lookup(('full', orgnr))
+        if hit:
+            return dict(cached) if cached else None
+
         try:
-            # Get company
-            result = self.client.table('companies').select('*').eq('orgnr', orgnr).execute()
+            # Company + all relations in one round trip (PostgREST embedding
+            # via the company_orgnr foreign keys)
+            result = self.client.table('companies').select(
+                COMPANY_FULL_SELECT
+            ).eq('orgnr', orgnr).order(
+                'period_year', desc=True, foreign_table='financials'
+            ).execute()
 
             if not result.data:
+                self._company_cache.set(('full', orgnr), None)
                 return None
 
-            company = dict(result.data[0])
+            company = result.data[0]
+            for relation in COMPANY_RELATIONS:
+                if company.get(relation) is None:
+                    company[relation] = []
 
-            # Get related data
-            company['roles'] = self._get_roles(orgnr)
-            company['financials'] = self._get_financials(orgnr)
-            company['industries'] = self._get_industries(orgnr)
-            company['trademarks'] = self._get_trademarks(orgnr)
-            company['related_companies'] = self._get_related_companies(orgnr)
-            company['announcements'] = self._get_announcements(orgnr)
-
-            return company
+            self._company_cache.set(('full', orgnr), company)
+            return dict(company)
 
         except Exception as e:
             logger.error(f"Failed to get company {orgnr}: {e}")
@@ -169,17 +402,25 @@ class SupabaseDatabase:
     def company_exists(self, orgnr: str) -> bool:
         """Check if a company exists in the database."""
         try:
-            result = self.client.table('companies').select('orgnr').eq('orgnr', orgnr).execute()
-            return len(result.data) > 0
+            result = self.client.table('companies').select(
+                'orgnr', count='exact', head=True
+            ).eq('orgnr', orgnr).limit(1).execute()
+            return (result.count or 0) > 0
         except Exception as e:
             logger.error(f"Failed to check company existence {orgnr}: {e}")
             return False
 
     def get_company_basic(self, orgnr: str) -> Optional[Dict[str, Any]]:
         """Get basic company info without relations."""
+        hit, cached = self._company_cache.lookup(('basic', orgnr))
+        if hit:
+            return dict(cached) if cached else None
+
         try:
             result = self.client.table('companies').select('*').eq('orgnr', orgnr).execute()
-            return dict(result.data[0]) if result.data else None
+            company = result.data[0] if result.data else None
+            self._company_cache.set(('basic', orgnr), company)
+            return dict(company) if company else None
         except Exception as e:
             logger.error(f"Failed to get basic company {orgnr}: {e}")
             return None
@@ -192,7 +433,7 @@ class SupabaseDatabase:
         """Get all roles for a company."""
         try:
             result = self.client.table('roles').select('*').eq('company_orgnr', orgnr).execute()
-            return [dict(r) for r in result.data]
+            return result.data or []
         except Exception as e:
             logger.error(f"Failed to get roles for {orgnr}: {e}")
             return []
@@ -203,7 +444,8 @@ class SupabaseDatabase:
             role_data['company_orgnr'] = orgnr
             role_data['created_at'] = datetime.utcnow().isoformat()
 
-            self.client.table('roles').insert(role_data).execute()
+            self.client.table('roles').insert(role_data, returning=ReturnMethod.minimal).execute()
+            self._invalidate_company(orgnr)
             return True
         except Exception as e:
             logger.error(f"Failed to add role for {orgnr}: {e}")
@@ -212,23 +454,44 @@ class SupabaseDatabase:
     def clear_roles(self, orgnr: str) -> bool:
         """Delete all roles for a company (before re-importing)."""
         try:
-            self.client.table('roles').delete().eq('company_orgnr', orgnr).execute()
+            self.client.table('roles').delete(returning=ReturnMethod.minimal).eq('company_orgnr', orgnr).execute()
+            self._invalidate_company(orgnr)
             return True
         except Exception as e:
             logger.error(f"Failed to clear roles for {orgnr}: {e}")
             return False
 
+    @staticmethod
+    def _dedupe_roles(
+        orgnr: str,
+        roles: List[Dict[str, Any]],
+        created_at: str
+    ) -> List[Dict[str, Any]]:
+        """Stamp role rows and deduplicate by (person, role_type, from_date)."""
+        # Keep latest in list
+        seen = {}
+        for role in roles:
+            role['company_orgnr'] = orgnr
+            role['created_at'] = created_at
+            key = (
+                role.get('person_id') or role.get('name'),
+                role.get('role_type'),
+                role.get('from_date')
+            )
+            seen[key] = role  # Later entries overwrite earlier
+
+        return list(seen.values())
+
     def add_roles_batch(self, orgnr: str, roles: List[Dict[str, Any]]) -> bool:
         """Add multiple roles at once."""
         if not roles:
             return True
 
         try:
-            for role in roles:
-                role['company_orgnr'] = orgnr
-                role['created_at'] = datetime.utcnow().isoformat()
+            deduped_list = self._dedupe_roles(orgnr, roles, datetime.utcnow().isoformat())
 
-            self.client.table('roles').insert(roles).execute()
+            self._write_batches('roles', deduped_list)
+            self._invalidate_company(orgnr)
             return True
         except Exception as e:
             logger.error(f"Failed to add roles batch for {orgnr}: {e}")
@@ -244,7 +507,7 @@ class SupabaseDatabase:
             result = self.client.table('financials').select('*').eq(
                 'company_orgnr', orgnr
             ).order('period_year', desc=True).execute()
-            return [dict(f) for f in result.data]
+            return result.data or []
         except Exception as e:
             logger.error(f"Failed to get financials for {orgnr}: {e}")
             return []
@@ -257,37 +520,52 @@ class SupabaseDatabase:
 
             self.client.table('financials').upsert(
                 financials,
-                on_conflict='company_orgnr,period_year'
+                on_conflict='company_orgnr,period_year',
+                returning=ReturnMethod.minimal
             ).execute()
+            self._invalidate_company(orgnr)
             return True
         except Exception as e:
             logger.error(f"Failed to add financials for {orgnr}: {e}")
             return False
 
+    @staticmethod
+    def _dedupe_financials(
+        orgnr: str,
+        financials_list: List[Dict[str, Any]],
+        created_at: str
+    ) -> List[Dict[str, Any]]:
+        """Stamp financial rows and deduplicate by (period_year, is_consolidated)."""
+        # Keep latest in list
+        seen = {}
+        for fin in financials_list:
+            fin['company_orgnr'] = orgnr
+            fin['created_at'] = created_at
+            # Ensure is_consolidated has a value (default False)
+            if 'is_consolidated' not in fin:
+                fin['is_consolidated'] = False
+            # Create unique key
+            key = (fin.get('period_year'), fin.get('is_consolidated', False))
+            seen[key] = fin  # Later entries overwrite earlier
+
+        return list(seen.values())
+
     def add_financials_batch(self, orgnr: str, financials_list: List[Dict[str, Any]]) -> bool:
         """Add multiple financial periods at once."""
         if not financials_list:
             return True
 
         try:
-            # Deduplicate by (period_year, is_consolidated) - keep latest in list
-            seen = {}
-            for fin in financials_list:
-                fin['company_orgnr'] = orgnr
-                fin['created_at'] = datetime.utcnow().isoformat()
-                # Ensure is_consolidated has a value (default False)
-                if 'is_consolidated' not in fin:
-                    fin['is_consolidated'] = False
-                # Create unique key
-                key = (fin.get('period_year'), fin.get('is_consolidated', False))
-                seen[key] = fin  # Later entries overwrite earlier
-
-            deduped_list = list(seen.values())
+            deduped_list = self._dedupe_financials(
+                orgnr, financials_list, datetime.utcnow().isoformat()
+            )
 
-            self.client.table('financials').upsert(
+            self._write_batches(
+                'financials',
                 deduped_list,
                 on_conflict='company_orgnr,period_year,is_consolidated'
-            ).execute()
+            )
+            self._invalidate_company(orgnr)
             return True
         except Exception as e:
             logger.error(f"Failed to add financials batch for {orgnr}: {e}")
@@ -301,7 +579,7 @@ class SupabaseDatabase:
         """Get all industries for a company."""
         try:
             result = self.client.table('industries').select('*').eq('company_orgnr', orgnr).execute()
-            return [dict(i) for i in result.data]
+            return result.data or []
         except Exception as e:
             logger.error(f"Failed to get industries for {orgnr}: {e}")
             return []
@@ -312,16 +590,33 @@ class SupabaseDatabase:
             industry_data['company_orgnr'] = orgnr
             industry_data['created_at'] = datetime.utcnow().isoformat()
 
-            self.client.table('industries').insert(industry_data).execute()
+            self.client.table('industries').insert(industry_data, returning=ReturnMethod.minimal).execute()
+            self._invalidate_company(orgnr)
             return True
         except Exception as e:
             logger.error(f"Failed to add industry for {orgnr}: {e}")
             return False
 
+    def add_industries_batch(self, orgnr: str, industries: List[Dict[str, Any]]) -> bool:
+        """Add multiple industries at once."""
+        if not industries:
+            return True
+
+        try:
+            self._stamp_rows(orgnr, industries, datetime.utcnow().isoformat())
+
+            self._write_batches('industries', industries)
+            self._invalidate_company(orgnr)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to add industries batch for {orgnr}: {e}")
+            return False
+
     def clear_industries(self, orgnr: str) -> bool:
         """Delete all industries for a company."""
         try:
-            self.client.table('industries').delete().eq('company_orgnr', orgnr).execute()
+            self.client.table('industries').delete(returning=ReturnMethod.minimal).eq('company_orgnr', orgnr).execute()
+            self._invalidate_company(orgnr)
             return True
         except Exception as e:
             logger.error(f"Failed to clear industries for {orgnr}: {e}")
@@ -335,40 +630,62 @@ class SupabaseDatabase:
         """Get all trademarks for a company."""
         try:
             result = self.client.table('trademarks').select('*').eq('company_orgnr', orgnr).execute()
-            return [dict(t) for t in result.data]
+            return result.data or []
         except Exception as e:
             logger.error(f"Failed to get trademarks for {orgnr}: {e}")
             return []
 
+    @staticmethod
+    def _trademark_row(orgnr: str, trademark_data: Dict[str, Any], created_at: str) -> Dict[str, Any]:
+        """Map field names from scraper to database schema."""
+        db_data = {
+            'company_orgnr': orgnr,
+            'trademark_name': trademark_data.get('name') or trademark_data.get('trademark_name'),
+            'name': trademark_data.get('name'),  # Also store in new column
+            'registration_number': trademark_data.get('registration_number'),
+            'registration_date': trademark_data.get('registration_date'),
+            'expiry_date': trademark_data.get('expiry_date'),
+            'status': trademark_data.get('status'),
+            'class_codes': trademark_data.get('class_codes'),
+            'source': trademark_data.get('source'),
+            'created_at': created_at
+        }
+        # Remove None values
+        return {k: v for k, v in db_data.items() if v is not None}
+
     def add_trademark(self, orgnr: str, trademark_data: Dict[str, Any]) -> bool:
         """Add a trademark to a company."""
         try:
-            # Map field names from scraper to database schema
-            db_data = {
-                'company_orgnr': orgnr,
-                'trademark_name': trademark_data.get('name') or trademark_data.get('trademark_name'),
-                'name': trademark_data.get('name'),  # Also store in new column
-                'registration_number': trademark_data.get('registration_number'),
-                'registration_date': trademark_data.get('registration_date'),
-                'expiry_date': trademark_data.get('expiry_date'),
-                'status': trademark_data.get('status'),
-                'class_codes': trademark_data.get('class_codes'),
-                'source': trademark_data.get('source'),
-                'created_at': datetime.utcnow().isoformat()
-            }
-            # Remove None values
-            db_data = {k: v for k, v in db_data.items() if v is not None}
+            db_data = self._trademark_row(orgnr, trademark_data, datetime.utcnow().isoformat())
 
-            self.client.table('trademarks').insert(db_data).execute()
+            self.client.table('trademarks').insert(db_data, returning=ReturnMethod.minimal).execute()
+            self._invalidate_company(orgnr)
             return True
         except Exception as e:
             logger.error(f"Failed to add trademark for {orgnr}: {e}")
             return False
 
+    def add_trademarks_batch(self, orgnr: str, trademarks: List[Dict[str, Any]]) -> bool:
+        """Add multiple trademarks at once."""
+        if not trademarks:
+            return True
+
+        try:
+            now = datetime.utcnow().isoformat()
+            rows = [self._trademark_row(orgnr, t, now) for t in trademarks]
+
+            self._write_batches('trademarks', rows)
+            self._invalidate_company(orgnr)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to add trademarks batch for {orgnr}: {e}")
+            return False
+
     def clear_trademarks(self, orgnr: str) -> bool:
         """Delete all trademarks for a company."""
         try:
-            self.client.table('trademarks').delete().eq('company_orgnr', orgnr).execute()
+            self.client.table('trademarks').delete(returning=ReturnMethod.minimal).eq('company_orgnr', orgnr).execute()
+            self._invalidate_company(orgnr)
             return True
         except Exception as e:
             logger.error(f"Failed to clear trademarks for {orgnr}: {e}")
@@ -382,7 +699,7 @@ class SupabaseDatabase:
         """Get all related companies (group structure)."""
         try:
             result = self.client.table('related_companies').select('*').eq('company_orgnr', orgnr).execute()
-            return [dict(r) for r in result.data]
+            return result.data or []
         except Exception as e:
             logger.error(f"Failed to get related companies for {orgnr}: {e}")
             return []
@@ -392,10 +709,9 @@ class SupabaseDatabase:
         if not companies:
             return True
         try:
-            for company in companies:
-                company['company_orgnr'] = orgnr
-                company['created_at'] = datetime.utcnow().isoformat()
-            self.client.table('related_companies').insert(companies).execute()
+            self._stamp_rows(orgnr, companies, datetime.utcnow().isoformat())
+            self._write_batches('related_companies', companies)
+            self._invalidate_company(orgnr)
             return True
         except Exception as e:
             logger.error(f"Failed to add related companies for {orgnr}: {e}")
@@ -404,7 +720,8 @@ class SupabaseDatabase:
     def clear_related_companies(self, orgnr: str) -> bool:
         """Delete all related companies for a company."""
         try:
-            self.client.table('related_companies').delete().eq('company_orgnr', orgnr).execute()
+            self.client.table('related_companies').delete(returning=ReturnMethod.minimal).eq('company_orgnr', orgnr).execute()
+            self._invalidate_company(orgnr)
             return True
         except Exception as e:
             logger.error(f"Failed to clear related companies for {orgnr}: {e}")
@@ -418,7 +735,7 @@ class SupabaseDatabase:
         """Get all announcements for a company."""
         try:
             result = self.client.table('announcements').select('*').eq('company_orgnr', orgnr).execute()
-            return [dict(a) for a in result.data]
+            return result.data or []
         except Exception as e:
             logger.error(f"Failed to get announcements for {orgnr}: {e}")
             return []
@@ -428,10 +745,9 @@ class SupabaseDatabase:
         if not announcements:
             return True
         try:
-            for ann in announcements:
-                ann['company_orgnr'] = orgnr
-                ann['created_at'] = datetime.utcnow().isoformat()
-            self.client.table('announcements').insert(announcements).execute()
+            self._stamp_rows(orgnr, announcements, datetime.utcnow().isoformat())
+            self._write_batches('announcements', announcements)
+            self._invalidate_company(orgnr)
             return True
         except Exception as e:
             logger.error(f"Failed to add announcements for {orgnr}: {e}")
@@ -440,7 +756,8 @@ class SupabaseDatabase:
     def clear_announcements(self, orgnr: str) -> bool:
         """Delete all announcements for a company."""
         try:
-            self.client.table('announcements').delete().eq('company_orgnr', orgnr).execute()
+            self.client.table('announcements').delete(returning=ReturnMethod.minimal).eq('company_orgnr', orgnr).execute()
+            self._invalidate_company(orgnr)
             return True
         except Exception as e:
             logger.error(f"Failed to clear announcements for {orgnr}: {e}")
@@ -454,8 +771,18 @@ class SupabaseDatabase:
         """
         Create a history snapshot of current company state.
         Called before updating company data.
+
+        Copied server-side by the snapshot_company SQL function; falls back
+        to reading and re-inserting the rows if it is not available.
+
+        Returns:
+            False if the company does not exist
         """
         try:
+            result = self._call_rpc('snapshot_company', {'company_id': orgnr})
+            if result is not None:
+                return bool(result.data)
+
             company = self.get_company_basic(orgnr)
             if not company:
                 return False
@@ -465,7 +792,7 @@ class SupabaseDatabase:
                 'orgnr': orgnr,
                 'snapshot_date': datetime.utcnow().isoformat(),
                 'data': json.dumps(company)
-            }).execute()
+            }, returning=ReturnMethod.minimal).execute()
 
             # Save roles snapshot
             roles = self._get_roles(orgnr)
@@ -474,7 +801,7 @@ class SupabaseDatabase:
                     'company_orgnr': orgnr,
                     'snapshot_date': datetime.utcnow().isoformat(),
                     'roles_json': json.dumps(roles)
-                }).execute()
+                }, returning=ReturnMethod.minimal).execute()
 
             return True
 
@@ -482,20 +809,58 @@ class SupabaseDatabase:
             logger.error(f"Failed to snapshot company {orgnr}: {e}")
             return False
 
-    def get_full_history(self, orgnr: str) -> Dict[str, Any]:
-        """Get full history for a company."""
-        try:
-            company_history = self.client.table('companies_history').select('*').eq(
-                'orgnr', orgnr
-            ).order('snapshot_date', desc=True).execute()
+    def iter_history(
+        self,
+        orgnr: str,
+        table: str = 'companies_history',
+        page_size: int = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream history snapshots for a company, newest first.
 
-            roles_history = self.client.table('roles_history').select('*').eq(
-                'company_orgnr', orgnr
-            ).order('snapshot_date', desc=True).execute()
+        Rows are fetched one page at a time with range(), so callers that
+        stop early never load the older (potentially large) snapshots.
+
+        Args:
+            orgnr: Organization number
+            table: 'companies_history' or 'roles_history'
+            page_size: Rows per request (default HISTORY_PAGE_SIZE)
+        """
+        key_column = self.HISTORY_TABLES[table]
+        page_size = page_size or self.HISTORY_PAGE_SIZE
+        offset = 0
+
+        while True:
+            result = self.client.table(table).select('*').eq(
+                key_column, orgnr
+            ).order('snapshot_date', desc=True).range(
+                offset, offset + page_size - 1
+            ).execute()
+
+            rows = result.data or []
+            yield from rows
+
+            if len(rows) < page_size:
+                return
+            offset += page_size
 
+    def get_full_history(self, orgnr: str, limit: int = None) -> Dict[str, Any]:
+        """
+        Get full history for a company.
+
+        Args:
+            orgnr: Organization number
+            limit: Max snapshots per history table (None = all)
+        """
+        page_size = min(limit, self.HISTORY_PAGE_SIZE) if limit else None
+        try:
             return {
-                'company_history': [dict(h) for h in company_history.data],
-                'roles_history': [dict(h) for h in roles_history.data]
+                'company_history': list(islice(
+                    self.iter_history(orgnr, 'companies_history', page_size), limit
+                )),
+                'roles_history': list(islice(
+                    self.iter_history(orgnr, 'roles_history', page_size), limit
+                ))
             }
         except Exception as e:
             logger.error(f"Failed to get full history for {orgnr}: {e}")
@@ -507,7 +872,7 @@ class SupabaseDatabase:
             result = self.client.table('roles_history').select('*').eq(
                 'company_orgnr', orgnr
             ).order('snapshot_date', desc=True).limit(limit).execute()
-            return [dict(h) for h in result.data]
+            return result.data or []
         except Exception as e:
             logger.error(f"Failed to get roles history for {orgnr}: {e}")
             return []
@@ -527,20 +892,33 @@ class SupabaseDatabase:
             if not safe_name:
                 return []
 
-            # First try prefix match (fast)
-            result = self.client.table('company_registry').select(
-                'orgnr, name, org_form'
-            ).ilike('name', f'{safe_name}%').limit(limit).execute()
-
-            if result.data:
-                return [dict(r) for r in result.data]
-
-            # Fallback: contains search
-            result = self.client.table('company_registry').select(
-                'orgnr, name, org_form'
-            ).ilike('name', f'%{safe_name}%').limit(limit).execute()
-
-            return [dict(r) for r in result.data]
+            cache_key = (safe_name, limit)
+            hit, cached = self._registry_cache.lookup(cache_key)
+            if hit:
+                return list(cached)
+
+            # Prefix match with contains fallback, in one round trip
+            # (see search_company_registry in setup_supabase_tables.sql)
+            result = self._call_rpc('search_company_registry', {
+                'search_term': safe_name,
+                'result_limit': limit
+            })
+
+            if result is None:
+                # First try prefix match (fast)
+                result = self.client.table('company_registry').select(
+                    'orgnr, name, org_form'
+                ).ilike('name', f'{safe_name}%').limit(limit).execute()
+
+                if not result.data:
+                    # Fallback: contains search
+                    result = self.client.table('company_registry').select(
+                        'orgnr, name, org_form'
+                    ).ilike('name', f'%{safe_name}%').limit(limit).execute()
+
+            rows = result.data or []
+            self._registry_cache.set(cache_key, rows)
+            return list(rows)
 
         except Exception as e:
             logger.error(f"Failed to search company registry for '{name}': {e}")
@@ -549,7 +927,9 @@ class SupabaseDatabase:
     def get_registry_stats(self) -> Dict[str, Any]:
         """Get statistics about the company registry."""
         try:
-            result = self.client.table('company_registry').select('orgnr', count='exact').execute()
+            result = self.client.table('company_registry').select(
+                'orgnr', count='exact', head=True
+            ).execute()
             return {
                 'total_companies': result.count,
                 'source': 'supabase'
@@ -566,7 +946,7 @@ class SupabaseDatabase:
         """Get cache metadata for a company."""
         try:
             result = self.client.table('cache_metadata').select('*').eq('orgnr', orgnr).execute()
-            return dict(result.data[0]) if result.data else None
+            return result.data[0] if result.data else None
         except Exception as e:
             logger.error(f"Failed to get cache metadata for {orgnr}: {e}")
             return None
@@ -581,22 +961,44 @@ class SupabaseDatabase:
             if source:
                 data['source'] = source
 
-            self.client.table('cache_metadata').upsert(data, on_conflict='orgnr').execute()
+            self.client.table('cache_metadata').upsert(
+                data,
+                on_conflict='orgnr',
+                returning=ReturnMethod.minimal
+            ).execute()
+            # Write-through so the next freshness check needs no round trip
+            self._freshness_cache.set(orgnr, time.time())
             return True
         except Exception as e:
             logger.error(f"Failed to update cache metadata for {orgnr}: {e}")
             return False
 
+    @staticmethod
+    def _parse_refresh_time(value: Optional[str]) -> Optional[float]:
+        """Parse a last_refresh timestamp to epoch seconds (naive = UTC)."""
+        if not value:
+            return None
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+
     def is_cache_fresh(self, orgnr: str, ttl_hours: int = 24) -> bool:
         """Check if cached data is still fresh."""
         try:
-            metadata = self.get_cache_metadata(orgnr)
-            if not metadata or not metadata.get('last_refresh'):
+            # last_refresh is cached as epoch seconds (parsed once per fetch)
+            hit, last_refresh = self._freshness_cache.lookup(orgnr)
+            if not hit:
+                metadata = self.get_cache_metadata(orgnr)
+                last_refresh = self._parse_refresh_time(
+                    metadata.get('last_refresh') if metadata else None
+                )
+                self._freshness_cache.set(orgnr, last_refresh)
+
+            if last_refresh is None:
                 return False
 
-            last_refresh = datetime.fromisoformat(metadata['last_refresh'].replace('Z', '+00:00'))
-            age_hours = (datetime.utcnow() - last_refresh.replace(tzinfo=None)).total_seconds() / 3600
-            return age_hours < ttl_hours
+            return time.time() - last_refresh < ttl_hours * 3600
         except Exception as e:
             logger.error(f"Failed to check cache freshness for {orgnr}: {e}")
             return False
@@ -649,7 +1051,7 @@ class SupabaseDatabase:
                     q = q.eq('status', safe_status)
 
             result = q.limit(limit).execute()
-            return [dict(r) for r in result.data]
+            return result.data or []
 
         except Exception as e:
             logger.error(f"Failed to search companies: {e}")
@@ -662,7 +1064,9 @@ class SupabaseDatabase:
     def get_stats(self) -> Dict[str, Any]:
         """Get database statistics."""
         try:
-            companies = self.client.table('companies').select('orgnr', count='exact').execute()
+            companies = self.client.table('companies').select(
+                'orgnr', count='exact', head=True
+            ).execute()
             return {
                 'companies': companies.count or 0,
                 'database_type': 'supabase'
@@ -689,6 +1093,10 @@ class SupabaseDatabase:
         """
         Store complete company data atomically.
 
+        Uses the store_company_complete SQL function (one round trip, one
+        transaction). Falls back to per-table writes if the function has
+        not been created yet.
+
         Args:
             company_data: Main company record
             roles: Board members, executives, etc.
@@ -705,48 +1113,142 @@ class SupabaseDatabase:
             return False
 
         try:
-            # Create snapshot if company exists
-            if snapshot_first and self.company_exists(orgnr):
-                self.snapshot_company(orgnr)
+            stored = self._store_company_rpc(
+                company_data, roles, financials, industries, trademarks,
+                related_companies, announcements, snapshot_first
+            )
+
+            if not stored:
+                self._store_company_rest(
+                    company_data, roles, financials, industries, trademarks,
+                    related_companies, announcements, snapshot_first
+                )
+
+            self._invalidate_company(orgnr)
+
+            logger.info(f"Stored complete data for {orgnr}")
+            return True
 
-            # Update main company record
-            self.upsert_company(company_data)
+        except Exception as e:
+            logger.error(f"Failed to store complete data for {orgnr}: {e}")
+            return False
+
+    def _store_company_rpc(
+        self,
+        company_data: Dict[str, Any],
+        roles: Optional[List[Dict[str, Any]]],
+        financials: Optional[List[Dict[str, Any]]],
+        industries: Optional[List[Dict[str, Any]]],
+        trademarks: Optional[List[Dict[str, Any]]],
+        related_companies: Optional[List[Dict[str, Any]]],
+        announcements: Optional[List[Dict[str, Any]]],
+        snapshot_first: bool
+    ):
+        """
+        Store everything with one call to the store_company_complete SQL
+        function (single round trip, single transaction).
 
-            # Clear and re-add related data
-            if roles is not None:
-                self.clear_roles(orgnr)
-                self.add_roles_batch(orgnr, roles)
+        Returns False if the function is not available.
+        """
+        orgnr = company_data['orgnr']
+        now = datetime.utcnow().isoformat()
+
+        result = self._call_rpc('store_company_complete', {
+            'company': self._stamp_company(company_data),
+            'roles': None if roles is None else self._dedupe_roles(orgnr, roles, now),
+            'financials': None if financials is None else self._dedupe_financials(orgnr, financials, now),
+            'industries': None if industries is None else self._stamp_rows(orgnr, industries, now),
+            'trademarks': None if trademarks is None else [
+                self._trademark_row(orgnr, t, now) for t in trademarks
+            ],
+            'related_companies': None if related_companies is None else self._stamp_rows(orgnr, related_companies, now),
+            'announcements': None if announcements is None else self._stamp_rows(orgnr, announcements, now),
+            'snapshot_first': snapshot_first
+        })
+        if result is None:
+            return False
 
-            if financials is not None:
-                self.add_financials_batch(orgnr, financials)
+        # The function also bumped cache_metadata.last_refresh
+        self._freshness_cache.set(orgnr, time.time())
+        return True
 
-            if industries is not None:
-                self.clear_industries(orgnr)
-                for i in industries:
-                    self.add_industry(orgnr, i)
+    def _store_company_rest(
+        self,
+        company_data: Dict[str, Any],
+        roles: Optional[List[Dict[str, Any]]],
+        financials: Optional[List[Dict[str, Any]]],
+        industries: Optional[List[Dict[str, Any]]],
+        trademarks: Optional[List[Dict[str, Any]]],
+        related_companies: Optional[List[Dict[str, Any]]],
+        announcements: Optional[List[Dict[str, Any]]],
+        snapshot_first: bool
+    ):
+        """Store everything with per-table PostgREST writes (not atomic)."""
+        orgnr = company_data['orgnr']
 
-            if trademarks is not None:
-                self.clear_trademarks(orgnr)
-                for t in trademarks:
-                    self.add_trademark(orgnr, t)
+        # Create snapshot (no-op if the company does not exist yet)
+        if snapshot_first:
+            self.snapshot_company(orgnr)
 
-            if related_companies is not None:
-                self.clear_related_companies(orgnr)
-                self.add_related_companies(orgnr, related_companies)
+        # Update main company record
+        self.upsert_company(company_data)
 
-            if announcements is not None:
-                self.clear_announcements(orgnr)
-                self.add_announcements(orgnr, announcements)
+        # Clear and re-add related data. Each table is independent, so
+        # the clear+add pairs run concurrently (sequential within a pair).
+        writes = []
 
-            # Update cache metadata
-            self.update_cache_metadata(orgnr)
+        if roles is not None:
+            writes.append((self.clear_roles, self.add_roles_batch, roles))
 
-            logger.info(f"Stored complete data for {orgnr}")
-            return True
+        if financials is not None:
+            writes.append((None, self.add_financials_batch, financials))
 
-        except Exception as e:
-            logger.error(f"Failed to store complete data for {orgnr}: {e}")
-            return False
+        if industries is not None:
+            writes.append((self.clear_industries, self.add_industries_batch, industries))
+
+        if trademarks is not None:
+            writes.append((self.clear_trademarks, self.add_trademarks_batch, trademarks))
+
+        if related_companies is not None:
+            writes.append((self.clear_related_companies, self.add_related_companies, related_companies))
+
+        if announcements is not None:
+            writes.append((self.clear_announcements, self.add_announcements, announcements))
+
+        def replace_rows(write):
+            clear, add, rows = write
+            if clear is not None:
+                clear(orgnr)
+            return add(orgnr, rows)
+
+        # Wait for all writes before marking the cache fresh
+        list(self._write_executor.map(replace_rows, writes))
+
+        # Update cache metadata
+        self.update_cache_metadata(orgnr)
+
+    def close(self):
+        """Shut down the write thread pool, waiting for pending writes."""
+        self._write_executor.shutdown(wait=True)
+
+    # =========================================================================
+    # Async API (thread pool wrappers)
+    # =========================================================================
+
+    async def get_company_async(self, orgnr: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a company with all related data (async).
+
+        The supabase client is synchronous, so the call runs in the default
+        thread pool instead of blocking the event loop.
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.get_company, orgnr)
+
+    async def is_cache_fresh_async(self, orgnr: str, ttl_hours: int = 24) -> bool:
+        """Check if cached data is still fresh (async)."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.is_cache_fresh, orgnr, ttl_hours)
 
 
 # Alias for compatibility
@@ -767,5 +1269,13 @@ def get_database() -> SupabaseDatabase:
     return _db_instance
 
 
+def close_database():
+    """Close and forget the database instance, if created (call on shutdown)."""
+    global _db_instance
+    if _db_instance is not None:
+        _db_instance.close()
+        _db_instance = None
+
+
 # Alias for compatibility
 Database = SupabaseDatabase
@@ -0,0 +1,105 @@
+"""
+In-Process TTL Cache
+
+Small bounded cache with per-entry expiry, used to avoid repeating
+identical upstream/database lookups within one process.
+
+Features:
+- Per-entry TTL (optionally overridden per set, e.g. shorter for misses)
+- LRU eviction once maxsize is reached
+- Cached None is distinguishable from a cache miss (negative caching)
+- Thread-safe
+
+Usage:
+    cache = TTLCache(maxsize=10000, ttl=600)
+
+    hit, company = cache.lookup(orgnr)
+    if not hit:
+        company = fetch_company(orgnr)
+        cache.set(orgnr, company, ttl=60 if company is None else None)
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Bounded LRU cache with time-to-live expiry.
+
+    Attributes:
+        maxsize: Max number of entries before least-recently-used eviction
+        ttl: Default time-to-live in seconds
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        """
+        Initialize cache.
+
+        Args:
+            maxsize: Max number of entries
+            ttl: Default time-to-live in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a key.
+
+        Returns:
+            Tuple of (hit, value). value is None on a miss.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._data[key]
+                return False, None
+
+            self._data.move_to_end(key)
+            return True, value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get cached value, or default if missing/expired."""
+        hit, value = self.lookup(key)
+        return value if hit else default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: Value to cache (None is allowed)
+            ttl: Override default TTL for this entry
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        """Remove a key if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.lookup(key)[0]
+
+    def __len__(self) -> int:
+        return len(self._data)
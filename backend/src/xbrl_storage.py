@@ -6,20 +6,171 @@ Handles storing and retrieving XBRL data from annual reports.
 
 from typing import Optional, List, Dict, Any
 from datetime import date
+from decimal import Decimal
 from uuid import UUID
 import logging
+import os
+import re
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import httpx
+from postgrest.exceptions import APIError
+
+try:
+    import psycopg
+    PSYCOPG_AVAILABLE = True
+except ImportError:
+    PSYCOPG_AVAILABLE = False
 
 from .supabase_client import get_database
+from .ttl_cache import TTLCache
+from .retry import retry_sync
 from .parsers import ParseResult, XBRLFact, AuditInfo, BoardInfo
 
 logger = logging.getLogger(__name__)
 
+# Rows per xbrl_facts insert request. Capped to stay well under the
+# PostgREST request body limit.
+MAX_INSERT_BATCH = 5000
+INSERT_BATCH_SIZE = min(int(os.environ.get("XBRL_INSERT_BATCH", "1000")), MAX_INSERT_BATCH)
+
+# Set XBRL_STORE_EXTENDED=false to skip "extended" facts (outside the core,
+# se-gen-base and se-ar-base sets); total_facts_extracted still counts them
+STORE_EXTENDED_FACTS = os.environ.get("XBRL_STORE_EXTENDED", "true").lower() not in ("0", "false", "no")
+
+# Retries of the (idempotent) replace_xbrl_facts call on network errors
+RPC_MAX_RETRIES = 3
+RPC_RETRY_BASE_DELAY = 0.1
+RPC_RETRY_MAX_DELAY = 2.0
+
+# Reports with more facts than this are loaded with COPY over a direct
+# Postgres connection (SUPABASE_DB_URL + psycopg) when available
+COPY_THRESHOLD = int(os.environ.get("XBRL_COPY_THRESHOLD", "2000"))
+
+# xbrl_facts columns written per fact, in fact row (and COPY) order
+_FACT_COLUMNS = (
+    "annual_report_id",
+    "company_orgnr",
+    "xbrl_name",
+    "namespace",
+    "local_name",
+    "context_ref",
+    "period_type",
+    "value_numeric",
+    "value_text",
+    "value_boolean",
+    "unit_ref",
+    "decimals",
+    "scale",
+    "category",
+    "availability",
+)
+_FACT_KEY_COLUMNS = ("annual_report_id", "xbrl_name", "context_ref")
+
+# (category, availability) by namespace; core fields override availability
+_NS_INFO = {
+    "se-gen-base": ("financial", "common"),
+    "se-ar-base": ("audit", "optional"),
+    "se-cd-base": ("company", "extended"),
+    "se-comp-base": ("compliance", "extended"),
+    "se-bol-base": ("legal", "extended"),
+    "se-misc-base": ("misc", "extended"),
+}
+_DEFAULT_NS_INFO = ("other", "extended")
+
+# Core fields present in ALL documents
+_CORE_FIELDS = frozenset({
+    "se-gen-base:Nettoomsattning",
+    "se-gen-base:Rorelseresultat",
+    "se-gen-base:AretsResultat",
+    "se-gen-base:Tillgangar",
+    "se-gen-base:EgetKapital",
+    "se-gen-base:KortfristigaSkulder",
+    "se-gen-base:Soliditet",
+    "se-cd-base:ForetagetsNamn",
+    "se-cd-base:Organisationsnummer",
+})
+
+
+# Fact value column by exact type, so bool never falls through to int
+_VALUE_KINDS = {
+    bool: "boolean",
+    int: "numeric",
+    float: "numeric",
+    Decimal: "numeric",
+}
+_NUMERIC_RE = re.compile(r"^\s*[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?\s*$")
+
+
+@lru_cache(maxsize=4096)
+def _fact_name_info(xbrl_name: str) -> tuple:
+    """
+    Split a fact name ("namespace:local_name") and classify it.
+
+    Returns (namespace, local_name, category, availability). Cached since
+    the same few thousand names repeat across reports.
+    """
+    if ":" in xbrl_name:
+        namespace, local_name = xbrl_name.split(":", 1)
+    else:
+        namespace = ""
+        local_name = xbrl_name
+
+    category, availability = _NS_INFO.get(namespace, _DEFAULT_NS_INFO)
+    if xbrl_name in _CORE_FIELDS:
+        availability = "core"
+
+    return namespace, local_name, category, availability
+
+
+def _split_value(value: Any) -> tuple:
+    """Split a fact value into (value_numeric, value_text, value_boolean)."""
+    if value is None:
+        return None, None, None
+    kind = _VALUE_KINDS.get(type(value))
+    if kind == "boolean":
+        return None, None, value
+    if kind == "numeric":
+        return float(value), None, None
+    # Numeric strings are stored as numbers
+    text = str(value)
+    if _NUMERIC_RE.match(text):
+        return float(text), None, None
+    return None, text, None
+
 
 class XBRLStorage:
     """Storage client for XBRL annual report data."""
 
+    # Concurrent per-report writes after the annual_reports upsert
+    WRITE_WORKERS = 4
+
+    # (orgnr, fiscal_year) -> annual_report_id; ids are stable across
+    # re-processing since annual_reports is upserted on that key
+    REPORT_ID_CACHE_MAXSIZE = 10000
+    REPORT_ID_CACHE_TTL_SECONDS = 3600
+
+    # PostgREST (PGRST205) / Postgres (42P01) codes for a missing table or view
+    RELATION_NOT_FOUND = ("PGRST205", "42P01")
+
     def __init__(self):
         self.db = get_database()
+        # Direct Postgres connection string for COPY (optional)
+        self._db_url = os.environ.get("SUPABASE_DB_URL") if PSYCOPG_AVAILABLE else None
+        self._copy_conn = None
+        self._copy_lock = threading.Lock()
+        self._write_executor = ThreadPoolExecutor(
+            max_workers=self.WRITE_WORKERS,
+            thread_name_prefix="xbrl-write"
+        )
+        self._report_id_cache = TTLCache(
+            maxsize=self.REPORT_ID_CACHE_MAXSIZE,
+            ttl=self.REPORT_ID_CACHE_TTL_SECONDS
+        )
+        self._xbrl_view_missing = False
 
     # ============================================================
     # Annual Reports
@@ -39,13 +190,17 @@ class XBRLStorage:
             logger.error("Cannot store annual report without company orgnr")
             return None
 
-        orgnr = parse_result.company_info.orgnr
-        fiscal_year = parse_result.company_info.fiscal_year_end.year if parse_result.company_info.fiscal_year_end else None
+        company_info = parse_result.company_info
+        orgnr = company_info.orgnr
+        fiscal_year = company_info.fiscal_year_end.year if company_info.fiscal_year_end else None
 
         if not fiscal_year:
             logger.error(f"Cannot store annual report for {orgnr} without fiscal year")
             return None
 
+        # Serialized once, shared by annual_reports and audit_history
+        audit_fields = self._audit_fields(parse_result.audit_info) if parse_result.audit_info else None
+
         try:
             # Upsert annual report metadata
             # Note: If we got here, parsing was successful (ParseError would have been raised otherwise)
@@ -53,10 +208,10 @@ class XBRLStorage:
                 "company_orgnr": orgnr,
                 "document_id": document_id,
                 "fiscal_year": fiscal_year,
-                "fiscal_year_start": parse_result.company_info.fiscal_year_start.isoformat() if parse_result.company_info.fiscal_year_start else None,
-                "fiscal_year_end": parse_result.company_info.fiscal_year_end.isoformat() if parse_result.company_info.fiscal_year_end else None,
+                "fiscal_year_start": company_info.fiscal_year_start.isoformat() if company_info.fiscal_year_start else None,
+                "fiscal_year_end": company_info.fiscal_year_end.isoformat(),
                 "total_facts_extracted": len(parse_result.all_facts),
-                "namespaces_used": list(parse_result.namespaces),
+                "namespaces_used": sorted(parse_result.namespaces),  # Stable order for identical re-runs
                 "is_audited": parse_result.audit_info is not None,
                 "processing_status": "processed",
                 "source_file": parse_result.source_file,
@@ -65,14 +220,8 @@ class XBRLStorage:
             }
 
             # Add audit info if present
-            if parse_result.audit_info:
-                report_data.update({
-                    "auditor_first_name": parse_result.audit_info.auditor_first_name,
-                    "auditor_last_name": parse_result.audit_info.auditor_last_name,
-                    "audit_firm": parse_result.audit_info.audit_firm,
-                    "audit_completion_date": parse_result.audit_info.audit_completion_date.isoformat() if parse_result.audit_info.audit_completion_date else None,
-                    "audit_opinion": parse_result.audit_info.audit_opinion,
-                })
+            if audit_fields:
+                report_data.update(audit_fields)
 
             # Upsert the annual report
             result = self.db.client.table("annual_reports").upsert(
@@ -85,20 +234,28 @@ class XBRLStorage:
                 return None
 
             report_id = result.data[0]["id"]
+            self._report_id_cache.set((orgnr, fiscal_year), report_id)
 
-            # Store XBRL facts
-            self._store_xbrl_facts(report_id, orgnr, parse_result.all_facts)
+            # The remaining writes only depend on report_id - run them concurrently
+            submit = self._write_executor.submit
+            writes = [
+                # Store XBRL facts
+                submit(self._store_xbrl_facts, report_id, orgnr, parse_result.all_facts),
+                # Update financials with XBRL data
+                submit(self._update_financials_from_xbrl, orgnr, fiscal_year, parse_result, report_id),
+            ]
 
             # Store audit history
-            if parse_result.audit_info:
-                self._store_audit_history(orgnr, fiscal_year, parse_result.audit_info)
+            if audit_fields:
+                writes.append(submit(self._store_audit_history, orgnr, fiscal_year, parse_result.audit_info, audit_fields))
 
             # Store board history
-            if parse_result.board_info:
-                self._store_board_history(orgnr, fiscal_year, parse_result.board_info)
+            if parse_result.board_info and parse_result.board_info.members:
+                writes.append(submit(self._store_board_history, orgnr, fiscal_year, parse_result.board_info))
 
-            # Update financials with XBRL data
-            self._update_financials_from_xbrl(orgnr, fiscal_year, parse_result, report_id)
+            # Wait for all writes (re-raises a failed write)
+            for write in writes:
+                write.result()
 
             logger.info(f"Stored annual report {orgnr}/{fiscal_year} with {len(parse_result.all_facts)} facts")
             return report_id
@@ -117,125 +274,193 @@ class XBRLStorage:
         if not facts:
             return 0
 
-        # Delete existing facts for this report
-        self.db.client.table("xbrl_facts").delete().eq(
-            "annual_report_id", report_id
-        ).execute()
-
-        # Prepare fact records
-        fact_records = []
+        # Prepare fact rows (tuples in _FACT_COLUMNS order)
+        # iXBRL may tag the same value several times (e.g. in the
+        # five-year overview); keep one fact per (name, context)
+        fact_rows = []
+        append = fact_rows.append
+        seen = set()
         for fact in facts:
-            # Extract namespace and local_name from fact.name (format: "namespace:local_name")
-            if ":" in fact.name:
-                namespace, local_name = fact.name.split(":", 1)
-            else:
-                namespace = ""
-                local_name = fact.name
+            key = (fact.name, fact.context_ref)
+            if key in seen:
+                continue
+            seen.add(key)
 
-            # Determine category based on namespace
-            category = self._categorize_fact(namespace)
+            # Namespace, local name, category and availability from fact.name
+            namespace, local_name, category, availability = _fact_name_info(fact.name)
+            if availability == "extended" and not STORE_EXTENDED_FACTS:
+                continue
 
             # Handle Decimal values for numeric fields
-            value = fact.value
-            value_numeric = None
-            value_text = None
-            value_boolean = None
-
-            if value is not None:
-                if isinstance(value, bool):
-                    value_boolean = value
-                elif isinstance(value, (int, float)):
-                    value_numeric = float(value)
-                else:
-                    # Try to convert Decimal or numeric strings
-                    try:
-                        value_numeric = float(value)
-                    except (ValueError, TypeError):
-                        value_text = str(value)
+            value_numeric, value_text, value_boolean = _split_value(fact.value)
+
+            append((
+                report_id,
+                orgnr,
+                fact.name,
+                namespace,
+                local_name,
+                fact.context_ref,
+                fact.period_type.value if fact.period_type else "unknown",
+                value_numeric,
+                value_text,
+                value_boolean,
+                fact.unit_ref,
+                fact.decimals,
+                fact.scale,
+                category,
+                availability,
+            ))
+
+        # Large reports: bulk load the rows as-is with COPY
+        if self._db_url and len(fact_rows) > COPY_THRESHOLD:
+            try:
+                return self._copy_xbrl_facts(report_id, fact_rows)
+            except Exception as e:
+                logger.warning(f"COPY of XBRL facts failed, using PostgREST: {e}")
+
+        # PostgREST takes JSON objects
+        fact_records = [dict(zip(_FACT_COLUMNS, row)) for row in fact_rows]
+
+        # Upsert the report's facts and drop stale ones in one transaction
+        # when the SQL function is installed. Safe to resend, so unlike
+        # other POSTs it is retried after errors past the connect phase.
+        if retry_sync(
+            self.db.call_rpc,
+            "replace_xbrl_facts",
+            {"report_id": report_id, "facts": fact_records},
+            max_retries=RPC_MAX_RETRIES,
+            base_delay=RPC_RETRY_BASE_DELAY,
+            max_delay=RPC_RETRY_MAX_DELAY,
+            retryable_exceptions=(httpx.TransportError,),
+        ) is not None:
+            return len(fact_records)
 
-            fact_records.append({
-                "annual_report_id": report_id,
-                "company_orgnr": orgnr,
-                "xbrl_name": fact.name,
-                "namespace": namespace,
-                "local_name": local_name,
-                "context_ref": fact.context_ref,
-                "period_type": fact.period_type.value if fact.period_type else "unknown",
-                "value_numeric": value_numeric,
-                "value_text": value_text,
-                "value_boolean": value_boolean,
-                "unit_ref": fact.unit_ref,
-                "decimals": fact.decimals,
-                "scale": fact.scale,
-                "category": category,
-                "availability": self._determine_availability(fact.name),
-            })
+        # Delete existing facts for this report
+        self.db.client.table("xbrl_facts").delete().eq(
+            "annual_report_id", report_id
+        ).execute()
 
         # Insert in batches
-        batch_size = 100
         stored = 0
-        for i in range(0, len(fact_records), batch_size):
-            batch = fact_records[i:i + batch_size]
+        for i in range(0, len(fact_records), INSERT_BATCH_SIZE):
+            batch = fact_records[i:i + INSERT_BATCH_SIZE]
             try:
+                started = time.perf_counter()
                 self.db.client.table("xbrl_facts").insert(batch).execute()
+                elapsed = time.perf_counter() - started
                 stored += len(batch)
+                logger.debug(
+                    f"Inserted {len(batch)} XBRL facts in {elapsed:.3f}s "
+                    f"({len(batch) / elapsed if elapsed else 0:.0f} rows/s)"
+                )
             except Exception as e:
-                logger.error(f"Error inserting XBRL facts batch: {e}")
+                # Plain inserts are not idempotent - connect errors are already
+                # retried by the transport, anything later is not resent
+                logger.error(
+                    f"Error inserting XBRL facts batch ({len(batch)} facts "
+                    f"for report {report_id} not stored): {e}"
+                )
 
         return stored
 
-    def _categorize_fact(self, namespace: str) -> str:
-        """Categorize fact based on namespace."""
-        categories = {
-            "se-gen-base": "financial",
-            "se-ar-base": "audit",
-            "se-cd-base": "company",
-            "se-comp-base": "compliance",
-            "se-bol-base": "legal",
-            "se-misc-base": "misc",
-        }
-        return categories.get(namespace, "other")
-
-    def _determine_availability(self, xbrl_name: str) -> str:
-        """Determine field availability category."""
-        # Core fields present in ALL documents
-        core_fields = {
-            "se-gen-base:Nettoomsattning",
-            "se-gen-base:Rorelseresultat",
-            "se-gen-base:AretsResultat",
-            "se-gen-base:Tillgangar",
-            "se-gen-base:EgetKapital",
-            "se-gen-base:KortfristigaSkulder",
-            "se-gen-base:Soliditet",
-            "se-cd-base:ForetagetsNamn",
-            "se-cd-base:Organisationsnummer",
-        }
+    def _copy_xbrl_facts(
+        self,
+        report_id: str,
+        fact_rows: List[tuple]
+    ) -> int:
+        """
+        Load fact rows with COPY into a temp table, then upsert them and
+        drop stale facts in the same transaction (as replace_xbrl_facts).
+        """
+        columns = ", ".join(_FACT_COLUMNS)
+        keys = ", ".join(_FACT_KEY_COLUMNS)
+        updates = ", ".join(
+            f"{c} = EXCLUDED.{c}" for c in _FACT_COLUMNS if c not in _FACT_KEY_COLUMNS
+        )
+
+        started = time.perf_counter()
+        with self._copy_lock:
+            conn = self._copy_connection()
+            try:
+                with conn.transaction(), conn.cursor() as cur:
+                    cur.execute(
+                        "CREATE TEMP TABLE xbrl_facts_load "
+                        "(LIKE xbrl_facts INCLUDING DEFAULTS) ON COMMIT DROP"
+                    )
+                    with cur.copy(f"COPY xbrl_facts_load ({columns}) FROM STDIN") as copy:
+                        for row in fact_rows:
+                            copy.write_row(row)
+
+                    cur.execute(
+                        f"INSERT INTO xbrl_facts ({columns}) "
+                        f"SELECT {columns} FROM xbrl_facts_load "
+                        f"ON CONFLICT ({keys}) DO UPDATE SET {updates}"
+                    )
+                    cur.execute(
+                        "DELETE FROM xbrl_facts x WHERE x.annual_report_id = %s "
+                        "AND NOT EXISTS (SELECT 1 FROM xbrl_facts_load l "
+                        "WHERE l.xbrl_name = x.xbrl_name AND l.context_ref = x.context_ref)",
+                        (report_id,)
+                    )
+            except psycopg.errors.InvalidColumnReference:
+                # No unique index for ON CONFLICT yet (setup script ran before
+                # the XBRL migration) - stop trying COPY for this process
+                self._db_url = None
+                raise
+            except psycopg.OperationalError:
+                # Connection is unusable - reconnect for the next report
+                conn.close()
+                raise
+
+        elapsed = time.perf_counter() - started
+        logger.debug(
+            f"Copied {len(fact_rows)} XBRL facts in {elapsed:.3f}s "
+            f"({len(fact_rows) / elapsed if elapsed else 0:.0f} rows/s)"
+        )
+        return len(fact_rows)
+
+    def close(self):
+        """Shut down the write thread pool (waiting for pending writes) and COPY connection."""
+        self._write_executor.shutdown(wait=True)
+        with self._copy_lock:
+            if self._copy_conn is not None:
+                self._copy_conn.close()
+                self._copy_conn = None
+
+    def _copy_connection(self):
+        """
+        Direct Postgres connection for COPY, opened once and reused across
+        reports (callers hold _copy_lock).
+        """
+        if self._copy_conn is None or self._copy_conn.closed:
+            self._copy_conn = psycopg.connect(self._db_url, autocommit=True)
+        return self._copy_conn
 
-        if xbrl_name in core_fields:
-            return "core"
-        elif xbrl_name.startswith("se-gen-base:"):
-            return "common"
-        elif xbrl_name.startswith("se-ar-base:"):
-            return "optional"
-        else:
-            return "extended"
+    @staticmethod
+    def _audit_fields(audit_info: AuditInfo) -> Dict[str, Any]:
+        """Audit columns shared by annual_reports and audit_history."""
+        return {
+            "auditor_first_name": audit_info.auditor_first_name,
+            "auditor_last_name": audit_info.auditor_last_name,
+            "audit_firm": audit_info.audit_firm,
+            "audit_completion_date": audit_info.audit_completion_date.isoformat() if audit_info.audit_completion_date else None,
+            "audit_opinion": audit_info.audit_opinion,
+        }
 
     def _store_audit_history(
         self,
         orgnr: str,
         fiscal_year: int,
-        audit_info: AuditInfo
+        audit_info: AuditInfo,
+        audit_fields: Optional[Dict[str, Any]] = None
     ) -> bool:
-        """Store audit history record."""
+        """Store audit history record (audit_fields: pre-serialized audit_info)."""
         try:
             self.db.client.table("audit_history").upsert({
                 "company_orgnr": orgnr,
                 "fiscal_year": fiscal_year,
-                "auditor_first_name": audit_info.auditor_first_name,
-                "auditor_last_name": audit_info.auditor_last_name,
-                "audit_firm": audit_info.audit_firm,
-                "audit_completion_date": audit_info.audit_completion_date.isoformat() if audit_info.audit_completion_date else None,
-                "audit_opinion": audit_info.audit_opinion,
+                **(audit_fields or self._audit_fields(audit_info)),
                 "source": "xbrl",
             }, on_conflict="company_orgnr,fiscal_year").execute()
             return True
@@ -247,24 +472,32 @@ class XBRLStorage:
         self,
         orgnr: str,
         fiscal_year: int,
-        board_info: List[BoardInfo]
+        board_info: BoardInfo
     ) -> int:
-        """Store board history records."""
-        stored = 0
-        for member in board_info:
-            try:
-                self.db.client.table("board_history").insert({
-                    "company_orgnr": orgnr,
-                    "fiscal_year": fiscal_year,
-                    "member_first_name": member.first_name,
-                    "member_last_name": member.last_name,
-                    "member_role": member.role,
-                    "source": "xbrl",
-                }).execute()
-                stored += 1
-            except Exception as e:
-                logger.debug(f"Error storing board member: {e}")
-        return stored
+        """Store board history records, replacing earlier XBRL rows for the year."""
+        records = []
+        for member in board_info.members:
+            first_name, _, last_name = (member.get("name") or "").partition(" ")
+            records.append({
+                "company_orgnr": orgnr,
+                "fiscal_year": fiscal_year,
+                "member_first_name": first_name or None,
+                "member_last_name": last_name or None,
+                "member_role": member.get("role"),
+                "source": "xbrl",
+            })
+        if not records:
+            return 0
+
+        try:
+            self.db.client.table("board_history").delete().eq(
+                "company_orgnr", orgnr
+            ).eq("fiscal_year", fiscal_year).eq("source", "xbrl").execute()
+            self.db.client.table("board_history").insert(records).execute()
+            return len(records)
+        except Exception as e:
+            logger.error(f"Error storing board history: {e}")
+            return 0
 
     def _update_financials_from_xbrl(
         self,
@@ -321,22 +554,17 @@ class XBRLStorage:
                         updates[col] = value
 
             if len(updates) > 1:  # More than just report_id
-                # Check if record exists
-                existing = self.db.client.table("financials").select("id").eq(
-                    "company_orgnr", orgnr
-                ).eq("period_year", fiscal_year).execute()
-
-                if existing.data:
-                    # Update existing
-                    self.db.client.table("financials").update(updates).eq(
-                        "company_orgnr", orgnr
-                    ).eq("period_year", fiscal_year).execute()
-                else:
-                    # Insert new
-                    updates["company_orgnr"] = orgnr
-                    updates["period_year"] = fiscal_year
-                    updates["source"] = "xbrl"
-                    self.db.client.table("financials").insert(updates).execute()
+                # Annual report XBRL covers the company itself, not the group
+                updates.update({
+                    "company_orgnr": orgnr,
+                    "period_year": fiscal_year,
+                    "is_consolidated": False,
+                    "source": "xbrl",
+                })
+                self.db.client.table("financials").upsert(
+                    updates,
+                    on_conflict="company_orgnr,period_year,is_consolidated"
+                ).execute()
 
                 return True
 
@@ -362,6 +590,23 @@ class XBRLStorage:
 
         return result.data[0] if result.data else None
 
+    def _get_report_id(self, orgnr: str, fiscal_year: int) -> Optional[str]:
+        """Get the annual_report_id for a fiscal year (cached, id column only)."""
+        key = (orgnr, fiscal_year)
+        report_id = self._report_id_cache.get(key)
+        if report_id is not None:
+            return report_id
+
+        result = self.db.client.table("annual_reports").select("id").eq(
+            "company_orgnr", orgnr
+        ).eq("fiscal_year", fiscal_year).limit(1).execute()
+
+        if not result.data:
+            return None
+        report_id = result.data[0]["id"]
+        self._report_id_cache.set(key, report_id)
+        return report_id
+
     def get_annual_reports_for_company(
         self,
         orgnr: str,
@@ -389,9 +634,9 @@ class XBRLStorage:
 
         if fiscal_year:
             # Get report_id for fiscal year
-            report = self.get_annual_report(orgnr, fiscal_year)
-            if report:
-                query = query.eq("annual_report_id", report["id"])
+            report_id = self._get_report_id(orgnr, fiscal_year)
+            if report_id:
+                query = query.eq("annual_report_id", report_id)
 
         if namespace:
             query = query.eq("namespace", namespace)
@@ -437,45 +682,48 @@ class XBRLStorage:
         offset: int = 0
     ) -> List[str]:
         """Get list of company orgnrs that have XBRL data."""
+        if not self._xbrl_view_missing:
+            try:
+                # Distinct in SQL so limit/offset page over companies, not reports
+                result = self.db.client.table("companies_with_xbrl").select(
+                    "company_orgnr"
+                ).order("company_orgnr").range(offset, offset + limit - 1).execute()
+                return [r["company_orgnr"] for r in result.data] if result.data else []
+            except APIError as e:
+                if e.code not in self.RELATION_NOT_FOUND:
+                    raise
+                logger.warning(
+                    "companies_with_xbrl view missing - run setup_supabase_tables.sql; "
+                    "querying annual_reports"
+                )
+                self._xbrl_view_missing = True
+
         result = self.db.client.table("annual_reports").select(
             "company_orgnr"
         ).eq("processing_status", "processed").order(
             "company_orgnr"
         ).range(offset, offset + limit - 1).execute()
 
-        return list(set(r["company_orgnr"] for r in result.data)) if result.data else []
+        return list(dict.fromkeys(r["company_orgnr"] for r in result.data)) if result.data else []
 
     def get_processing_stats(self) -> Dict[str, Any]:
         """Get statistics about XBRL processing."""
-        # Total reports
-        total = self.db.client.table("annual_reports").select(
-            "id", count="exact"
-        ).execute()
-
-        # By status
-        processed = self.db.client.table("annual_reports").select(
-            "id", count="exact"
-        ).eq("processing_status", "processed").execute()
+        # All counts in one round trip
+        result = self.db.call_rpc("xbrl_processing_stats", {})
+        if result is not None:
+            return result.data
 
-        failed = self.db.client.table("annual_reports").select(
-            "id", count="exact"
-        ).eq("processing_status", "failed").execute()
-
-        # Total facts
-        facts = self.db.client.table("xbrl_facts").select(
-            "id", count="exact"
-        ).execute()
-
-        # Unique companies
-        companies = self.db.client.rpc(
-            "count_distinct_orgnr_xbrl", {}
-        ).execute() if False else None  # Placeholder for RPC
+        def count(table: str, status: Optional[str] = None) -> int:
+            query = self.db.client.table(table).select("id", count="exact", head=True)
+            if status:
+                query = query.eq("processing_status", status)
+            return query.execute().count or 0
 
         return {
-            "total_reports": total.count if total else 0,
-            "processed": processed.count if processed else 0,
-            "failed": failed.count if failed else 0,
-            "total_facts": facts.count if facts else 0,
+            "total_reports": count("annual_reports"),
+            "processed": count("annual_reports", "processed"),
+            "failed": count("annual_reports", "failed"),
+            "total_facts": count("xbrl_facts"),
         }
 
 
@@ -489,3 +737,11 @@ def get_xbrl_storage() -> XBRLStorage:
     if _storage is None:
         _storage = XBRLStorage()
     return _storage
+
+
+def close_xbrl_storage():
+    """Close and forget the XBRL storage instance, if created (call on shutdown)."""
+    global _storage
+    if _storage is not None:
+        _storage.close()
+        _storage = None
@@ -12,13 +12,14 @@ Downloads ALL available annual reports for 10 companies and performs deep analys
 import os
 import sys
 import json
-import time
+import asyncio
 import re
 import zipfile
 import io
 from datetime import datetime
 from pathlib import Path
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor
 from decimal import Decimal, InvalidOperation
 
 # Add parent directory to path
@@ -27,16 +28,28 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from dotenv import load_dotenv
 load_dotenv()
 
-import requests
+# Fast JSON serialization (optional, falls back to stdlib json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
 
 # Import existing VDM client
 from src.scrapers.bolagsverket_vdm import get_bolagsverket_vdm_client
 from src.supabase_client import get_db
 
 # Configuration
-API_BASE = "https://gw.api.bolagsverket.se/vardefulla-datamangder/v1"
 OUTPUT_DIR = Path("/Users/isak/Desktop/CLAUDE_CODE /projects/loop-auto/test_annual_reports/comprehensive")
-OUTPUT_DIR.mkdir(exist_ok=True)
+
+# Documents downloaded at once (the VDM client backs off on 429)
+DOWNLOAD_CONCURRENCY = 8
 
 # Test companies (randomly selected from database)
 TEST_COMPANIES = [
@@ -71,48 +84,80 @@ def get_database():
     return db
 
 
-def download_document(dokument_id: str) -> bytes | None:
+async def download_document(dokument_id: str) -> bytes | None:
     """Download a document and return raw bytes."""
-    client = get_vdm_client()
-    token = client._get_token_sync()
-    if not token:
+    return await get_vdm_client().download_document_async(dokument_id)
+
+
+def write_json(path: Path, obj) -> None:
+    """Write obj as indented UTF-8 JSON, via orjson when installed."""
+    if ORJSON_AVAILABLE:
+        path.write_bytes(orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False, default=str)
+
+
+_SCALE_MULTIPLIERS = {scale: 10 ** scale for scale in range(10)}
+
+
+def parse_xbrl_value(value_str: str, scale: int = 0, decimals: str = "0") -> int | float | None:
+    """
+    Parse XBRL numeric value with scale and decimals.
+
+    Whole amounts (the common case) are scaled as exact ints; anything
+    else goes through Decimal so the scale is applied without float error.
+    """
+    # Remove spaces and convert Swedish decimal format
+    clean = value_str.replace(" ", "").replace("\xa0", "").replace(",", ".")
+    if not clean or clean == "-":
         return None
 
-    response = requests.get(
-        f"{API_BASE}/dokument/{dokument_id}",
-        headers={"Authorization": f"Bearer {token}", "Accept": "*/*"},
-        timeout=120
-    )
+    # Apply scale (e.g., scale="3" means multiply by 1000)
+    multiplier = _SCALE_MULTIPLIERS.get(scale)
+    if multiplier and "." not in clean:
+        try:
+            return int(clean) * multiplier
+        except ValueError:
+            pass
 
-    if response.status_code != 200:
-        print(f"    Download error: {response.status_code}")
+    try:
+        return float(Decimal(clean).scaleb(scale))
+    except InvalidOperation:
         return None
 
-    return response.content
 
+# Single pass over the raw XHTML bytes for all three element kinds.
+# Alternatives are tried at each position, so it finds the same matches
+# as three separate scans.
+_ELEMENT_RE = re.compile(
+    rb'<ix:nonFraction\s+(?P<nf_attrs>[^>]+)>(?P<nf_value>[^<]*)</ix:nonFraction>'
+    rb'|<ix:nonNumeric\s+(?P<nn_attrs>[^>]+)>(?P<nn_value>[^<]*)</ix:nonNumeric>'
+    rb'|<xbrli:context\s+id=["\'](?P<ctx_id>[^"\']+)["\']>(?P<ctx_body>.*?)</xbrli:context>',
+    re.DOTALL
+)
+_ATTR_RE = re.compile(r'(\w+)=["\']([^"\']*)["\']')
+_INSTANT_RE = re.compile(r'<xbrli:instant>([^<]+)</xbrli:instant>')
+_START_RE = re.compile(r'<xbrli:startDate>([^<]+)</xbrli:startDate>')
+_END_RE = re.compile(r'<xbrli:endDate>([^<]+)</xbrli:endDate>')
 
-def parse_xbrl_value(value_str: str, scale: int = 0, decimals: str = "0") -> float | None:
-    """Parse XBRL numeric value with scale and decimals."""
-    try:
-        # Remove spaces and convert Swedish decimal format
-        clean = value_str.replace(" ", "").replace("\xa0", "").replace(",", ".")
-        if not clean or clean == "-":
-            return None
 
-        value = float(clean)
+def _text(raw: bytes) -> str:
+    """Decode a matched byte slice."""
+    return raw.decode('utf-8', errors='ignore')
 
-        # Apply scale (e.g., scale="3" means multiply by 1000)
-        if scale:
-            value = value * (10 ** scale)
 
-        return value
-    except (ValueError, InvalidOperation):
-        return None
+def _parse_attrs(attrs_raw: bytes) -> dict:
+    """Parse tag attributes into a dict."""
+    attrs_str = _text(attrs_raw)
+    attrs = {}
+    for attr_match in _ATTR_RE.finditer(attrs_str):
+        attrs[attr_match.group(1)] = attr_match.group(2)
+    return attrs
 
 
-def extract_xbrl_facts(xhtml_content: str) -> dict:
-    """Extract all XBRL facts from XHTML content."""
-    facts = {
+def _new_facts() -> dict:
+    return {
         "numeric": [],      # ix:nonFraction
         "text": [],         # ix:nonNumeric
         "contexts": {},     # Context definitions
@@ -120,79 +165,139 @@ def extract_xbrl_facts(xhtml_content: str) -> dict:
         "namespaces": set() # All namespaces used
     }
 
-    # Extract numeric facts (ix:nonFraction)
-    numeric_pattern = r'<ix:nonFraction\s+([^>]+)>([^<]*)</ix:nonFraction>'
-    for match in re.finditer(numeric_pattern, xhtml_content, re.DOTALL):
-        attrs_str = match.group(1)
-        value = match.group(2).strip()
 
-        # Parse attributes
-        attrs = {}
-        for attr_match in re.finditer(r'(\w+)=["\']([^"\']*)["\']', attrs_str):
-            attrs[attr_match.group(1)] = attr_match.group(2)
+def _add_numeric_fact(facts: dict, attrs, value: str) -> None:
+    fact_name = attrs.get("name", "")
+    if ":" in fact_name:
+        facts["namespaces"].add(fact_name.split(":")[0])
 
-        fact_name = attrs.get("name", "")
-        if ":" in fact_name:
-            namespace = fact_name.split(":")[0]
-            facts["namespaces"].add(namespace)
-
-        scale = int(attrs.get("scale", 0))
-        parsed_value = parse_xbrl_value(value, scale)
-
-        facts["numeric"].append({
-            "name": fact_name,
-            "value_raw": value,
-            "value_parsed": parsed_value,
-            "context": attrs.get("contextRef", ""),
-            "unit": attrs.get("unitRef", ""),
-            "decimals": attrs.get("decimals", ""),
-            "scale": scale,
-        })
-
-    # Extract text facts (ix:nonNumeric)
-    text_pattern = r'<ix:nonNumeric\s+([^>]+)>([^<]*)</ix:nonNumeric>'
-    for match in re.finditer(text_pattern, xhtml_content, re.DOTALL):
-        attrs_str = match.group(1)
-        value = match.group(2).strip()
-
-        attrs = {}
-        for attr_match in re.finditer(r'(\w+)=["\']([^"\']*)["\']', attrs_str):
-            attrs[attr_match.group(1)] = attr_match.group(2)
-
-        fact_name = attrs.get("name", "")
-        if ":" in fact_name:
-            namespace = fact_name.split(":")[0]
-            facts["namespaces"].add(namespace)
-
-        facts["text"].append({
-            "name": fact_name,
-            "value": value,
-            "context": attrs.get("contextRef", ""),
-        })
-
-    # Extract context definitions
-    context_pattern = r'<xbrli:context\s+id=["\']([^"\']+)["\']>(.*?)</xbrli:context>'
-    for match in re.finditer(context_pattern, xhtml_content, re.DOTALL):
-        context_id = match.group(1)
-        context_content = match.group(2)
-
-        # Extract period
-        period_match = re.search(r'<xbrli:instant>([^<]+)</xbrli:instant>', context_content)
-        if period_match:
-            facts["contexts"][context_id] = {"type": "instant", "date": period_match.group(1)}
+    scale = int(attrs.get("scale", 0))
+    facts["numeric"].append({
+        "name": fact_name,
+        "value_raw": value,
+        "value_parsed": parse_xbrl_value(value, scale),
+        "context": attrs.get("contextRef", ""),
+        "unit": attrs.get("unitRef", ""),
+        "decimals": attrs.get("decimals", ""),
+        "scale": scale,
+    })
+
+
+def _add_text_fact(facts: dict, attrs, value: str) -> None:
+    fact_name = attrs.get("name", "")
+    if ":" in fact_name:
+        facts["namespaces"].add(fact_name.split(":")[0])
+
+    facts["text"].append({
+        "name": fact_name,
+        "value": value,
+        "context": attrs.get("contextRef", ""),
+    })
+
+
+def _add_context(facts: dict, context_id: str, instant, start, end) -> None:
+    if instant:
+        facts["contexts"][context_id] = {"type": "instant", "date": instant}
+    elif start and end:
+        facts["contexts"][context_id] = {"type": "duration", "start": start, "end": end}
+
+
+def _extract_xbrl_facts_regex(xhtml_content: bytes) -> dict:
+    """Regex fallback for when lxml is not installed."""
+    facts = _new_facts()
+
+    for match in _ELEMENT_RE.finditer(xhtml_content):
+        kind = match.lastgroup
+
+        # Numeric facts (ix:nonFraction)
+        if kind == "nf_value":
+            attrs = _parse_attrs(match.group("nf_attrs"))
+            _add_numeric_fact(facts, attrs, _text(match.group("nf_value")).strip())
+
+        # Text facts (ix:nonNumeric)
+        elif kind == "nn_value":
+            attrs = _parse_attrs(match.group("nn_attrs"))
+            _add_text_fact(facts, attrs, _text(match.group("nn_value")).strip())
+
+        # Context definitions
         else:
-            start_match = re.search(r'<xbrli:startDate>([^<]+)</xbrli:startDate>', context_content)
-            end_match = re.search(r'<xbrli:endDate>([^<]+)</xbrli:endDate>', context_content)
-            if start_match and end_match:
-                facts["contexts"][context_id] = {
-                    "type": "duration",
-                    "start": start_match.group(1),
-                    "end": end_match.group(1)
-                }
+            context_content = _text(match.group("ctx_body"))
+            instant = _INSTANT_RE.search(context_content)
+            start = _START_RE.search(context_content)
+            end = _END_RE.search(context_content)
+            _add_context(
+                facts,
+                _text(match.group("ctx_id")),
+                instant and instant.group(1),
+                start and start.group(1),
+                end and end.group(1),
+            )
 
     return facts
 
 
+_IX_NS = "http://www.xbrl.org/2013/inlineXBRL"
+_XBRLI_NS = "http://www.xbrl.org/2003/instance"
+_NONFRACTION_TAG = f"{{{_IX_NS}}}nonFraction"
+_NONNUMERIC_TAG = f"{{{_IX_NS}}}nonNumeric"
+_CONTEXT_TAG = f"{{{_XBRLI_NS}}}context"
+_INSTANT_PATH = f".//{{{_XBRLI_NS}}}instant"
+_START_PATH = f".//{{{_XBRLI_NS}}}startDate"
+_END_PATH = f".//{{{_XBRLI_NS}}}endDate"
+_FACT_TAGS = (_NONFRACTION_TAG, _NONNUMERIC_TAG)
+
+
+def _extract_xbrl_facts_lxml(source) -> dict:
+    """Stream a binary file object through lxml iterparse."""
+    facts = _new_facts()
+
+    parser = etree.iterparse(
+        source,
+        events=("end",),
+        tag=(_NONFRACTION_TAG, _NONNUMERIC_TAG, _CONTEXT_TAG),
+        huge_tree=True,
+        recover=True,
+    )
+    for _, elem in parser:
+        tag = elem.tag
+        if tag == _NONFRACTION_TAG:
+            _add_numeric_fact(facts, elem.attrib, "".join(elem.itertext()).strip())
+        elif tag == _NONNUMERIC_TAG:
+            _add_text_fact(facts, elem.attrib, "".join(elem.itertext()).strip())
+        else:
+            _add_context(
+                facts,
+                elem.get("id", ""),
+                elem.findtext(_INSTANT_PATH),
+                elem.findtext(_START_PATH),
+                elem.findtext(_END_PATH),
+            )
+
+        # Facts can be nested (at any depth) in a text block whose text is
+        # read when it ends, so only free elements outside every fact.
+        if not any(a.tag in _FACT_TAGS for a in elem.iterancestors()):
+            elem.clear(keep_tail=True)
+
+    return facts
+
+
+def extract_xbrl_facts_stream(fh) -> dict:
+    """Extract all XBRL facts from a binary file object, e.g. ZipFile.open()."""
+    if LXML_AVAILABLE:
+        return _extract_xbrl_facts_lxml(fh)
+    return _extract_xbrl_facts_regex(fh.read())
+
+
+def extract_xbrl_facts(xhtml_content: bytes) -> dict:
+    """Extract all XBRL facts from XHTML content (raw bytes)."""
+    if LXML_AVAILABLE:
+        try:
+            return _extract_xbrl_facts_lxml(io.BytesIO(xhtml_content))
+        except etree.LxmlError:
+            pass
+    return _extract_xbrl_facts_regex(xhtml_content)
+
+
 def analyze_ixbrl_archive(content: bytes, orgnr: str, doc_info: dict) -> dict:
     """Analyze an iXBRL ZIP archive."""
     analysis = {
@@ -205,7 +310,7 @@ def analyze_ixbrl_archive(content: bytes, orgnr: str, doc_info: dict) -> dict:
         "is_zip": False,
         "xhtml_files": [],
         "all_facts": [],
-        "fact_names": set(),
+        "fact_names": [],
         "namespaces": set(),
         "contexts": {},
         "error": None,
@@ -219,71 +324,154 @@ def analyze_ixbrl_archive(content: bytes, orgnr: str, doc_info: dict) -> dict:
                 for fname in zf.namelist():
                     if fname.endswith('.xhtml') or fname.endswith('.html'):
                         analysis["xhtml_files"].append(fname)
-                        xhtml_content = zf.read(fname).decode('utf-8', errors='ignore')
 
-                        # Extract XBRL facts
-                        facts = extract_xbrl_facts(xhtml_content)
+                        # Extract XBRL facts straight from the decompressing stream
+                        with zf.open(fname) as fh:
+                            facts = extract_xbrl_facts_stream(fh)
+                        # The fact dicts are not shared, so tag them in place
+                        for f in facts["text"]:
+                            f["type"] = "text"
                         analysis["all_facts"].extend(facts["numeric"])
-                        analysis["all_facts"].extend([{**f, "type": "text"} for f in facts["text"]])
+                        analysis["all_facts"].extend(facts["text"])
                         analysis["namespaces"].update(facts["namespaces"])
                         analysis["contexts"].update(facts["contexts"])
-
-                        for f in facts["numeric"]:
-                            analysis["fact_names"].add(f["name"])
-                        for f in facts["text"]:
-                            analysis["fact_names"].add(f["name"])
         except Exception as e:
             analysis["error"] = str(e)
 
     # Convert sets to lists for JSON serialization
-    analysis["fact_names"] = list(analysis["fact_names"])
+    analysis["fact_names"] = list({f["name"] for f in analysis["all_facts"]})
     analysis["namespaces"] = list(analysis["namespaces"])
 
     return analysis
 
 
-def get_existing_db_data(orgnr: str) -> dict:
-    """Get existing data from database for comparison."""
+def summarize_document(content: bytes, orgnr: str, doc_info: dict) -> dict:
+    """
+    Analyze an archive, save its facts file and return the analysis
+    with the fact list replaced by fact_count.
+
+    Runs in the worker process, so only the summary is sent back and
+    held in memory until every document has been downloaded.
+    """
+    analysis = analyze_ixbrl_archive(content, orgnr, doc_info)
+    all_facts = analysis.pop("all_facts")
+    analysis["fact_count"] = len(all_facts)
+
+    # Save raw facts for this document
+    period_end = doc_info.get("rapporteringsperiodTom", "")
+    year = period_end[:4] if period_end else "unknown"
+    facts_file = OUTPUT_DIR / f"{orgnr}_{year}_facts.json"
+    # Filter to numeric facts with values
+    numeric_facts = [
+        {
+            "name": fact["name"],
+            "value": fact.get("value_parsed"),
+            "value_raw": fact.get("value_raw", fact.get("value", "")),
+            "context": fact.get("context", ""),
+            "unit": fact.get("unit", ""),
+        }
+        for fact in all_facts
+        if fact.get("value_parsed") is not None or fact.get("value")
+    ]
+    write_json(facts_file, numeric_facts)
+
+    return analysis
+
+
+def get_existing_db_data(orgnrs: list) -> dict:
+    """
+    Get existing data from database for comparison.
+
+    One query for all companies: roles and financials are embedded via
+    their company_orgnr foreign keys. Returns orgnr -> data.
+    """
     db = get_database()
 
     data = {
-        "company": None,
-        "financials": [],
-        "roles": [],
+        orgnr: {"company": None, "financials": [], "roles": []}
+        for orgnr in orgnrs
     }
 
     try:
-        # Company data
-        company = db.get_company(orgnr)
-        if company:
-            data["company"] = {
+        response = db.client.table("companies").select(
+            "*,roles(*),financials(*)"
+        ).in_("orgnr", orgnrs).execute()
+
+        for company in response.data or []:
+            entry = data.get(company.get("orgnr"))
+            if entry is None:
+                continue
+            entry["company"] = {
                 "name": company.get("name"),
                 "status": company.get("status"),
                 "employees": company.get("employees"),
                 "revenue": company.get("revenue"),
                 "profit": company.get("profit"),
             }
-
-        # Financials
-        response = db.client.table("financials").select("*").eq("orgnr", orgnr).execute()
-        data["financials"] = response.data or []
-
-        # Roles
-        response = db.client.table("roles").select("*").eq("orgnr", orgnr).execute()
-        data["roles"] = response.data or []
+            entry["financials"] = company.get("financials") or []
+            entry["roles"] = company.get("roles") or []
 
     except Exception as e:
-        data["error"] = str(e)
+        for entry in data.values():
+            entry["error"] = str(e)
 
     return data
 
 
+async def process_document(
+    orgnr: str, doc: dict, semaphore: asyncio.Semaphore, executor: Executor
+) -> dict | None:
+    """Download one document and summarize it in the executor."""
+    doc_id = doc.get("dokumentId")
+    period_end = doc.get("rapporteringsperiodTom", "")
+    year = period_end[:4] if period_end else "unknown"
+
+    async with semaphore:
+        content = await download_document(doc_id)
+    if not content:
+        print(f"  ✗ {orgnr} {year}: Download failed")
+        return None
+
+    loop = asyncio.get_running_loop()
+    analysis = await loop.run_in_executor(executor, summarize_document, content, orgnr, doc)
+    print(f"  ✓ {orgnr} {year}: Downloaded {len(content)/1024:.1f} KB")
+    return analysis
+
+
+async def fetch_and_analyze(companies: list, executor: Executor) -> list:
+    """
+    Fetch document lists and analyze every document concurrently.
+
+    Downloads run on the event loop while parsing runs in executor, so a
+    process pool parses several archives at once as they arrive.
+
+    Returns (docs, analyses) per company in input order; an analysis is
+    None where the download failed.
+    """
+    client = get_vdm_client()
+    semaphore = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+    orgnrs = [orgnr for orgnr, _ in companies]
+
+    try:
+        doc_lists = await client.bulk_get_document_list_async(orgnrs, DOWNLOAD_CONCURRENCY)
+        analyses = await asyncio.gather(*[
+            asyncio.gather(*[process_document(orgnr, doc, semaphore, executor) for doc in docs])
+            for orgnr, docs in zip(orgnrs, doc_lists)
+        ])
+    finally:
+        await client.aclose()
+
+    return list(zip(doc_lists, analyses))
+
+
 def main():
     print("=" * 80)
     print("COMPREHENSIVE ANNUAL REPORT ANALYSIS")
     print(f"Time: {datetime.now().isoformat()}")
     print("=" * 80)
 
+    OUTPUT_DIR.mkdir(exist_ok=True)
+
     # Initialize clients
     try:
         get_vdm_client()
@@ -299,15 +487,21 @@ def main():
         "total_documents": 0,
         "total_facts_extracted": 0,
         "companies": [],
-        "all_fact_names": defaultdict(int),  # fact_name -> count
+        "all_fact_names": Counter(),  # fact_name -> count
         "all_namespaces": set(),
         "fact_name_by_company": defaultdict(set),  # orgnr -> set of fact_names
     }
 
-    print(f"\nAnalyzing {len(TEST_COMPANIES)} companies...")
+    print(f"\nDownloading and analyzing documents for {len(TEST_COMPANIES)} companies...")
     print("-" * 80)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        fetched = asyncio.run(fetch_and_analyze(TEST_COMPANIES, executor))
+
+    # Get existing DB data for comparison
+    print(f"\nFetching existing database data...")
+    db_data_by_orgnr = get_existing_db_data([orgnr for orgnr, _ in TEST_COMPANIES])
 
-    for orgnr, name in TEST_COMPANIES:
+    for (orgnr, name), (docs, analyses) in zip(TEST_COMPANIES, fetched):
         print(f"\n{'='*60}")
         print(f"COMPANY: {orgnr} - {name}")
         print("=" * 60)
@@ -322,37 +516,27 @@ def main():
             "db_comparison": None,
         }
 
-        # Get document list
-        client = get_vdm_client()
-        docs = client.get_document_list(orgnr) or []
         print(f"  Found {len(docs)} documents in API")
 
         if not docs:
             all_results["companies"].append(company_result)
             continue
 
-        # Download and analyze ALL documents
-        for i, doc in enumerate(docs):
+        for i, (doc, analysis) in enumerate(zip(docs, analyses)):
             doc_id = doc.get("dokumentId")
             period_end = doc.get("rapporteringsperiodTom", "")
             year = period_end[:4] if period_end else "unknown"
 
-            print(f"\n  [{i+1}/{len(docs)}] Year {year}: Downloading...")
+            print(f"\n  [{i+1}/{len(docs)}] Year {year}:")
 
-            content = download_document(doc_id)
-            if not content:
+            if analysis is None:
                 print(f"    ✗ Download failed")
                 continue
 
-            print(f"    ✓ Downloaded {len(content)/1024:.1f} KB")
-
-            # Analyze
-            analysis = analyze_ixbrl_archive(content, orgnr, doc)
-
             if analysis["error"]:
                 print(f"    ✗ Analysis error: {analysis['error']}")
             else:
-                print(f"    ✓ Extracted {len(analysis['all_facts'])} facts")
+                print(f"    ✓ Extracted {analysis['fact_count']} facts")
                 print(f"    ✓ Unique fact names: {len(analysis['fact_names'])}")
                 print(f"    ✓ Namespaces: {analysis['namespaces']}")
 
@@ -363,52 +547,31 @@ def main():
                 "period_end": period_end,
                 "file_size_kb": analysis["file_size_kb"],
                 "xhtml_files": analysis["xhtml_files"],
-                "fact_count": len(analysis["all_facts"]),
+                "fact_count": analysis["fact_count"],
                 "fact_names": analysis["fact_names"],
                 "namespaces": analysis["namespaces"],
                 "contexts": analysis["contexts"],
             }
             company_result["documents"].append(doc_summary)
             company_result["years_available"].append(year)
-            company_result["total_facts"] += len(analysis["all_facts"])
+            company_result["total_facts"] += analysis["fact_count"]
             company_result["unique_fact_names"].update(analysis["fact_names"])
 
             # Track global statistics
             all_results["total_documents"] += 1
-            all_results["total_facts_extracted"] += len(analysis["all_facts"])
+            all_results["total_facts_extracted"] += analysis["fact_count"]
             all_results["all_namespaces"].update(analysis["namespaces"])
 
-            for fact_name in analysis["fact_names"]:
-                all_results["all_fact_names"][fact_name] += 1
-                all_results["fact_name_by_company"][orgnr].add(fact_name)
-
-            # Save raw facts for this document
-            facts_file = OUTPUT_DIR / f"{orgnr}_{year}_facts.json"
-            with open(facts_file, 'w', encoding='utf-8') as f:
-                # Filter to numeric facts with values
-                numeric_facts = [
-                    {
-                        "name": fact["name"],
-                        "value": fact.get("value_parsed"),
-                        "value_raw": fact.get("value_raw", fact.get("value", "")),
-                        "context": fact.get("context", ""),
-                        "unit": fact.get("unit", ""),
-                    }
-                    for fact in analysis["all_facts"]
-                    if fact.get("value_parsed") is not None or fact.get("value")
-                ]
-                json.dump(numeric_facts, f, indent=2, ensure_ascii=False)
-
-            time.sleep(1)  # Rate limiting
-
-        # Get existing DB data for comparison
-        print(f"\n  Fetching existing database data...")
-        db_data = get_existing_db_data(orgnr)
+            all_results["all_fact_names"].update(analysis["fact_names"])
+            all_results["fact_name_by_company"][orgnr].update(analysis["fact_names"])
+
+        # Compare with existing DB data
+        db_data = db_data_by_orgnr[orgnr]
         company_result["db_comparison"] = {
             "has_company": db_data["company"] is not None,
             "financials_count": len(db_data["financials"]),
             "roles_count": len(db_data["roles"]),
-            "db_years": [f.get("year") for f in db_data["financials"]],
+            "db_years": [f.get("period_year") for f in db_data["financials"]],
         }
         print(f"    DB financials: {len(db_data['financials'])} years")
         print(f"    API reports: {len(company_result['years_available'])} years")
@@ -419,8 +582,6 @@ def main():
         all_results["companies"].append(company_result)
         all_results["companies_analyzed"] += 1
 
-        time.sleep(2)  # Rate limiting between companies
-
     # Convert sets to lists
     all_results["all_namespaces"] = list(all_results["all_namespaces"])
     all_results["fact_name_by_company"] = {k: list(v) for k, v in all_results["fact_name_by_company"].items()}
@@ -446,7 +607,7 @@ def main():
 
     # Most common facts overall
     print(f"\nTop 50 most common XBRL facts across all documents:")
-    sorted_facts = sorted(all_results["all_fact_names"].items(), key=lambda x: -x[1])
+    sorted_facts = all_results["all_fact_names"].most_common()
     for fact_name, count in sorted_facts[:50]:
         print(f"  {count:3d}x  {fact_name}")
 
@@ -489,10 +650,9 @@ def main():
 
     # Save full results
     results_file = OUTPUT_DIR / "comprehensive_analysis.json"
-    with open(results_file, 'w', encoding='utf-8') as f:
-        # Convert defaultdict to dict
-        all_results["all_fact_names"] = dict(all_results["all_fact_names"])
-        json.dump(all_results, f, indent=2, ensure_ascii=False, default=str)
+    # Convert Counter to a plain dict
+    all_results["all_fact_names"] = dict(all_results["all_fact_names"])
+    write_json(results_file, all_results)
     print(f"\nFull results saved to: {results_file}")
 
     # Save fact catalog
@@ -504,8 +664,7 @@ def main():
         "facts_by_namespace": {ns: sorted(facts) for ns, facts in namespace_facts.items()},
         "common_to_all": list(common_facts) if companies_with_docs else [],
     }
-    with open(catalog_file, 'w', encoding='utf-8') as f:
-        json.dump(fact_catalog, f, indent=2, ensure_ascii=False)
+    write_json(catalog_file, fact_catalog)
     print(f"XBRL fact catalog saved to: {catalog_file}")
 
     print("\n" + "=" * 80)
@@ -0,0 +1,40 @@
+"""
+Tests for BolagsverketVDMClient event loop handling
+"""
+
+import asyncio
+
+from src.scrapers.bolagsverket_vdm import BolagsverketVDMClient
+
+
+class TestEventLoopBinding:
+    """Tests for reusing one client across event loops."""
+
+    def test_async_state_recreated_per_loop(self):
+        """Should recreate async clients and token lock on a new loop."""
+        client = BolagsverketVDMClient(client_id="id", client_secret="secret")
+
+        async def async_state():
+            http_client = await client._get_async_client()
+            token_client = await client._get_token_async_client()
+            lock = client._get_token_lock()
+            assert await client._get_async_client() is http_client
+            assert client._get_token_lock() is lock
+            return http_client, token_client, lock
+
+        first = asyncio.run(async_state())
+        second = asyncio.run(async_state())
+
+        assert all(a is not b for a, b in zip(first, second))
+
+    def test_aclose_from_new_loop(self):
+        """Should not await clients that belong to an earlier loop."""
+        client = BolagsverketVDMClient(client_id="id", client_secret="secret")
+
+        async def open_client():
+            await client._get_async_client()
+
+        asyncio.run(open_client())
+        asyncio.run(client.aclose())
+
+        assert client._async_client is None
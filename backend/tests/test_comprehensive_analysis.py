@@ -0,0 +1,67 @@
+"""
+Tests for the iXBRL fact extraction in test_annual_reports/comprehensive_analysis.py
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).parent.parent / "test_annual_reports" / "comprehensive_analysis.py"
+
+
+@pytest.fixture(scope="module")
+def analysis():
+    """Load the analysis script as a module."""
+    spec = importlib.util.spec_from_file_location("comprehensive_analysis", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+NESTED_XHTML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<html xmlns="http://www.w3.org/1999/xhtml"
+      xmlns:ix="http://www.xbrl.org/2013/inlineXBRL"
+      xmlns:xbrli="http://www.xbrl.org/2003/instance">
+<body>
+  <xbrli:context id="period0">
+    <xbrli:period>
+      <xbrli:startDate>2023-01-01</xbrli:startDate>
+      <xbrli:endDate>2023-12-31</xbrli:endDate>
+    </xbrli:period>
+  </xbrli:context>
+  <ix:nonNumeric name="se-gen-base:Note" contextRef="period0">
+    <p>Intro</p>
+    <table><tr><td>
+      <ix:nonFraction name="se-gen-base:Nettoomsattning" contextRef="period0"
+                      unitRef="SEK" decimals="0" scale="0">1 234</ix:nonFraction> kr
+    </td></tr></table>
+  </ix:nonNumeric>
+</body>
+</html>
+"""
+
+
+class TestExtractXbrlFacts:
+    """Tests for extract_xbrl_facts."""
+
+    def test_nested_fact_keeps_parent_text(self, analysis):
+        """Should keep a deeply nested fact's text in its enclosing text block."""
+        if not analysis.LXML_AVAILABLE:
+            pytest.skip("lxml not installed")
+
+        facts = analysis.extract_xbrl_facts(NESTED_XHTML)
+
+        assert [f["value_parsed"] for f in facts["numeric"]] == [1234]
+        note = facts["text"][0]
+        assert note["name"] == "se-gen-base:Note"
+        assert "Intro" in note["value"]
+        assert "1 234" in note["value"]
+
+    def test_context_period(self, analysis):
+        """Should read duration contexts."""
+        facts = analysis.extract_xbrl_facts(NESTED_XHTML)
+
+        assert facts["contexts"]["period0"] == {
+            "type": "duration", "start": "2023-01-01", "end": "2023-12-31"
+        }
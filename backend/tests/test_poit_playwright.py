@@ -0,0 +1,46 @@
+"""
+Tests for the POIT stats HTML fallback
+"""
+
+import pytest
+
+pytest.importorskip("playwright")
+pytest.importorskip("lxml")
+
+from src.scrapers.poit_playwright import POITPlaywrightScraper
+
+
+STATS_HTML = """
+<html><body>
+  <ul class="kategorier">
+    <li>
+      <a href="/poit-app/urval-senaste-publiceringar/3/20#search">
+        <div><span class="text bg-white">Konkurser</span><span class="badge">42</span></div>
+      </a>
+    </li>
+    <li><span class="bg-white">Kallelser</span><span class="badge rounded">7</span></li>
+    <li><span class="bg-white">Utan antal</span></li>
+  </ul>
+</body></html>
+"""
+
+
+class TestParseStatsFromHtml:
+    """Tests for _parse_stats_from_html."""
+
+    def test_pairs_name_and_badge_spans(self):
+        """Should find name/badge pairs outside the category link markup."""
+        categories = POITPlaywrightScraper()._parse_stats_from_html(STATS_HTML)
+
+        assert {key: c.count for key, c in categories.items()} == {
+            "konkurser": 42, "kallelser": 7
+        }
+
+    def test_href_from_enclosing_link(self):
+        """Should take the URL from the nearest enclosing link, if any."""
+        categories = POITPlaywrightScraper()._parse_stats_from_html(STATS_HTML)
+
+        konkurser = categories["konkurser"]
+        assert konkurser.url == "/poit-app/urval-senaste-publiceringar/3/20#search"
+        assert (konkurser.category_id, konkurser.subcategory_id) == ("3", "20")
+        assert categories["kallelser"].url == ""
@@ -0,0 +1,96 @@
+"""
+Tests for SQL functions in scripts/setup_supabase_tables.sql
+
+Run against a scratch Postgres given by TEST_DATABASE_URL; everything is
+created in a throwaway schema inside a transaction that is rolled back.
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+
+import pytest
+
+psycopg = pytest.importorskip("psycopg")
+
+SETUP_SQL = Path(__file__).parent.parent / "scripts" / "setup_supabase_tables.sql"
+DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="TEST_DATABASE_URL not set")
+
+ORGNR = "5560125791"
+
+
+def function_sql(name: str) -> str:
+    """Extract one CREATE FUNCTION statement from the setup script."""
+    match = re.search(
+        rf"CREATE OR REPLACE FUNCTION {name}\(.*?\n\$\$ LANGUAGE \w+(?: \w+)?;",
+        SETUP_SQL.read_text(),
+        re.DOTALL,
+    )
+    assert match, f"{name} not found in setup script"
+    return match.group(0)
+
+
+@pytest.fixture
+def cur():
+    """Cursor on a scratch schema with an industries-like table."""
+    with psycopg.connect(DATABASE_URL) as conn:
+        with conn.cursor() as cur:
+            cur.execute("CREATE SCHEMA test_setup_sql")
+            cur.execute("SET LOCAL search_path TO test_setup_sql")
+            cur.execute(
+                "CREATE TABLE industries ("
+                " id BIGSERIAL PRIMARY KEY,"
+                " company_orgnr TEXT NOT NULL,"
+                " sni_code TEXT,"
+                " sni_description TEXT,"
+                " is_primary BOOLEAN DEFAULT FALSE,"
+                " created_at TIMESTAMPTZ DEFAULT NOW())"
+            )
+            for name in ("insert_json_rows", "json_row_matches", "replace_json_rows"):
+                cur.execute(function_sql(name))
+            yield cur
+        conn.rollback()
+
+
+def replace(cur, rows):
+    cur.execute(
+        "SELECT replace_json_rows('industries', %s, %s::jsonb)",
+        (ORGNR, json.dumps(rows)),
+    )
+    cur.execute("SELECT id, sni_code FROM industries ORDER BY id")
+    return cur.fetchall()
+
+
+class TestReplaceJsonRows:
+    """Tests for replace_json_rows."""
+
+    def test_unchanged_payload_keeps_rows(self, cur):
+        """Should not rewrite rows whose omitted columns hold defaults."""
+        rows = [
+            {"company_orgnr": ORGNR, "sni_code": "62010", "created_at": "2025-01-01T00:00:00"},
+            {"company_orgnr": ORGNR, "sni_code": "62020", "created_at": "2025-01-01T00:00:00"},
+        ]
+
+        first = replace(cur, rows)
+        rows[0]["created_at"] = rows[1]["created_at"] = "2025-02-01T00:00:00"
+        second = replace(cur, rows)
+
+        assert second == first
+
+    def test_changed_rows_are_replaced(self, cur):
+        """Should delete removed rows and insert only new ones."""
+        first = replace(cur, [
+            {"company_orgnr": ORGNR, "sni_code": "62010"},
+            {"company_orgnr": ORGNR, "sni_code": "62020"},
+        ])
+        second = replace(cur, [
+            {"company_orgnr": ORGNR, "sni_code": "62010"},
+            {"company_orgnr": ORGNR, "sni_code": "63110"},
+        ])
+
+        assert second[0] == first[0]
+        assert [sni for _, sni in second] == ["62010", "63110"]
+        assert second[1][0] not in {row_id for row_id, _ in first}
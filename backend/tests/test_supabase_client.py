@@ -0,0 +1,228 @@
+"""
+Tests for Supabase client transport resilience
+"""
+
+import pytest
+import httpx
+from types import SimpleNamespace
+from postgrest.exceptions import APIError
+from src import supabase_client
+from src.supabase_client import ResilientTransport, SupabaseDatabase
+from src.circuit_breaker import CircuitOpenError, CircuitState
+
+
+class FlakyTransport(httpx.BaseTransport):
+    """Transport that raises the given errors before answering."""
+
+    def __init__(self, errors=(), status_code=200):
+        self.errors = list(errors)
+        self.status_code = status_code
+        self.calls = 0
+
+    def handle_request(self, request):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return httpx.Response(self.status_code)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff_sleep(monkeypatch):
+    """Skip real backoff delays."""
+    monkeypatch.setattr(supabase_client.time, "sleep", lambda delay: None)
+
+
+def send(transport, method="GET"):
+    with httpx.Client(transport=transport) as client:
+        return client.request(method, "http://supabase.test/rest/v1/companies")
+
+
+class TestResilientTransport:
+    """Tests for ResilientTransport class."""
+
+    def test_retries_idempotent_read_errors(self):
+        """Should retry GET on any transport error."""
+        inner = FlakyTransport([httpx.ReadError("reset"), httpx.ReadError("reset")])
+        transport = ResilientTransport(inner, breaker_name="test_sb_get")
+
+        assert send(transport).status_code == 200
+        assert inner.calls == 3
+
+    def test_does_not_retry_post_after_send(self):
+        """Should not retry a POST that may have reached the server."""
+        inner = FlakyTransport([httpx.ReadError("reset")])
+        transport = ResilientTransport(inner, breaker_name="test_sb_post")
+
+        with pytest.raises(httpx.ReadError):
+            send(transport, "POST")
+        assert inner.calls == 1
+
+    def test_retries_post_connect_errors(self):
+        """Should retry a POST that never connected."""
+        inner = FlakyTransport([httpx.ConnectError("refused")])
+        transport = ResilientTransport(inner, breaker_name="test_sb_connect")
+
+        assert send(transport, "POST").status_code == 200
+        assert inner.calls == 2
+
+    def test_circuit_opens_on_server_errors(self):
+        """Should fail fast once repeated 5xx responses open the circuit."""
+        inner = FlakyTransport(status_code=503)
+        transport = ResilientTransport(inner, breaker_name="test_sb_503")
+
+        for _ in range(transport.breaker.failure_threshold):
+            send(transport)
+
+        assert transport.breaker.state == CircuitState.OPEN
+        with pytest.raises(CircuitOpenError):
+            send(transport)
+        assert inner.calls == transport.breaker.failure_threshold
+
+
+class FakeQuery:
+    """Chainable query builder that records calls and returns canned rows."""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.calls = []
+
+    def __getattr__(self, name):
+        def record(*args, **kwargs):
+            self.calls.append((name, args))
+            return self
+        return record
+
+    def execute(self):
+        return SimpleNamespace(data=self.client.respond(self), count=None)
+
+
+class FakeClient:
+    """supabase Client stand-in whose rpc() raises the given error."""
+
+    def __init__(self, rpc_error=None, respond=lambda query: []):
+        self.postgrest = SimpleNamespace(session=httpx.Client())
+        self.rpc_error = rpc_error
+        self.respond = respond
+        self.rpc_calls = []
+        self.queries = []
+
+    def rpc(self, function, params):
+        self.rpc_calls.append(function)
+        if self.rpc_error:
+            raise self.rpc_error
+        return FakeQuery(self, f"rpc:{function}")
+
+    def table(self, name):
+        query = FakeQuery(self, name)
+        self.queries.append(query)
+        return query
+
+
+def missing_function():
+    return APIError({"code": "PGRST202", "message": "Could not find the function"})
+
+
+@pytest.fixture
+def make_db(monkeypatch):
+    """Build a SupabaseDatabase around a FakeClient."""
+    monkeypatch.setenv("SUPABASE_URL", "http://supabase.test")
+    monkeypatch.setenv("SUPABASE_KEY", "key")
+
+    def make(client):
+        monkeypatch.setattr(supabase_client, "create_client", lambda url, key: client)
+        return SupabaseDatabase()
+
+    return make
+
+
+class TestRpcFallback:
+    """Tests for SQL function calls falling back to table queries."""
+
+    def test_missing_function_is_remembered(self, make_db):
+        """Should return None and not call a missing function again."""
+        client = FakeClient(rpc_error=missing_function())
+        db = make_db(client)
+
+        assert db._call_rpc("snapshot_company", {"company_id": "5560125791"}) is None
+        assert db._call_rpc("snapshot_company", {"company_id": "5560125791"}) is None
+
+        assert "snapshot_company" in db._missing_rpcs
+        assert client.rpc_calls == ["snapshot_company"]
+
+    def test_missing_conflict_index_falls_back(self, make_db):
+        """Should treat a missing ON CONFLICT index like a missing function."""
+        client = FakeClient(rpc_error=APIError({"code": "42P10", "message": "no unique constraint"}))
+        db = make_db(client)
+
+        assert db._call_rpc("replace_xbrl_facts", {}) is None
+        assert "replace_xbrl_facts" in db._missing_rpcs
+
+    def test_other_errors_propagate(self, make_db):
+        """Should re-raise errors raised by an existing function."""
+        client = FakeClient(rpc_error=APIError({"code": "23505", "message": "duplicate key"}))
+        db = make_db(client)
+
+        with pytest.raises(APIError):
+            db._call_rpc("store_company_complete", {})
+        assert not db._missing_rpcs
+
+    def test_snapshot_company_copies_rows(self, make_db):
+        """Should snapshot via table reads/inserts without the function."""
+        def respond(query):
+            return [{"orgnr": "5560125791", "name": "Test AB"}] if query.table == "companies" else []
+
+        client = FakeClient(rpc_error=missing_function(), respond=respond)
+        db = make_db(client)
+
+        assert db.snapshot_company("5560125791") is True
+        assert "companies_history" in [q.table for q in client.queries]
+
+    def test_store_company_complete_uses_rest(self, make_db, sample_company_data, sample_roles_data):
+        """Should write per table when store_company_complete is missing."""
+        client = FakeClient(rpc_error=missing_function())
+        db = make_db(client)
+
+        assert db.store_company_complete(
+            sample_company_data, roles=sample_roles_data, snapshot_first=False
+        ) is True
+
+        assert "store_company_complete" in db._missing_rpcs
+        tables = [q.table for q in client.queries]
+        assert "companies" in tables
+        assert "roles" in tables
+        assert "cache_metadata" in tables
+
+    def test_registry_search_prefix_then_contains(self, make_db):
+        """Should run the prefix and then the contains ILIKE query."""
+        match = {"orgnr": "5560125791", "name": "Stora Test AB", "org_form": "AB"}
+
+        def respond(query):
+            pattern = next(args[1] for name, args in query.calls if name == "ilike")
+            return [match] if pattern.startswith("%") else []
+
+        client = FakeClient(rpc_error=missing_function(), respond=respond)
+        db = make_db(client)
+
+        assert db.search_company_registry("Test") == [match]
+
+        patterns = [
+            args[1] for q in client.queries for name, args in q.calls if name == "ilike"
+        ]
+        assert patterns == ["Test%", "%Test%"]
+        assert "search_company_registry" in db._missing_rpcs
+
+
+class TestClose:
+    """Tests for shutting down the database instance."""
+
+    def test_close_database_shuts_down_write_pool(self, make_db, monkeypatch):
+        """Should shut down the write pool and forget the instance."""
+        db = make_db(FakeClient())
+        monkeypatch.setattr(supabase_client, "_db_instance", db)
+
+        supabase_client.close_database()
+
+        assert supabase_client._db_instance is None
+        with pytest.raises(RuntimeError):
+            db._write_executor.submit(lambda: None)
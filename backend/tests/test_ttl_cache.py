@@ -0,0 +1,79 @@
+"""
+Tests for TTLCache
+"""
+
+import pytest
+import time
+from src.ttl_cache import TTLCache
+
+
+class TestTTLCache:
+    """Tests for TTLCache class."""
+
+    def test_miss_then_hit(self):
+        """Should report miss before set and hit after."""
+        cache = TTLCache(maxsize=10, ttl=60)
+
+        assert cache.lookup("5560125791") == (False, None)
+
+        cache.set("5560125791", {"name": "Test AB"})
+
+        assert cache.lookup("5560125791") == (True, {"name": "Test AB"})
+        assert "5560125791" in cache
+
+    def test_cached_none_is_a_hit(self):
+        """Should distinguish a cached None from a miss."""
+        cache = TTLCache(maxsize=10, ttl=60)
+
+        cache.set("missing", None)
+
+        assert cache.lookup("missing") == (True, None)
+        assert cache.get("missing", "default") is None
+
+    def test_entry_expires(self):
+        """Should expire entries after their TTL."""
+        cache = TTLCache(maxsize=10, ttl=0.05)
+
+        cache.set("key", "value")
+        time.sleep(0.1)
+
+        assert cache.lookup("key") == (False, None)
+        assert len(cache) == 0
+
+    def test_per_entry_ttl_override(self):
+        """Should allow a shorter TTL for individual entries."""
+        cache = TTLCache(maxsize=10, ttl=60)
+
+        cache.set("short", None, ttl=0.05)
+        cache.set("long", "value")
+        time.sleep(0.1)
+
+        assert "short" not in cache
+        assert "long" in cache
+
+    def test_lru_eviction(self):
+        """Should evict least recently used entry when full."""
+        cache = TTLCache(maxsize=2, ttl=60)
+
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # a is now most recently used
+        cache.set("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+
+    def test_invalidate_and_clear(self):
+        """Should remove single entries and clear all."""
+        cache = TTLCache(maxsize=10, ttl=60)
+
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.invalidate("a")
+
+        assert "a" not in cache
+        assert "b" in cache
+
+        cache.clear()
+        assert len(cache) == 0
@@ -129,7 +129,7 @@ def extract_orgnrs(text: str) -> List[str]:
                 if clean[0] in '123456789':
                     found.add(normalized)
     
-    return sorted(list(found))
+    return sorted(found)
 
 
 def generate_content_hash(category: str, title: str, content: str, date_str: str) -> str:
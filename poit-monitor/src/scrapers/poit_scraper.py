@@ -119,7 +119,7 @@ def extract_orgnrs(text: str) -> List[str]:
                 normalized = f"{clean[:6]}-{clean[6:]}"
                 found.add(normalized)
 
-    return sorted(list(found))
+    return sorted(found)
 
 
 def generate_content_hash(category: str, title: str, content: str, date_str: str) -> str: